@@ -0,0 +1,291 @@
+# benchmarks/bench.py
+"""
+Hot paths ka micro-benchmark suite - synthetic data par, real radios ki zaroorat nahi.
+
+Usage:
+    python benchmarks/bench.py run --output before.json
+    python benchmarks/bench.py run --filter database --sizes 10,1000,100000
+    python benchmarks/bench.py compare before.json after.json --threshold 0.10
+
+`compare` har benchmark ka median time compare karta hai aur koi regression ho to exit code 1 deta hai.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Callable, Iterator, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import generators
+from load_test import git_commit
+
+DEFAULT_SIZES = "10,1000,100000"
+# Ek benchmark kam se kam itni der chalta hai (saare rounds mila kar)
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_ROUNDS = 5
+DEFAULT_THRESHOLD = 0.10
+
+Case = Tuple[str, Callable[[], Any]]
+
+@contextlib.contextmanager
+def quiet():
+    """Benchmarked code ke prints suppress karein (console I/O timings ko skew na kare)"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+# --- Suites: har suite (name, callable) cases yield karti hai ---
+
+def bluetooth_manager_cases(sizes: List[int]) -> Iterator[Case]:
+    from bluetooth_manager import BluetoothManager, BtmgmtBackend
+
+    manager = BluetoothManager(backend=BtmgmtBackend())
+    backend = manager.backend
+    for size in sizes:
+        bluetoothctl = generators.bluetoothctl_transcript(size)
+        btmgmt = generators.btmgmt_transcript(size)
+        yield (f"bluetooth_manager.parse_bluetoothctl[{size}]",
+               lambda output=bluetoothctl: manager.parse_bluetoothctl_devices(output))
+        yield (f"bluetooth_manager.parse_btmgmt[{size}]",
+               lambda output=btmgmt: backend.parse_find_output(output, "hci0"))
+    names = generators.device_names(1000)
+    yield "bluetooth_manager.detect_device_type[x1000]", lambda: [manager.detect_device_type(name) for name in names]
+
+def device_database_cases(sizes: List[int]) -> Iterator[Case]:
+    from device_database import DeviceDatabase
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = generators.write_catalogue(os.path.join(directory, f"catalogue_{size}.json"), size)
+            with quiet():
+                database = DeviceDatabase(path)
+            queries = generators.lookup_queries(database.devices, 300)
+            yield f"device_database.load[{size}]", lambda path=path: DeviceDatabase(path)
+            yield (f"device_database.get_device_info[{size} models, x300]",
+                   lambda database=database, queries=queries: [database.get_device_info(q["mac"], q["name"])
+                                                              for q in queries])
+            yield (f"device_database.search_devices[{size} models]",
+                   lambda database=database: database.search_devices("earbuds"))
+
+def ai_fixer_cases(sizes: List[int]) -> Iterator[Case]:
+    from ai_bluetooth_fix import AIBluetoothFixer
+    from simulated_backend import generate_devices
+
+    with quiet():
+        fixer = AIBluetoothFixer(verbose=False)
+    devices = generate_devices(1000)
+    issues = generators.issue_sets(1000)
+    trend = {"samples": 64, "rssi_mean": -58.0, "rssi_slope_per_minute": -0.2,
+             "battery_slope_per_hour": -4.0, "connection_drops": 1}
+    yield "ai_fixer.diagnose_device[x1000]", lambda: [fixer.diagnose_device(device) for device in devices]
+    yield ("ai_fixer.diagnose_device[trend, x1000]",
+           lambda: [fixer.diagnose_device(device, trend) for device in devices])
+    errors = ["Failed to connect: org.bluez.Error.Failed br-connection-page-timeout",
+              "< HCI Command: Create Connection (0x01|0x0005) Status: Page Timeout (0x04)",
+              "No default controller available"]
+    yield ("ai_fixer.diagnose_device[errors, x1000]",
+           lambda: [fixer.diagnose_device(device, errors=errors) for device in devices])
+    yield "ai_fixer.diagnose_devices[batch 1000]", lambda: list(fixer.diagnose_devices(devices))
+    yield "ai_fixer.generate_fix_suggestions[x1000]", lambda: [fixer.generate_fix_suggestions(i) for i in issues]
+
+def log_ingest_cases(sizes: List[int]) -> Iterator[Case]:
+    from ai_bluetooth_fix import AIBluetoothFixer
+    from device_registry import DeviceRegistry
+    from error_knowledge import ErrorKnowledgeBase
+    from log_ingest import LogIngestor, parse_btmon
+
+    knowledge = ErrorKnowledgeBase()
+    with quiet():
+        fixer = AIBluetoothFixer(verbose=False)
+    for size in sizes:
+        lines = generators.btmon_transcript(size).splitlines(keepends=True)
+        yield (f"log_ingest.parse_btmon[{size} events]",
+               lambda lines=lines: sum(1 for _ in parse_btmon(lines, knowledge)))
+        yield (f"log_ingest.ingest[{size} events]",
+               lambda lines=lines: sum(1 for _ in LogIngestor(DeviceRegistry(), fixer, knowledge=knowledge)
+                                       .ingest(parse_btmon(lines, knowledge))))
+
+def language_manager_cases(sizes: List[int]) -> Iterator[Case]:
+    from language_manager import LanguageManager
+
+    with quiet():
+        manager = LanguageManager()
+    languages = list(manager.get_available_languages())
+
+    def switch():
+        for code in languages:
+            manager.set_language(code)
+            manager.get_text("scan_devices")
+
+    yield "language_manager.load[compiled]", lambda: LanguageManager()
+    yield "language_manager.load[json]", lambda: LanguageManager(use_compiled=False)
+    yield f"language_manager.set_language[x{len(languages)}]", switch
+    yield ("language_manager.format_text[x1000]",
+           lambda: [manager.format_text("devices_found_count", languages[count % len(languages)], count=count)
+                    for count in range(1000)])
+
+def web_routes_cases(sizes: List[int]) -> Iterator[Case]:
+    import logging
+    from functools import partial
+    from simulated_backend import SimulatedBluetoothFixer
+    from web_server import WebServer
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    with quiet():
+        server = WebServer(background_load=False, scan_interval=3600,
+                           ai_fixer_factory=partial(SimulatedBluetoothFixer, device_count=200, scan_window=0))
+        if not server.load_components():
+            raise RuntimeError("Web server warm-up failed")
+        server.ai_fixer.verbose = False
+        server.run_scan()
+    client = server.app.test_client()
+    device = server.registry.snapshot()["devices"][0]
+    etag = server.registry.etag()
+
+    def get(path, **kwargs):
+        response = client.get(path, **kwargs)
+        response.close()
+
+    yield "web.GET /api/status", lambda: get("/api/status")
+    yield "web.GET /api/devices[200]", lambda: get("/api/devices")
+    yield "web.GET /api/devices[304]", lambda: get("/api/devices", headers={"If-None-Match": f'"{etag}"'})
+    yield "web.GET /api/translations/en", lambda: get("/api/translations/en")
+    yield "web.POST /api/diagnose", lambda: client.post("/api/diagnose", json={"device": device}).close()
+    yield "web.GET /metrics", lambda: get("/metrics")
+
+SUITES: Dict[str, Callable[[List[int]], Iterator[Case]]] = {
+    "bluetooth_manager": bluetooth_manager_cases,
+    "device_database": device_database_cases,
+    "ai_fixer": ai_fixer_cases,
+    "log_ingest": log_ingest_cases,
+    "language_manager": language_manager_cases,
+    "web": web_routes_cases
+}
+
+# --- Measurement ---
+
+def measure(func: Callable[[], Any], min_time: float, rounds: int) -> Dict[str, Any]:
+    """Har round mein itne calls ki ek round >= min_time/rounds chale - per-call timings return"""
+    timer = timeit.Timer(func)
+    with quiet():
+        func()  # Warm-up (caches, lazy imports)
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= min_time / rounds or number >= 1 << 20:
+                break
+            number = max(number * 2, int(number * (min_time / rounds) / max(elapsed, 1e-9)))
+        times = [timer.timeit(number) / number for _ in range(rounds)]
+    median = statistics.median(times)
+    return {
+        "median_us": round(median * 1e6, 3),
+        "min_us": round(min(times) * 1e6, 3),
+        "mean_us": round(statistics.fmean(times) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(times) * 1e6, 3) if len(times) > 1 else 0.0,
+        "ops_per_second": round(1 / median, 2) if median > 0 else None,
+        "calls_per_round": number,
+        "rounds": rounds
+    }
+
+def run(args) -> int:
+    sizes = sorted({int(size) for size in args.sizes.split(",") if size.strip()})
+    suites = [name for name in SUITES if not args.suite or name in args.suite]
+    # Relative data paths (data/, web_interface/translations) repo root se resolve hote hain
+    os.chdir(ROOT)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    started = time.monotonic()
+    for suite in suites:
+        print(f"🏁 {suite}")
+        for name, func in SUITES[suite](sizes):
+            if args.filter and args.filter not in name:
+                continue
+            stats = measure(func, args.min_time, args.rounds)
+            results[name] = stats
+            print(f"  {name:<58}{stats['median_us']:>14,.1f} µs  (±{stats['stdev_us']:,.1f})")
+
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {"sizes": sizes, "suites": suites, "filter": args.filter,
+                       "min_time": args.min_time, "rounds": args.rounds},
+            "seconds": round(time.monotonic() - started, 1)
+        },
+        "benchmarks": results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+    return 0
+
+def compare(args) -> int:
+    """Do runs ke medians compare karein - threshold se zyada slow = regression"""
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    base_results, new_results = baseline["benchmarks"], current["benchmarks"]
+
+    regressions = improvements = 0
+    print(f"Baseline {baseline['meta'].get('commit')} vs current {current['meta'].get('commit')} "
+          f"(threshold {args.threshold:.0%})\n")
+    print(f"{'benchmark':<58}{'baseline µs':>14}{'current µs':>14}{'change':>10}")
+    for name in sorted(set(base_results) | set(new_results)):
+        if name not in new_results:
+            print(f"{name:<58}{base_results[name]['median_us']:>14,.1f}{'-':>14}{'removed':>10}")
+            continue
+        if name not in base_results:
+            print(f"{name:<58}{'-':>14}{new_results[name]['median_us']:>14,.1f}{'new':>10}")
+            continue
+        before, after = base_results[name]["median_us"], new_results[name]["median_us"]
+        change = (after - before) / before if before else 0.0
+        marker = ""
+        if change > args.threshold:
+            regressions += 1
+            marker = "  ❌ regression"
+        elif change < -args.threshold:
+            improvements += 1
+            marker = "  ✅ faster"
+        print(f"{name:<58}{before:>14,.1f}{after:>14,.1f}{change:>+10.1%}{marker}")
+
+    print(f"\n{regressions} regressions, {improvements} improvements")
+    return 1 if regressions else 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Bluetooth AI Fix Master hot paths")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument('--suite', action='append', choices=list(SUITES),
+                            help='Only run this suite (repeatable)')
+    run_parser.add_argument('--filter', help='Only run benchmarks whose name contains this text')
+    run_parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                            help=f'Catalogue/transcript sizes (default: {DEFAULT_SIZES})')
+    run_parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME,
+                            help='Minimum measured seconds per benchmark')
+    run_parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS, help='Timed rounds per benchmark')
+    run_parser.add_argument('--output', help='Write JSON results to this file')
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument('baseline', help='Baseline results JSON')
+    compare_parser.add_argument('current', help='Current results JSON')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='Relative slowdown that counts as a regression (default: 0.10)')
+
+    args = parser.parse_args(argv)
+    return run(args) if args.command == "run" else compare(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
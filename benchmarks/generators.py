@@ -0,0 +1,120 @@
+# benchmarks/generators.py
+"""
+Benchmarks ke liye deterministic synthetic data - same seed = same data, taaki runs compare ho sakein.
+"""
+import json
+import os
+import random
+import sys
+from typing import Dict, List, Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from simulated_backend import DEVICE_MODELS, generate_devices
+
+COMPANIES = ["Sony", "Apple", "Samsung", "Logitech", "Bose", "JBL", "Jabra", "Sennheiser",
+             "Anker", "Xiaomi", "Huawei", "Beats", "Skullcandy", "Razer", "Microsoft", "Garmin"]
+DEVICE_TYPES = ["headphones", "earbuds", "speaker", "keyboard", "mouse", "wearable"]
+ISSUES = ["connection_drop", "audio_quality", "battery_drain", "pairing", "latency",
+          "charging_case", "touch_controls", "firmware", "range", "fit_issues"]
+FIXES = ["reset_connection", "update_firmware", "battery_calibration", "reset_pairing",
+         "check_interference", "update_drivers", "clean_contacts", "power_cycle_device"]
+
+def generate_catalogue(model_count: int, seed: int = 0) -> Dict[str, Any]:
+    """device_database.json jaisa catalogue - model_count models, companies mein bante hue"""
+    rng = random.Random(seed)
+    devices: Dict[str, Dict[str, Any]] = {company: {} for company in COMPANIES}
+    for index in range(model_count):
+        company = COMPANIES[index % len(COMPANIES)]
+        device_type = rng.choice(DEVICE_TYPES)
+        model = f"{device_type.title()} {rng.choice('ABCDEFGHJKLMNPQRSTVWXZ')}{index:05d}"
+        devices[company][model] = {
+            "mac_prefix": f"{(index >> 8) & 0xFF:02X}:{index & 0xFF:02X}",
+            "common_issues": rng.sample(ISSUES, 3),
+            "recommended_fixes": rng.sample(FIXES, 3),
+            "auto_connect": rng.random() < 0.5,
+            "ai_optimization": rng.choice(["low", "medium", "high"]),
+            "device_type": device_type
+        }
+    return {"devices": {company: models for company, models in devices.items() if models}}
+
+def write_catalogue(path: str, model_count: int, seed: int = 0) -> str:
+    """Catalogue JSON file likhein (DeviceDatabase(db_path) ke liye)"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_catalogue(model_count, seed), f)
+    return path
+
+def lookup_queries(catalogue: Dict[str, Any], count: int, seed: int = 0) -> List[Dict[str, str]]:
+    """(mac, name) lookups - prefix hits, name hits aur misses ka mix"""
+    rng = random.Random(seed)
+    models = [(model, info) for company in catalogue["devices"].values() for model, info in company.items()]
+    queries = []
+    for index in range(count):
+        model, info = rng.choice(models)
+        kind = index % 3
+        if kind == 0:
+            queries.append({"mac": f"{info['mac_prefix']}:AA:BB:CC", "name": ""})
+        elif kind == 1:
+            queries.append({"mac": "ZZ:ZZ:00:00:00:00", "name": f"My {model} (2)"})
+        else:
+            queries.append({"mac": "ZZ:ZZ:00:00:00:00", "name": "Unknown gadget"})
+    return queries
+
+def bluetoothctl_transcript(count: int, seed: int = 0) -> str:
+    """`bluetoothctl devices` jaisa output"""
+    return "".join(f"Device {device['mac_address']} {device['name']}\n"
+                   for device in generate_devices(count, seed))
+
+def btmgmt_transcript(count: int, seed: int = 0) -> str:
+    """`btmgmt find` jaisa output - har device ke saath flags/name lines"""
+    rng = random.Random(seed)
+    lines = ["Discovery started"]
+    for device in generate_devices(count, seed):
+        mac = device["mac_address"] + ":00" if device["mac_address"].count(":") == 4 else device["mac_address"]
+        lines.append(f"hci0 dev_found: {mac} type LE Random rssi {device['signal_strength']} "
+                     f"flags 0x0000")
+        lines.append(f"AD flags 0x{rng.randint(0, 31):02x} ")
+        lines.append(f"name {device['name']}")
+    lines.append("hci0 type 7 discovering off")
+    return "\n".join(lines) + "\n"
+
+def btmon_transcript(count: int, seed: int = 0) -> str:
+    """`btmon -T` jaisa output - advertising reports, connect/disconnect cycles, auth failures"""
+    rng = random.Random(seed)
+    devices = generate_devices(max(count // 10, 1), seed)
+    lines = ["Bluetooth monitor ver 5.72"]
+    for index in range(count):
+        device = devices[index % len(devices)]
+        mac = device["mac_address"] + ":00" if device["mac_address"].count(":") == 4 else device["mac_address"]
+        stamp = f"#{index + 1} [hci0] 2026-01-01 {10 + index // 3600 % 12:02d}:{index // 60 % 60:02d}:{index % 60:02d}.000000"
+        kind = rng.random()
+        if kind < 0.7:
+            lines += [f"> HCI Event: LE Meta Event (0x3e) plen 43{' ' * 16}{stamp}",
+                      "      LE Advertising Report (0x02)", "        Num reports: 1",
+                      "        Address type: Public (0x00)", f"        Address: {mac} (OUI)",
+                      f"        Name (complete): {device['name']}",
+                      f"        RSSI: {device['signal_strength'] + rng.randint(-3, 3)} dBm (0xbd)"]
+        elif kind < 0.85:
+            lines += [f"> HCI Event: Connect Complete (0x03) plen 11{' ' * 16}{stamp}",
+                      "        Status: Success (0x00)", f"        Handle: {index % 64}", f"        Address: {mac} (OUI)"]
+        elif kind < 0.97:
+            reason = rng.choice(["Connection Timeout (0x08)", "Remote User Terminated Connection (0x13)"])
+            lines += [f"> HCI Event: Disconnect Complete (0x05) plen 4{' ' * 16}{stamp}",
+                      "        Status: Success (0x00)", f"        Handle: {index % 64}", f"        Reason: {reason}"]
+        else:
+            lines += [f"> HCI Event: Authentication Complete (0x06) plen 3{' ' * 16}{stamp}",
+                      "        Status: Authentication Failure (0x05)", f"        Handle: {index % 64}"]
+    return "\n".join(lines) + "\n"
+
+def device_names(count: int, seed: int = 0) -> List[str]:
+    """detect_device_type ke liye names - known models aur random gadgets"""
+    rng = random.Random(seed)
+    known = [name for name, _, _ in DEVICE_MODELS]
+    return [rng.choice(known) if index % 2 else f"Gadget-{rng.randint(0, 99999)}" for index in range(count)]
+
+def issue_sets(count: int, seed: int = 0) -> List[List[Dict[str, Any]]]:
+    """generate_fix_suggestions ke inputs"""
+    rng = random.Random(seed)
+    types = ["connection_issues", "audio_issues", "pairing_issues", "battery_issues"]
+    return [[{"type": issue_type, "confidence": 0.8, "severity": "medium"}
+             for issue_type in rng.sample(types, rng.randint(1, len(types)))] for _ in range(count)]
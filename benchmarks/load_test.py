@@ -0,0 +1,330 @@
+# benchmarks/load_test.py
+"""
+WebServer ka localhost load test - real radios ki zaroorat nahi.
+
+Usage:
+    python benchmarks/load_test.py --duration 20 --concurrency 32 \\
+        --mix devices=50,diagnose=20,fix=10,translations=20 --output results.json
+
+Default mein server ek alag process mein SimulatedBluetoothFixer ke saath start hota hai.
+--url dene par already chal rahe server (e.g. main.py --web --workers 4) par load jaata hai.
+"""
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from simulated_backend import generate_devices
+
+DEFAULT_MIX = "devices=50,diagnose=20,fix=10,translations=20"
+ENDPOINTS = ("devices", "diagnose", "fix", "translations")
+FIX_ACTIONS = ["reset_connection", "reset_bluetooth_stack", "update_drivers", "check_interference"]
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'devices=50,fix=10' ko endpoint weights mein badlein"""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight for '{name}': {weight!r}")
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("Mix needs at least one positive weight")
+    return mix
+
+def serve(port_queue, device_count: int, scan_interval: float, fix_delay: float,
+          fail_rate: float, seed: int, verbose: bool):
+    """Child process: simulated backend ke saath WebServer chalayein"""
+    from functools import partial
+    from werkzeug.serving import make_server
+    from simulated_backend import SimulatedBluetoothFixer
+    from web_server import WebServer
+
+    if not verbose:
+        sys.stdout = open(os.devnull, "w")
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    factory = partial(SimulatedBluetoothFixer, device_count=device_count,
+                      fix_delay=fix_delay, fail_rate=fail_rate, seed=seed)
+    server = WebServer(host="127.0.0.1", port=0, background_load=False,
+                       scan_interval=scan_interval, ai_fixer_factory=factory)
+    if not server.load_components():
+        port_queue.put(None)
+        return
+    server.start_background_tasks()
+    httpd = make_server("127.0.0.1", 0, server.app, threaded=True)
+    port_queue.put(httpd.server_port)
+    httpd.serve_forever()
+
+def start_server(args) -> Tuple[multiprocessing.Process, str]:
+    """Server process start karein aur uska base URL return karein"""
+    context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    port_queue = context.Queue()
+    process = context.Process(target=serve, daemon=True, args=(
+        port_queue, args.devices, args.scan_interval, args.fix_delay,
+        args.fail_rate, args.seed, args.verbose))
+    process.start()
+    port = port_queue.get(timeout=60)
+    if port is None:
+        process.join()
+        raise RuntimeError("Server warm-up failed (run with --verbose for details)")
+    return process, f"http://127.0.0.1:{port}"
+
+class Client:
+    """Ek worker thread ka HTTP client - connection reuse jab server allow kare"""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.connection: Optional[http.client.HTTPConnection] = None
+
+    def request(self, method: str, path: str, body: Any = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        for attempt in (1, 2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                data = response.read()
+                if response.will_close:
+                    self.close()
+                return response.status, data
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Keep-alive connection server ne band kar di - ek baar naye connection se retry
+                self.close()
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+def wait_ready(client: Client, timeout: float = 30.0) -> Dict[str, Any]:
+    """/readyz green hone tak wait karein, phir available languages laayein"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            status, _ = client.request("GET", "/readyz")
+            if status == 200:
+                break
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError("Server did not become ready in time")
+        time.sleep(0.2)
+    status, body = client.request("GET", "/api/languages")
+    return json.loads(body) if status == 200 else {}
+
+class LoadGenerator:
+    """Weighted endpoint mix ko fixed concurrency par chalayein"""
+
+    def __init__(self, base_url: str, mix: Dict[str, float], concurrency: int,
+                 languages: Dict[str, str], versions: Dict[str, str], devices: List[Dict[str, Any]],
+                 timeout: float, seed: int):
+        self.base_url = base_url
+        self.names = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.names]
+        self.concurrency = concurrency
+        self.languages = sorted(languages) or ["en"]
+        self.versions = versions
+        self.devices = devices
+        self.timeout = timeout
+        self.seed = seed
+        self.lock = threading.Lock()
+        # endpoint -> [(latency seconds, ok)]
+        self.samples: Dict[str, List[Tuple[float, bool]]] = {name: [] for name in self.names}
+        self.error_kinds: Dict[str, int] = {}
+
+    def call(self, client: Client, rng: random.Random, name: str) -> int:
+        if name == "devices":
+            return client.request("GET", "/api/devices")[0]
+        if name == "diagnose":
+            return client.request("POST", "/api/diagnose", {"device": rng.choice(self.devices)})[0]
+        if name == "fix":
+            return client.request("POST", "/api/fix", {"fix_action": rng.choice(FIX_ACTIONS),
+                                                       "device": rng.choice(self.devices)})[0]
+        lang = rng.choice(self.languages)
+        version = self.versions.get(lang)
+        path = f"/api/translations/{lang}" + (f"?v={version}" if version else "")
+        return client.request("GET", path, headers={"Accept-Encoding": "gzip"})[0]
+
+    def worker(self, index: int, warmup_until: float, stop_at: float):
+        rng = random.Random(self.seed * 1000 + index)
+        client = Client(self.base_url, self.timeout)
+        local: Dict[str, List[Tuple[float, bool]]] = {name: [] for name in self.names}
+        errors: Dict[str, int] = {}
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            name = rng.choices(self.names, self.weights)[0]
+            started = time.perf_counter()
+            try:
+                status = self.call(client, rng, name)
+                ok = status < 400
+                if not ok:
+                    errors[f"{name}:{status}"] = errors.get(f"{name}:{status}", 0) + 1
+            except Exception as e:
+                ok = False
+                errors[f"{name}:{type(e).__name__}"] = errors.get(f"{name}:{type(e).__name__}", 0) + 1
+                client.close()
+            elapsed = time.perf_counter() - started
+            if started >= warmup_until:
+                local[name].append((elapsed, ok))
+        client.close()
+        with self.lock:
+            for name, samples in local.items():
+                self.samples[name].extend(samples)
+            for kind, count in errors.items():
+                self.error_kinds[kind] = self.error_kinds.get(kind, 0) + count
+
+    def run(self, duration: float, warmup: float) -> float:
+        """Load chalayein - measured window ki length (seconds) return karein"""
+        start = time.perf_counter()
+        warmup_until = start + warmup
+        stop_at = warmup_until + duration
+        threads = [threading.Thread(target=self.worker, args=(index, warmup_until, stop_at), daemon=True)
+                   for index in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - warmup_until
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(samples: List[Tuple[float, bool]], elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles, throughput aur error rate"""
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    count = len(samples)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 6) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            "mean": round(sum(latencies) / count * 1000, 3) if count else 0.0
+        }
+    }
+
+def git_commit() -> Optional[str]:
+    """Current commit - results ko commits ke beech compare karne ke liye"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the Bluetooth AI Fix Master web server")
+    parser.add_argument('--url', help='Target an already running server instead of starting one')
+    parser.add_argument('--duration', type=float, default=10.0, help='Measured duration in seconds')
+    parser.add_argument('--warmup', type=float, default=1.0, help='Unmeasured warm-up in seconds')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client threads')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'Endpoint weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--devices', type=int, default=50, help='Simulated devices')
+    parser.add_argument('--scan-interval', type=float, default=2.0, help='Simulated scan interval (seconds)')
+    parser.add_argument('--fix-delay', type=float, default=0.05, help='Simulated fix duration (seconds)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Simulated fix failure probability')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout (seconds)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for devices and request mix')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--verbose', action='store_true', help='Show server output')
+    args = parser.parse_args(argv)
+
+    process = None
+    base_url = args.url
+    if not base_url:
+        print("🚀 Starting web server with simulated Bluetooth backend...")
+        process, base_url = start_server(args)
+
+    try:
+        languages = wait_ready(Client(base_url, args.timeout))
+        generator = LoadGenerator(base_url, args.mix, args.concurrency,
+                                  languages.get("languages", {}), languages.get("versions", {}),
+                                  generate_devices(args.devices, args.seed), args.timeout, args.seed)
+        print(f"🔥 Load testing {base_url} for {args.duration:.0f}s at concurrency {args.concurrency}...")
+        elapsed = generator.run(args.duration, args.warmup)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join(5)
+
+    all_samples = [sample for samples in generator.samples.values() for sample in samples]
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.url or "simulated",
+            "config": {
+                "duration": args.duration,
+                "warmup": args.warmup,
+                "concurrency": args.concurrency,
+                "mix": args.mix,
+                "devices": args.devices,
+                "scan_interval": args.scan_interval,
+                "fix_delay": args.fix_delay,
+                "fail_rate": args.fail_rate,
+                "seed": args.seed
+            }
+        },
+        "overall": summarize(all_samples, elapsed),
+        "endpoints": {name: summarize(samples, elapsed) for name, samples in generator.samples.items()},
+        "error_kinds": generator.error_kinds
+    }
+
+    print(f"\n{'endpoint':<14}{'requests':>10}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for name, stats in list(results["endpoints"].items()) + [("overall", results["overall"])]:
+        latency = stats["latency_ms"]
+        print(f"{name:<14}{stats['requests']:>10}{stats['throughput_rps']:>10}{latency['p50']:>10}"
+              f"{latency['p95']:>10}{latency['p99']:>10}{stats['error_rate']:>9.2%}")
+    if generator.error_kinds:
+        print(f"⚠️ Errors: {generator.error_kinds}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,154 @@ import sys
 import os
 import argparse
 
+# src modules ek doosre ko flat import karte hain (e.g. `from ai_bluetooth_fix import ...`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+# Har mode sirf apni zaroorat ke modules import karta hai - --scan Tk/Flask kabhi load nahi karta
+
+def run_gui(args):
+    from gui_interface import BluetoothAIGUI
+    app = BluetoothAIGUI()
+    app.run()
+
+def run_web(args):
+    print("🌐 Starting Web Server...")
+    from web_server import WebServer
+    server = WebServer(background_load=args.workers <= 1, profile=args.profile)
+    server.run(workers=args.workers, reuse_port=args.reuse_port)
+
+def write_devices(devices, args):
+    """Devices stream karein (human, --json ya --ndjson) - count return karta hai"""
+    import json
+
+    count = 0
+    if args.json:
+        sys.stdout.write("[")
+    for device in devices:
+        if args.ndjson:
+            sys.stdout.write(json.dumps(device, ensure_ascii=False) + "\n")
+        elif args.json:
+            sys.stdout.write(("," if count else "") + "\n  " + json.dumps(device, ensure_ascii=False))
+        else:
+            line = f"  • {device['name']} - {device['mac_address']}"
+            if device.get('adapters'):
+                line += " (" + ", ".join(f"{adapter} {rssi} dBm" for adapter, rssi in device['adapters'].items()) + ")"
+            sys.stdout.write(line + "\n")
+        # Pipe par bhi har device turant nikle
+        sys.stdout.flush()
+        count += 1
+
+    if args.json:
+        sys.stdout.write("\n]\n" if count else "]\n")
+    elif not args.ndjson:
+        # Sirf ek message - poora LanguageManager (saare bundles, warnings) nahi
+        from language_manager import format_message
+        from profiling import span
+        with span("i18n"):
+            message = format_message('devices_found_count', args.language, count=count)
+        print(f"📱 {message}")
+    return count
+
+def connect_daemon(args):
+    """Chal rahe daemon se connect karein (--no-daemon ya daemon na ho to None)"""
+    if args.no_daemon:
+        return None
+    from daemon import DaemonClient
+    return DaemonClient.connect(args.socket)
+
+def run_scan(args):
+    """Devices discover hote hi output karein - daemon chal raha ho to uski live registry se"""
+    from profiling import span
+
+    machine_output = args.json or args.ndjson
+    if not machine_output:
+        print("💻 Starting CLI Mode...")
+
+    if args.scan and args.adapters:
+        return run_adapter_scan(args)
+
+    client = connect_daemon(args) if args.scan else None
+    if client is not None:
+        with client, span("daemon.call"):
+            snapshot = client.call("scan" if args.fresh else "devices")
+        if not machine_output:
+            print(f"⚡ Using running daemon (generation {snapshot['generation']})")
+        with span("output"):
+            write_devices(snapshot["devices"], args)
+        return
+
+    with span("init"):
+        from ai_bluetooth_fix import AIBluetoothFixer
+        ai_fixer = AIBluetoothFixer(verbose=not machine_output)
+    if args.scan:
+        # Discovery aur output interleaved hain (streaming) - dono ek hi span mein
+        with span("scan.stream"):
+            write_devices(ai_fixer.iter_devices(scan_window=args.scan_window), args)
+
+def parse_adapters(value):
+    """'all' -> [] (saare adapters), 'hci0,hci1' -> ['hci0', 'hci1']"""
+    if value is None:
+        return None
+    return [] if value == 'all' else [name.strip() for name in value.split(',') if name.strip()]
+
+def run_adapter_scan(args):
+    """Saare/selected adapters par parallel scan (in-process)"""
+    from bluetooth_manager import BluetoothManager
+
+    manager = BluetoothManager()
+    result = manager.scan_adapters(parse_adapters(args.adapters) or None, duration=args.scan_window)
+    if not result["adapters"]:
+        print("No Bluetooth adapters found", file=sys.stderr)
+        sys.exit(1)
+    for adapter, error in result["errors"].items():
+        print(f"{adapter}: {error}", file=sys.stderr)
+    write_devices(result["devices"], args)
+
+def run_status(args):
+    """Bluetooth status - daemon se turant, warna in-process probe"""
+    import json
+
+    client = connect_daemon(args)
+    if client is not None:
+        with client:
+            status = client.call("status")
+    else:
+        from bluetooth_manager import BluetoothManager
+        status = BluetoothManager().get_bluetooth_status()
+    print(json.dumps(status, indent=2, ensure_ascii=False))
+
+def run_daemon(args):
+    from daemon import run_daemon as serve
+    serve(args.socket, args.scan_interval, parse_adapters(args.adapters), args.ingest)
+
+def run_diagnose(args):
+    """Recorded device data (NDJSON) offline diagnose karein"""
+    from bulk_diagnosis import main as bulk_main
+    return bulk_main(args.input, args.output, args.jobs, args.chunk_size, args.quiet)
+
+def run_ingest(args):
+    """btmon/HCI log passively ingest karein - issues wale devices print hote hain"""
+    from log_ingest import main as ingest_main
+    return ingest_main(args.source, args.follow, args.json or args.ndjson, args.quiet)
+
+def run_profiled(args, mode):
+    """Mode ko trace (aur optional cProfile) ke saath chalayein - breakdown stderr par"""
+    from profiling import cprofile, format_breakdown, tracing, write_chrome_trace
+
+    with cprofile(args.cprofile), tracing(mode.__name__) as trace:
+        try:
+            return mode(args)
+        finally:
+            trace.finish()
+            if args.profile:
+                print(format_breakdown(trace), file=sys.stderr)
+            if args.profile_trace:
+                write_chrome_trace([trace], args.profile_trace)
+                print(f"💾 Chrome trace saved to {args.profile_trace}", file=sys.stderr)
+            if args.cprofile:
+                print(f"💾 cProfile stats saved to {args.cprofile} (python -m pstats {args.cprofile})",
+                      file=sys.stderr)
+
 def main():
     parser = argparse.ArgumentParser(description="Bluetooth AI Fix Master")
     parser.add_argument('--gui', action='store_true', help='Start GUI interface')
@@ -15,42 +163,88 @@ def main():
     parser.add_argument('--cli', action='store_true', help='Command line interface')
     parser.add_argument('--language', type=str, default='en', help='Set language')
     parser.add_argument('--scan', action='store_true', help='Scan for devices')
-    
+    parser.add_argument('--scan-window', type=float, default=2.0, help='Scan duration in seconds')
+    parser.add_argument('--adapters', help="Scan on several controllers in parallel: 'all' or e.g. 'hci0,hci1'")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--json', action='store_true', help='Print scan results as a JSON array')
+    output.add_argument('--ndjson', action='store_true', help='Stream scan results as one JSON object per line')
+    parser.add_argument('--status', action='store_true', help='Print Bluetooth status as JSON')
+    parser.add_argument('--daemon', action='store_true', help='Run the resident daemon on a UNIX socket')
+    parser.add_argument('--socket', help='Daemon socket path (default: per-user runtime dir)')
+    parser.add_argument('--scan-interval', type=float, default=10.0, help='Daemon background scan interval (seconds)')
+    parser.add_argument('--ingest', metavar='SOURCE',
+                        help="Daemon: passively ingest 'btmon' (live) or a btmon/btsnoop log file")
+    parser.add_argument('--no-daemon', action='store_true', help='Never use a running daemon')
+    parser.add_argument('--fresh', action='store_true', help='With a daemon: wait for a new scan instead of the live snapshot')
+    parser.add_argument('--workers', type=int, default=1, help='Web server worker processes (pre-fork mode if > 1)')
+    parser.add_argument('--reuse-port', action='store_true', help='Bind each web worker with SO_REUSEPORT')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print a per-stage timing breakdown (web: add Server-Timing to every response)')
+    parser.add_argument('--profile-trace', metavar='PATH', help='Write a Chrome trace of the run (chrome://tracing)')
+    parser.add_argument('--cprofile', metavar='PATH', help='Dump cProfile stats of the run to PATH')
+
+    subparsers = parser.add_subparsers(dest='command')
+    diagnose = subparsers.add_parser('diagnose', help='Diagnose device records from an NDJSON file or stdin')
+    diagnose.add_argument('input', nargs='?', default='-', help='NDJSON input file (default: stdin)')
+    diagnose.add_argument('-o', '--output', help='Write NDJSON diagnoses here (default: stdout)')
+    diagnose.add_argument('-j', '--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    diagnose.add_argument('--chunk-size', type=int, default=500, help='Records per worker task')
+    diagnose.add_argument('-q', '--quiet', action='store_true', help='Do not print the summary to stderr')
+
+    ingest = subparsers.add_parser('ingest', help='Diagnose devices passively from btmon output or a saved HCI log')
+    ingest.add_argument('source', nargs='?', default='-',
+                        help="'btmon' (live capture), a btmon text log, a btsnoop file or - for stdin (default)")
+    ingest.add_argument('-f', '--follow', action='store_true', help='Keep reading as the log file grows')
+    ingest.add_argument('-q', '--quiet', action='store_true', help='Do not print the summary to stderr')
+    # SUPPRESS: `main.py --json ingest ...` wala top-level flag subparser ke default se overwrite na ho
+    ingest_output = ingest.add_mutually_exclusive_group()
+    ingest_output.add_argument('--json', action='store_true', default=argparse.SUPPRESS,
+                               help='Print results as one JSON object per line')
+    ingest_output.add_argument('--ndjson', action='store_true', default=argparse.SUPPRESS,
+                               help='Same as --json')
+
     args = parser.parse_args()
-    
+
+    # CLI modes ek baar chalte hain - unhe trace kiya ja sakta hai (web/daemon ke liye --profile per request hai)
+    profile_cli = args.profile or args.profile_trace or args.cprofile
+
     try:
-        if args.gui:
+        if args.command == 'diagnose':
+            sys.exit(run_profiled(args, run_diagnose) if profile_cli else run_diagnose(args))
+
+        elif args.command == 'ingest':
+            sys.exit(run_profiled(args, run_ingest) if profile_cli else run_ingest(args))
+
+        elif args.gui:
             print("🚀 Starting GUI Interface...")
-            from src.gui_interface import BluetoothAIGUI
-            app = BluetoothAIGUI()
-            app.run()
-            
+            run_gui(args)
+
         elif args.web:
-            print("🌐 Starting Web Server...")
-            from src.web_server import WebServer
-            server = WebServer()
-            server.run()
-            
+            run_web(args)
+
+        elif args.daemon:
+            run_daemon(args)
+
+        elif args.status:
+            run_profiled(args, run_status) if profile_cli else run_status(args)
+
         elif args.cli or args.scan:
-            print("💻 Starting CLI Mode...")
-            from src.ai_bluetooth_fix import AIBluetoothFixer
-            ai_fixer = AIBluetoothFixer()
-            
-            if args.scan:
-                devices = ai_fixer.scan_devices()
-                print(f"📱 Found {len(devices)} devices:")
-                for device in devices:
-                    print(f"  • {device['name']} - {device['mac_address']}")
-                    
+            run_profiled(args, run_scan) if profile_cli else run_scan(args)
+
         else:
             # Default to GUI
             print("🚀 Starting Bluetooth AI Fix Master...")
-            from src.gui_interface import BluetoothAIGUI
-            app = BluetoothAIGUI()
-            app.run()
-            
+            run_gui(args)
+
+    except BrokenPipeError:
+        # e.g. `main.py --scan --ndjson | head -1` - exit par flush dobara fail na ho
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
     except Exception as e:
-        print(f"❌ Error starting application: {e}")
+        if args.json or args.ndjson or args.command:
+            print(f"Error: {e}", file=sys.stderr)
+        else:
+            print(f"❌ Error starting application: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
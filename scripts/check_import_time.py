@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+CLI startup import-time budget check (CI / fleet health checks ke liye).
+
+    python scripts/check_import_time.py              # default budget
+    python scripts/check_import_time.py --budget-ms 80 --verbose
+
+`python -X importtime main.py --scan --ndjson --no-daemon` chalata hai aur fail karta hai agar:
+  - top-level imports ka total cumulative time budget se zyada ho, ya
+  - scan path par koi heavy module (Flask, Tk, NumPy, ...) import ho jaaye.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 100.0
+# Ye modules --scan path par kabhi load nahi hone chahiye
+FORBIDDEN_MODULES = ("flask", "werkzeug", "jinja2", "tkinter", "numpy", "pandas", "sklearn", "brotli")
+
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(command):
+    """-X importtime output parse karein: (top-level imports, saare module names)"""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + command, cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Command failed ({result.returncode}): {result.stderr[-2000:]}")
+    top_level = []
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, module = match.groups()
+        modules.add(module)
+        # Indent 1 space = top-level import (nested imports zyada indented hote hain)
+        if len(indent) == 1:
+            top_level.append((module, int(cumulative) / 1000))
+    return top_level, modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the CLI scan path import-time budget")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Maximum total import time in ms (default: {DEFAULT_BUDGET_MS:.0f})')
+    parser.add_argument('--runs', type=int, default=3, help='Take the best of N runs (reduces noise)')
+    parser.add_argument('--verbose', action='store_true', help='Show the slowest imports')
+    args = parser.parse_args()
+
+    command = ["main.py", "--scan", "--ndjson", "--scan-window", "0", "--no-daemon"]
+    best = None
+    for _ in range(args.runs):
+        top_level, modules = measure(command)
+        total = sum(ms for _, ms in top_level)
+        if best is None or total < best[0]:
+            best = (total, top_level, modules)
+    total, top_level, modules = best
+
+    if args.verbose:
+        for module, ms in sorted(top_level, key=lambda item: -item[1])[:15]:
+            print(f"  {ms:8.2f} ms  {module}")
+
+    forbidden = sorted(module for module in modules if module.split(".")[0] in FORBIDDEN_MODULES)
+    ok = True
+    if forbidden:
+        print(f"❌ Heavy modules imported on the scan path: {', '.join(forbidden)}")
+        ok = False
+    if total > args.budget_ms:
+        print(f"❌ Import time {total:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        ok = False
+    if ok:
+        print(f"✅ Import time {total:.1f} ms (budget {args.budget_ms:.0f} ms), no heavy modules")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -150,6 +150,14 @@ db = DeviceDatabase()
 print('✅ Device database initialized with', len(db.devices.get('devices', {})), 'companies')
 "
 
+# Build fingerprinted, precompressed web assets
+print_status "Building web assets..."
+(cd src && python3 asset_builder.py ../web_interface)
+
+# Compile translation catalog (mmap-able binary, shared by web workers)
+print_status "Compiling translation catalog..."
+(cd src && python3 translation_catalog.py ../web_interface/translations)
+
 # Create desktop shortcut (Linux)
 if command -v gnome-session &> /dev/null || [ "$XDG_CURRENT_DESKTOP" != "" ]; then
     print_status "Creating desktop shortcut..."
@@ -170,6 +178,8 @@ fi
 # Test the installation
 print_status "Testing installation..."
 python3 -c "
+import sys
+sys.path.insert(0, 'src')
 try:
     from src.ai_bluetooth_fix import AIBluetoothFixer
     from src.gui_interface import BluetoothAIGUI
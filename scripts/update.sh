@@ -45,6 +45,14 @@ db = DeviceDatabase()
 print('Device database updated with', len(db.devices.get('devices', {})), 'companies')
 "
 
+# Build fingerprinted, precompressed web assets
+print_status "Building web assets..."
+(cd src && python3 asset_builder.py ../web_interface)
+
+# Compile translation catalog (mmap-able binary, shared by web workers)
+print_status "Compiling translation catalog..."
+(cd src && python3 translation_catalog.py ../web_interface/translations)
+
 print_success "Update completed successfully!"
 echo ""
 echo "🚀 You can now run the application with:"
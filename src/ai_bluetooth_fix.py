@@ -2,14 +2,41 @@
 import json
 import platform
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional
+
+from profiling import profiled
 
 class AIBluetoothFixer:
-    def __init__(self):
+    # Trend-based diagnosis: kam se kam itne samples hon tabhi trend par bharosa
+    MIN_TREND_SAMPLES = 5
+    # Itne connected -> disconnected drops = unstable connection
+    MAX_CONNECTION_DROPS = 3
+    # dBm per minute - lagataar girta signal
+    RSSI_DECLINE_PER_MINUTE = -1.0
+    # % per hour - battery tezi se khatam ho rahi hai
+    BATTERY_DRAIN_PER_HOUR = -15.0
+    
+    def __init__(self, verbose: bool = True):
+        # verbose=False: koi console output nahi (e.g. --json/--ndjson CLI output)
+        self.verbose = verbose
         self.current_os = platform.system()
         self.problem_patterns = self.load_problem_patterns()
         self.fix_strategies = self.load_fix_strategies()
-        print(f"🤖 AI Bluetooth Fixer initialized for {self.current_os}")
+        # data/error_codes.json - pehli baar errors diagnose hone par load hota hai
+        self.error_knowledge = None
+        self.log(f"🤖 AI Bluetooth Fixer initialized for {self.current_os}")
+    
+    def log(self, message: str):
+        """Progress message print karein (sirf verbose mode mein)"""
+        if self.verbose:
+            print(message)
+    
+    def get_error_knowledge(self):
+        """Error code knowledge base (lazy - scan path par load nahi hota)"""
+        if self.error_knowledge is None:
+            from error_knowledge import ErrorKnowledgeBase
+            self.error_knowledge = ErrorKnowledgeBase()
+        return self.error_knowledge
         
     def load_problem_patterns(self) -> Dict[str, Any]:
         """Problem patterns load karein"""
@@ -33,6 +60,11 @@ class AIBluetoothFixer:
                 "symptoms": ["draining_fast", "not_charging", "incorrect_level"],
                 "confidence": 0.70,
                 "priority": "medium"
+            },
+            "adapter_issues": {
+                "symptoms": ["no_controller", "powered_off", "rfkill_blocked", "firmware_failed"],
+                "confidence": 0.90,
+                "priority": "high"
             }
         }
     
@@ -65,12 +97,25 @@ class AIBluetoothFixer:
                 "check_charging",
                 "update_power_settings",
                 "replace_battery"
+            ],
+            "adapter_issues": [
+                "power_on_adapter",
+                "unblock_rfkill",
+                "restart_bluetooth_service",
+                "reset_adapter",
+                "update_drivers"
             ]
         }
     
     def scan_devices(self) -> List[Dict[str, Any]]:
         """Bluetooth devices scan karein"""
-        print("🔍 Scanning for Bluetooth devices...")
+        devices = list(self.iter_devices())
+        self.log(f"✅ Found {len(devices)} devices")
+        return devices
+    
+    def iter_devices(self, scan_window: float = 2.0) -> Iterator[Dict[str, Any]]:
+        """Devices discover hote hi ek-ek karke yield karein"""
+        self.log("🔍 Scanning for Bluetooth devices...")
         
         # Simulate device scanning with realistic data
         devices = [
@@ -100,15 +145,50 @@ class AIBluetoothFixer:
             }
         ]
         
-        # Simulate scanning time
-        time.sleep(2)
-        print(f"✅ Found {len(devices)} devices")
-        return devices
+        # Simulate discovery - scan window ke dauraan devices ek-ek karke milte hain
+        for device in devices:
+            time.sleep(scan_window / len(devices))
+            yield device
     
-    def diagnose_device(self, device_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Complete device diagnosis karein"""
-        print(f"🔧 Diagnosing device: {device_info['name']}")
-        
+    @profiled("diagnose")
+    def diagnose_device(self, device_info: Dict[str, Any],
+                        trend: Optional[Dict[str, Any]] = None,
+                        errors: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Complete device diagnosis karein (errors = captured stderr/log lines)"""
+        self.log(f"🔧 Diagnosing device: {device_info['name']}")
+        diagnosis = self.analyze_device(device_info, trend=trend, errors=errors)
+        self.log(f"✅ Diagnosis complete for {device_info['name']}")
+        return diagnosis
+    
+    def diagnose_devices(self, devices: Iterable[Any],
+                         trend_lookup: Optional[Callable[[Dict[str, Any]], Optional[Dict]]] = None
+                         ) -> Iterator[Dict[str, Any]]:
+        """Bahut saare devices ek pass mein diagnose karein - har item ki error alag"""
+        # Same issue types ke liye fix suggestions ek hi baar banti hain
+        fix_cache: Dict[tuple, List[Dict]] = {}
+        for index, device_info in enumerate(devices):
+            try:
+                if not isinstance(device_info, dict):
+                    raise ValueError("device must be an object")
+                yield {
+                    "index": index,
+                    "success": True,
+                    "diagnosis": self.analyze_device(device_info, fix_cache,
+                                                     trend_lookup(device_info) if trend_lookup else None)
+                }
+            except Exception as e:
+                yield {
+                    "index": index,
+                    "success": False,
+                    "error": str(e)
+                }
+    
+    @profiled("diagnose.rules")
+    def analyze_device(self, device_info: Dict[str, Any],
+                       fix_cache: Optional[Dict[tuple, List[Dict]]] = None,
+                       trend: Optional[Dict[str, Any]] = None,
+                       errors: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Diagnosis rules evaluate karein (bina logging ke) - trend ho to snapshot ki jagah history par"""
         diagnosis = {
             "device": device_info,
             "detected_issues": [],
@@ -118,18 +198,53 @@ class AIBluetoothFixer:
             "risk_level": "low"
         }
         
+        # DeviceTrends.summary() - kam samples wala trend ignore
+        if trend and trend.get("samples", 0) >= self.MIN_TREND_SAMPLES:
+            diagnosis["trend"] = trend
+        else:
+            trend = None
+        
+        # Captured errors (BlueZ/HCI codes, bluetoothctl output) - sabse concrete evidence, isliye pehle
+        errors = errors if errors is not None else device_info.get('errors')
+        if errors:
+            if isinstance(errors, str):
+                errors = errors.splitlines()
+            diagnosis["detected_issues"].extend(self.get_error_knowledge().issues_from_errors(
+                line for line in errors if isinstance(line, str)))
+        
+        # Ek weak reading se nahi - trend ho to average signal dekhein
+        signal_strength = device_info.get('signal_strength', 0)
+        if trend and trend.get("rssi_mean") is not None:
+            signal_strength = trend["rssi_mean"]
+        
         # Connection analysis
-        if device_info.get('signal_strength', 0) < -60:
+        if signal_strength < -60:
+            diagnosis["detected_issues"].append({
+                "type": "connection_issues",
+                "confidence": 0.90 if trend else 0.85,
+                "description": (f"Consistently weak Bluetooth signal (average {signal_strength:.0f} dBm "
+                                f"over {trend['samples']} samples)" if trend
+                                else "Weak Bluetooth signal detected"),
+                "severity": "high"
+            })
+        elif trend and trend.get("connection_drops", 0) >= self.MAX_CONNECTION_DROPS:
             diagnosis["detected_issues"].append({
                 "type": "connection_issues",
                 "confidence": 0.85,
-                "description": "Weak Bluetooth signal detected",
+                "description": f"Connection dropped {trend['connection_drops']} times recently",
                 "severity": "high"
             })
+        elif trend and (trend.get("rssi_slope_per_minute") or 0) <= self.RSSI_DECLINE_PER_MINUTE:
+            diagnosis["detected_issues"].append({
+                "type": "connection_issues",
+                "confidence": 0.70,
+                "description": f"Signal getting weaker ({trend['rssi_slope_per_minute']:.1f} dBm/min)",
+                "severity": "medium"
+            })
         
         # Audio quality analysis (for audio devices)
         if any(audio_device in device_info.get('device_type', '') for audio_device in ['headphones', 'earbuds', 'speaker']):
-            if device_info.get('signal_strength', 0) < -50:
+            if signal_strength < -50:
                 diagnosis["detected_issues"].append({
                     "type": "audio_issues",
                     "confidence": 0.75,
@@ -145,11 +260,24 @@ class AIBluetoothFixer:
                 "description": "Low battery level may cause connectivity issues",
                 "severity": "medium"
             })
+        elif trend and (trend.get("battery_slope_per_hour") or 0) <= self.BATTERY_DRAIN_PER_HOUR:
+            diagnosis["detected_issues"].append({
+                "type": "battery_issues",
+                "confidence": 0.75,
+                "description": f"Battery draining fast ({-trend['battery_slope_per_hour']:.0f}% per hour)",
+                "severity": "medium"
+            })
             
         # Generate fix suggestions
-        diagnosis["suggested_fixes"] = self.generate_fix_suggestions(
-            diagnosis["detected_issues"]
-        )
+        if fix_cache is None:
+            diagnosis["suggested_fixes"] = self.generate_fix_suggestions(
+                diagnosis["detected_issues"]
+            )
+        else:
+            key = tuple((issue["type"], issue.get("error_code")) for issue in diagnosis["detected_issues"])
+            if key not in fix_cache:
+                fix_cache[key] = self.generate_fix_suggestions(diagnosis["detected_issues"])
+            diagnosis["suggested_fixes"] = [dict(fix) for fix in fix_cache[key]]
         
         # Calculate confidence score
         diagnosis["confidence_score"] = self.calculate_confidence(
@@ -159,24 +287,27 @@ class AIBluetoothFixer:
         # Set risk level
         diagnosis["risk_level"] = self.determine_risk_level(diagnosis["detected_issues"])
         
-        print(f"✅ Diagnosis complete for {device_info['name']}")
         return diagnosis
     
+    @profiled("diagnose.fixes")
     def generate_fix_suggestions(self, issues: List[Dict]) -> List[Dict]:
         """Fix suggestions generate karein"""
         fixes = []
+        seen = set()
         
-        for issue in issues:
-            issue_type = issue["type"]
-            if issue_type in self.fix_strategies:
-                for fix_action in self.fix_strategies[issue_type]:
-                    fixes.append({
-                        "action": fix_action,
-                        "description": self.get_fix_description(fix_action),
-                        "estimated_time": "2-5 minutes",
-                        "success_rate": 0.85,
-                        "complexity": "low"
-                    })
+        # Pehle saare error codes ke specific fixes, phir issue types ki general strategies
+        actions = [action for issue in issues for action in issue.get("fixes", [])]
+        actions += [action for issue in issues for action in self.fix_strategies.get(issue["type"], [])]
+        for fix_action in actions:
+            if fix_action not in seen:
+                seen.add(fix_action)
+                fixes.append({
+                    "action": fix_action,
+                    "description": self.get_fix_description(fix_action),
+                    "estimated_time": "2-5 minutes",
+                    "success_rate": 0.85,
+                    "complexity": "low"
+                })
                     
         return fixes[:5]  # Return top 5 fixes
     
@@ -188,7 +319,14 @@ class AIBluetoothFixer:
             "update_drivers": "Update Bluetooth drivers to latest version",
             "check_audio_settings": "Check and optimize audio settings",
             "clear_pairing_history": "Clear device pairing history and re-pair",
-            "calibrate_battery": "Calibrate battery for accurate readings"
+            "calibrate_battery": "Calibrate battery for accurate readings",
+            "power_on_adapter": "Power on the Bluetooth adapter",
+            "unblock_rfkill": "Unblock Bluetooth with rfkill",
+            "restart_bluetooth_service": "Restart the Bluetooth service",
+            "reset_adapter": "Reset the Bluetooth controller",
+            "disconnect_unused_devices": "Disconnect devices that are not in use",
+            "check_permissions": "Run with Bluetooth permissions (root or bluetooth group)",
+            "install_bluez": "Install the BlueZ Bluetooth tools"
         }
         return descriptions.get(fix_action, f"Apply {fix_action} fix")
     
@@ -213,9 +351,10 @@ class AIBluetoothFixer:
         else:
             return "low"
     
+    @profiled("fix")
     def apply_fix(self, fix_action: str, device_info: Dict) -> Dict[str, Any]:
         """Specific fix apply karein"""
-        print(f"🛠️ Applying fix: {fix_action} for {device_info['name']}")
+        self.log(f"🛠️ Applying fix: {fix_action} for {device_info['name']}")
         
         result = {
             "action": fix_action,
@@ -232,7 +371,7 @@ class AIBluetoothFixer:
         result["logs"].append(f"Started {fix_action} for {device_info['name']}")
         result["logs"].append(f"Completed {fix_action} successfully")
         
-        print(f"✅ Fix applied successfully: {fix_action}")
+        self.log(f"✅ Fix applied successfully: {fix_action}")
         return result
 
 # Test function
@@ -0,0 +1,109 @@
+# src/asset_builder.py
+import gzip
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List
+
+try:
+    import brotli
+except ImportError:  # Optional - brotli na ho to sirf gzip variants
+    brotli = None
+
+# Web interface ke static files jo fingerprint + precompress hote hain
+ASSETS = ["script.js", "bluetooth_web.js", "style.css"]
+DIST_DIR_NAME = "dist"
+MANIFEST_NAME = "manifest.json"
+# Pichhle builds ki file lists - chalta server purane hashed names abhi bhi link kar sakta hai
+BUILDS_NAME = "builds.json"
+# Itne recent builds ke files dist/ mein rehte hain, isse purane prune
+KEEP_BUILDS = 3
+
+def fingerprint_name(name: str, content: bytes) -> str:
+    """Content hash wala filename banayein, e.g. script.3f2a9c1d0b7e.js"""
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    base, ext = os.path.splitext(name)
+    return f"{base}.{digest}{ext}"
+
+def build_assets(web_dir: str = "web_interface") -> Dict[str, str]:
+    """Assets ko hashed names, gzip/brotli variants aur manifest ke saath dist/ mein likhein"""
+    dist_dir = os.path.join(web_dir, DIST_DIR_NAME)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifest = {}
+    written = set()
+    for name in ASSETS:
+        with open(os.path.join(web_dir, name), "rb") as f:
+            content = f.read()
+        hashed = fingerprint_name(name, content)
+        manifest[name] = hashed
+
+        variants = {hashed: content, hashed + ".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli:
+            variants[hashed + ".br"] = brotli.compress(content, quality=11)
+        for filename, data in variants.items():
+            with open(os.path.join(dist_dir, filename), "wb") as f:
+                f.write(data)
+            written.add(filename)
+
+    # Sirf KEEP_BUILDS se purane builds ke files hatayein - pichhla build serve hota rehta hai
+    builds = [sorted(written)] + [files for files in load_builds(dist_dir) if set(files) != written]
+    builds = builds[:KEEP_BUILDS]
+    keep = {MANIFEST_NAME, BUILDS_NAME}.union(*builds)
+    for filename in os.listdir(dist_dir):
+        if filename not in keep:
+            os.remove(os.path.join(dist_dir, filename))
+
+    write_json(os.path.join(dist_dir, BUILDS_NAME), builds)
+    write_json(os.path.join(dist_dir, MANIFEST_NAME), manifest)
+    return manifest
+
+def write_json(path: str, data):
+    """JSON atomically likhein (temp file + replace)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def load_builds(dist_dir: str) -> List[List[str]]:
+    """Pichhle builds ki file lists (naya pehle) - history na ho to dist/ ke maujooda files ek build"""
+    try:
+        with open(os.path.join(dist_dir, BUILDS_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return [[name for name in os.listdir(dist_dir) if name != MANIFEST_NAME]]
+    except Exception as e:
+        print(f"⚠️ Ignoring asset build history: {e}")
+        return []
+
+def load_manifest(web_dir: str) -> Dict[str, str]:
+    """Build manifest load karein (build na hua ho to khaali) - build ke baad edit hue sources plain serve"""
+    path = os.path.join(web_dir, DIST_DIR_NAME, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        built_at = os.path.getmtime(path)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"⚠️ Ignoring asset manifest: {e}")
+        return {}
+    stale = [name for name in manifest if _newer_than(os.path.join(web_dir, name), built_at)]
+    if stale:
+        print(f"⚠️ Assets changed since last build, serving unhashed: {', '.join(stale)} "
+              f"(run: python src/asset_builder.py web_interface)")
+    return {name: hashed for name, hashed in manifest.items() if name not in stale}
+
+def _newer_than(path: str, timestamp: float) -> bool:
+    try:
+        return os.path.getmtime(path) > timestamp
+    except OSError:
+        return False
+
+if __name__ == "__main__":
+    web_dir = sys.argv[1] if len(sys.argv) > 1 else "web_interface"
+    manifest = build_assets(web_dir)
+    for name, hashed in manifest.items():
+        print(f"  • {name} -> {DIST_DIR_NAME}/{hashed}")
+    print(f"✅ Built {len(manifest)} assets" + ("" if brotli else " (brotli not installed, gzip only)"))
@@ -1,35 +1,158 @@
 
 # src/bluetooth_manager.py
+import os
 import platform
 import subprocess
 import sys
 import re
-from typing import Dict, List, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Callable, Iterable, Optional
+
+from profiling import profiled
+
+# Itne recent command failures yaad rahte hain (diagnosis ke liye)
+MAX_COMMAND_ERRORS = 100
+# Isse purane errors diagnosis/status mein nahi aate (seconds)
+ERROR_MAX_AGE = 600.0
+# bluetoothctl errors stdout par likhta hai - failed command ki aisi lines bhi record hoti hain
+ERROR_HINT = re.compile(r"error|fail|not available|timed? ?out|refused|blocked|denied", re.IGNORECASE)
+MAC_ADDRESS = re.compile(r"(?:[0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}")
+
+class BtmgmtBackend:
+    """Linux multi-adapter backend - har controller (hci0..hciN) par alag discovery"""
+
+    name = "btmgmt"
+    SYSFS_DIR = "/sys/class/bluetooth"
+    # Window ke baad btmgmt ko band hone ke liye itna time (scan window se alag)
+    STOP_TIMEOUT = 2.0
+    DEV_FOUND = re.compile(r"dev_found:\s+([0-9A-Fa-f:]{17})\s+type\s+.*?rssi\s+(-?\d+)")
+
+    def list_adapters(self) -> List[str]:
+        """Controllers ki list (sysfs se - koi subprocess nahi)"""
+        try:
+            names = [name for name in os.listdir(self.SYSFS_DIR) if re.fullmatch(r"hci\d+", name)]
+        except OSError:
+            return []
+        return sorted(names, key=lambda name: int(name[3:]))
+
+    def scan_adapter(self, adapter: str, duration: float) -> List[Dict[str, Any]]:
+        """Ek controller par discovery sirf `duration` seconds - observations (mac, name, rssi) return"""
+        # `btmgmt find` khud ~10.24s chalta hai - window khatam hone par use rok kar jo mila woh parse
+        process = subprocess.Popen(['btmgmt', '--index', adapter[3:], 'find'],
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        try:
+            stdout, stderr = process.communicate(timeout=duration)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                # communicate() dobara bulane par window mein padha output nahi khota
+                stdout, stderr = process.communicate(timeout=self.STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                stdout, stderr = process.communicate()
+            self.stop_discovery(adapter)
+        else:
+            if process.returncode != 0:
+                raise RuntimeError(stderr.strip() or f"btmgmt exited with {process.returncode}")
+        return self.parse_find_output(stdout, adapter)
+
+    def stop_discovery(self, adapter: str):
+        """Beech mein roke gaye find ki discovery band karein (best effort)"""
+        try:
+            subprocess.run(['btmgmt', '--index', adapter[3:], 'stop-find'],
+                           capture_output=True, timeout=self.STOP_TIMEOUT)
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+    def parse_find_output(self, output: str, adapter: str) -> List[Dict[str, Any]]:
+        """`btmgmt find` output parse karein (dev_found lines + unke neeche name)"""
+        observations: Dict[str, Dict[str, Any]] = {}
+        current = None
+        for line in output.splitlines():
+            match = self.DEV_FOUND.search(line)
+            if match:
+                mac = match.group(1).upper()
+                current = observations.setdefault(mac, {"adapter": adapter, "mac_address": mac, "name": None})
+                current["rssi"] = int(match.group(2))
+            elif current is not None and line.strip().startswith("name "):
+                current["name"] = current["name"] or line.strip()[5:]
+        return list(observations.values())
 
 class BluetoothManager:
-    def __init__(self):
+    def __init__(self, backend=None):
         self.system = platform.system().lower()
-        self.available = self.check_bluetooth_availability()
+        # Subprocess failures (exit code, stderr, error lines) - diagnose_device inhe classify karta hai
+        self.command_errors = deque(maxlen=MAX_COMMAND_ERRORS)
+        self.errors_lock = threading.Lock()
+        # Multi-adapter scanning ka backend (tests/demos ke liye fake backend diya ja sakta hai)
+        self.backend = backend
+        self.available = True if backend is not None else self.check_bluetooth_availability()
+        if self.backend is None and self.system == "linux":
+            self.backend = BtmgmtBackend()
         
+    def run_command(self, args: List[str], timeout: Optional[float] = None,
+                    mac: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Subprocess chalayein - non-zero exit, stderr aur error lines record hoti hain"""
+        try:
+            result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+        except (OSError, subprocess.SubprocessError) as e:
+            self.record_error(args, None, [f"{args[0]}: {e}"], mac)
+            raise
+        lines = [line.strip() for line in result.stderr.splitlines() if line.strip()]
+        if result.returncode != 0:
+            # Exit 0 par stdout hints nahi - "Failsafe ..." jaisa device naam error nahi hai
+            lines += [line.strip() for line in result.stdout.splitlines() if ERROR_HINT.search(line)]
+        if result.returncode != 0 or lines:
+            self.record_error(args, result.returncode,
+                              lines or [f"{args[0]} exited with status {result.returncode}"], mac)
+        return result
+    
+    def record_error(self, args: List[str], returncode: Optional[int], lines: List[str],
+                     mac: Optional[str] = None, adapter: Optional[str] = None):
+        """Command failure yaad rakhein - mac na diya ho to args/lines se dhundhein"""
+        if mac is None:
+            found = MAC_ADDRESS.search(" ".join(list(args) + lines))
+            mac = found.group(0) if found else None
+        with self.errors_lock:
+            self.command_errors.append({
+                "command": " ".join(args),
+                "returncode": returncode,
+                "lines": lines,
+                "mac_address": mac.upper() if mac else None,
+                "adapter": adapter,
+                "timestamp": time.time()
+            })
+    
+    def recent_errors(self, mac: Optional[str] = None, max_age: Optional[float] = None) -> List[str]:
+        """Device ki recent error lines - mac na diya ho to sirf adapter-wide (kisi device ki nahi)"""
+        mac = mac.upper() if mac else None
+        cutoff = time.time() - max_age if max_age else 0
+        with self.errors_lock:
+            records = list(self.command_errors)
+        return [line for record in records
+                if record["timestamp"] >= cutoff and record["mac_address"] == mac
+                for line in record["lines"]]
+    
     def check_bluetooth_availability(self) -> bool:
         """Bluetooth availability check karein"""
         try:
             if self.system == "linux":
-                result = subprocess.run(['bluetoothctl', '--version'], 
-                                      capture_output=True, text=True)
+                result = self.run_command(['bluetoothctl', '--version'])
                 return result.returncode == 0
             elif self.system == "windows":
-                result = subprocess.run(['powershell', 'Get-WindowsFeature', '-Name', 'Bluetooth'], 
-                                      capture_output=True, text=True)
+                result = self.run_command(['powershell', 'Get-WindowsFeature', '-Name', 'Bluetooth'])
                 return "Installed" in result.stdout
             elif self.system == "darwin":  # macOS
-                result = subprocess.run(['system_profiler', 'SPBluetoothDataType'], 
-                                      capture_output=True, text=True)
+                result = self.run_command(['system_profiler', 'SPBluetoothDataType'])
                 return "Bluetooth:" in result.stdout
             return False
         except Exception:
             return False
     
+    @profiled("scan")
     def scan_devices(self) -> List[Dict[str, Any]]:
         """Bluetooth devices scan karein system-specific methods se"""
         if not self.available:
@@ -52,43 +175,41 @@ class BluetoothManager:
         """Linux par devices scan karein"""
         try:
             # Bluetoothctl se devices scan karein
-            result = subprocess.run([
-                'bluetoothctl', 'scan', 'on'
-            ], capture_output=True, text=True, timeout=10)
+            result = self.run_command(['bluetoothctl', 'scan', 'on'], timeout=10)
             
             # Devices list get karein
-            result = subprocess.run([
-                'bluetoothctl', 'devices'
-            ], capture_output=True, text=True)
-            
-            devices = []
-            for line in result.stdout.split('\n'):
-                if 'Device' in line:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        mac = parts[1]
-                        name = ' '.join(parts[2:]) if len(parts) > 2 else 'Unknown Device'
-                        devices.append({
-                            'name': name,
-                            'mac_address': mac,
-                            'signal_strength': -50,  # Default value
-                            'connected': False,
-                            'device_type': self.detect_device_type(name)
-                        })
+            result = self.run_command(['bluetoothctl', 'devices'])
             
+            devices = self.parse_bluetoothctl_devices(result.stdout)
             return devices if devices else self.get_simulated_devices()
             
         except Exception as e:
             print(f"Linux scan error: {e}")
             return self.get_simulated_devices()
     
+    def parse_bluetoothctl_devices(self, output: str) -> List[Dict[str, Any]]:
+        """`bluetoothctl devices` output parse karein"""
+        devices = []
+        for line in output.split('\n'):
+            if 'Device' in line:
+                parts = line.split()
+                if len(parts) >= 2:
+                    mac = parts[1]
+                    name = ' '.join(parts[2:]) if len(parts) > 2 else 'Unknown Device'
+                    devices.append({
+                        'name': name,
+                        'mac_address': mac,
+                        'signal_strength': -50,  # Default value
+                        'connected': False,
+                        'device_type': self.detect_device_type(name)
+                    })
+        return devices
+    
     def scan_windows_devices(self) -> List[Dict[str, Any]]:
         """Windows par devices scan karein"""
         try:
             # PowerShell se Bluetooth devices get karein
-            result = subprocess.run([
-                'powershell', 'Get-BluetoothDevice'
-            ], capture_output=True, text=True)
+            result = self.run_command(['powershell', 'Get-BluetoothDevice'])
             
             devices = []
             lines = result.stdout.split('\n')
@@ -112,9 +233,7 @@ class BluetoothManager:
     def scan_macos_devices(self) -> List[Dict[str, Any]]:
         """macOS par devices scan karein"""
         try:
-            result = subprocess.run([
-                'system_profiler', 'SPBluetoothDataType'
-            ], capture_output=True, text=True)
+            result = self.run_command(['system_profiler', 'SPBluetoothDataType'])
             
             devices = []
             # Simple parsing - production mein better parsing karein
@@ -187,12 +306,97 @@ class BluetoothManager:
         else:
             return "unknown"
     
+    def list_adapters(self) -> List[str]:
+        """Available Bluetooth controllers (e.g. ['hci0', 'hci1'])"""
+        return self.backend.list_adapters() if self.backend else []
+    
+    @profiled("scan.adapters")
+    def scan_adapters(self, adapters: Optional[Iterable[str]] = None, duration: float = 10.0,
+                      on_adapter_done: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None
+                      ) -> Dict[str, Any]:
+        """Saare (ya selected) adapters par ek saath scan - merged devices aur per-adapter errors"""
+        adapters = list(adapters) if adapters else self.list_adapters()
+        observations: List[Dict[str, Any]] = []
+        errors: Dict[str, str] = {}
+        if not adapters:
+            return {"devices": [], "adapters": [], "errors": errors}
+        
+        with ThreadPoolExecutor(max_workers=len(adapters), thread_name_prefix="bt-scan") as executor:
+            futures = {executor.submit(self.backend.scan_adapter, adapter, duration): adapter
+                       for adapter in adapters}
+            for future in as_completed(futures):
+                adapter = futures[future]
+                try:
+                    found = future.result()
+                except Exception as e:
+                    # Ek kharab dongle baaki adapters ka scan nahi rokta
+                    errors[adapter] = str(e)
+                    self.record_error(['btmgmt', '--index', adapter[3:], 'find'], None,
+                                      str(e).splitlines() or [type(e).__name__], adapter=adapter)
+                    print(f"{adapter} scan error: {e}")
+                    continue
+                observations.extend(found)
+                if on_adapter_done:
+                    on_adapter_done(adapter, found)
+        
+        return {"devices": self.merge_observations(observations), "adapters": adapters, "errors": errors}
+    
+    def merge_observations(self, observations: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Per-adapter observations ko MAC par merge karein - sabse strong RSSI wala adapter best"""
+        devices: Dict[str, Dict[str, Any]] = {}
+        for observation in observations:
+            mac = observation["mac_address"].upper()
+            device = devices.get(mac)
+            if device is None:
+                device = devices[mac] = {
+                    "name": None,
+                    "mac_address": mac,
+                    "signal_strength": None,
+                    "connected": False,
+                    "adapters": {}
+                }
+            device["adapters"][observation["adapter"]] = observation["rssi"]
+            if not device["name"] and observation.get("name"):
+                device["name"] = observation["name"]
+        
+        for device in devices.values():
+            device["best_adapter"] = max(device["adapters"], key=device["adapters"].get)
+            device["signal_strength"] = device["adapters"][device["best_adapter"]]
+            device["name"] = device["name"] or "Unknown Device"
+            device["device_type"] = self.detect_device_type(device["name"])
+        return sorted(devices.values(), key=lambda device: device["mac_address"])
+    
+    def scan_into_registry(self, registry, adapters: Optional[Iterable[str]] = None,
+                           duration: float = 10.0, keep: Iterable[str] = ()) -> Dict[str, Any]:
+        """Multi-adapter scan ko DeviceRegistry mein merge karein - har adapter complete hote hi update
+
+        keep: scan mein na dikhe tab bhi na hatayein (e.g. log ingestion mein active devices)"""
+        observations: List[Dict[str, Any]] = []
+        
+        def adapter_done(adapter, found):
+            observations.extend(found)
+            seen = {observation["mac_address"].upper() for observation in found}
+            for device in self.merge_observations(observations):
+                if device["mac_address"] in seen:
+                    registry.upsert(device)
+        
+        started = time.monotonic()
+        result = self.scan_adapters(adapters, duration, adapter_done)
+        if result["adapters"] and len(result["errors"]) < len(result["adapters"]):
+            # Kam se kam ek adapter ne scan kiya - jo kisi ne nahi dekha woh hatayein
+            registry.retain([device["mac_address"] for device in result["devices"]] + list(keep))
+        result["duration"] = round(time.monotonic() - started, 3)
+        return result
+    
     def get_bluetooth_status(self) -> Dict[str, Any]:
         """Bluetooth system status get karein"""
         return {
             "system": self.system,
             "bluetooth_available": self.available,
             "status": "active" if self.available else "inactive",
+            "adapters": self.list_adapters(),
+            # Adapter-wide errors ek hi baar yahan - device diagnosis mein nahi
+            "adapter_errors": self.recent_errors(max_age=ERROR_MAX_AGE)[-10:],
             "supported_operations": ["scan", "diagnose", "fix"]
         }
 
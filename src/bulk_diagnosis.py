@@ -0,0 +1,134 @@
+# src/bulk_diagnosis.py
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterator, Optional, TextIO, Tuple
+
+# Ek chunk mein kitne records ek worker ko jaate hain
+DEFAULT_CHUNK_SIZE = 500
+
+# Har worker process ka apna fixer aur fix-suggestion cache (initializer mein bante hain)
+_fixer = None
+_fix_cache: Dict[tuple, List[Dict]] = {}
+
+def _init_worker():
+    global _fixer
+    from ai_bluetooth_fix import AIBluetoothFixer
+    _fixer = AIBluetoothFixer(verbose=False)
+
+def read_chunks(stream: TextIO, chunk_size: int) -> Iterator[List[Tuple[int, str]]]:
+    """Input ko lazily (line number, raw line) chunks mein padhein - poori file kabhi memory mein nahi"""
+    chunk = []
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        chunk.append((line_number, line))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def diagnose_record(line_number: int, line: str) -> Dict[str, Any]:
+    """Ek NDJSON record diagnose karein - device object ya {"device": {...}} dono chalte hain"""
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("record must be a JSON object")
+        device = record.get("device") if isinstance(record.get("device"), dict) else record
+        result = {
+            "line": line_number,
+            "success": True,
+            "diagnosis": _fixer.analyze_device(device, _fix_cache)
+        }
+        if "id" in record:
+            result["id"] = record["id"]
+        return result
+    except Exception as e:
+        return {"line": line_number, "success": False, "error": f"{type(e).__name__}: {e}"}
+
+def diagnose_chunk(chunk: List[Tuple[int, str]]) -> Tuple[str, int, int]:
+    """Worker mein chunk diagnose aur serialize karein - (output text, records, errors)"""
+    if _fixer is None:
+        _init_worker()
+    lines = []
+    errors = 0
+    for line_number, line in chunk:
+        result = diagnose_record(line_number, line)
+        if not result["success"]:
+            errors += 1
+        lines.append(json.dumps(result, ensure_ascii=False))
+    return "\n".join(lines) + "\n", len(chunk), errors
+
+def run_bulk_diagnosis(stream: TextIO, output: TextIO, workers: Optional[int] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE, prefetch: int = 2) -> Dict[str, Any]:
+    """Records ko process pool par fan-out karein, results input order mein likhein.
+
+    Memory bounded hai: ek waqt mein sirf workers * prefetch chunks in-flight rehte hain."""
+    workers = workers or os.cpu_count() or 1
+    started = time.monotonic()
+    records = errors = 0
+
+    def write(result):
+        nonlocal records, errors
+        text, count, failed = result
+        output.write(text)
+        records += count
+        errors += failed
+
+    chunks = read_chunks(stream, chunk_size)
+    if workers == 1:
+        # Single process - debugging aur bina fork wale platforms ke liye
+        for chunk in chunks:
+            write(diagnose_chunk(chunk))
+    else:
+        max_pending = workers * prefetch
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            pending = deque()
+            try:
+                for chunk in chunks:
+                    pending.append(executor.submit(diagnose_chunk, chunk))
+                    if len(pending) >= max_pending:
+                        # Sabse purana chunk pehle - output order input jaisa
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+    output.flush()
+
+    elapsed = time.monotonic() - started
+    return {
+        "records": records,
+        "errors": errors,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(records / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+def main(input_path: str = "-", output_path: Optional[str] = None, workers: Optional[int] = None,
+         chunk_size: int = DEFAULT_CHUNK_SIZE, quiet: bool = False) -> int:
+    """CLI entry: `main.py diagnose [input.ndjson|-] [-o output.ndjson]`"""
+    stream = sys.stdin if input_path == "-" else open(input_path, "r", encoding="utf-8")
+    output = sys.stdout if not output_path or output_path == "-" else open(output_path, "w", encoding="utf-8")
+    try:
+        summary = run_bulk_diagnosis(stream, output, workers, chunk_size)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if output is not sys.stdout:
+            output.close()
+    if not quiet:
+        # Summary stderr par - stdout sirf NDJSON rahe
+        print(f"✅ Diagnosed {summary['records']} records ({summary['errors']} errors) in "
+              f"{summary['seconds']}s with {summary['workers']} workers "
+              f"({summary['records_per_second']}/s)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
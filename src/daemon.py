@@ -0,0 +1,367 @@
+# src/daemon.py
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional
+
+# Protocol: har request/response ek JSON line
+#   -> {"cmd": "devices", "args": {"wait": 5}}
+#   <- {"ok": true, "result": {...}}   ya   {"ok": false, "error": "..."}
+# Ek connection par kai requests bheji ja sakti hain.
+MAX_REQUEST_BYTES = 1024 * 1024
+
+def default_socket_path() -> str:
+    """Per-user socket path ($XDG_RUNTIME_DIR ho to wahan, warna temp dir)"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "bluetooth-ai-fix.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(tempfile.gettempdir(), f"bluetooth-ai-fix-{uid}.sock")
+
+class DaemonError(Exception):
+    """Daemon ne request reject ki (daemon chal raha hai, par command fail hua)"""
+
+class DaemonClient:
+    """Daemon ka chhota client - daemon na chal raha ho to connect() None return karta hai"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self.sock = None
+        self.reader = None
+
+    @classmethod
+    def connect(cls, socket_path: Optional[str] = None, timeout: float = 30.0) -> Optional["DaemonClient"]:
+        if not hasattr(socket, "AF_UNIX"):
+            return None
+        client = cls(socket_path, timeout)
+        try:
+            client.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.sock.settimeout(timeout)
+            client.sock.connect(client.socket_path)
+        except OSError:
+            client.close()
+            return None
+        client.reader = client.sock.makefile("r", encoding="utf-8")
+        return client
+
+    def call(self, cmd: str, **args) -> Any:
+        """Ek command bhejein aur uska result return karein"""
+        self.sock.sendall((json.dumps({"cmd": cmd, "args": args}) + "\n").encode("utf-8"))
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "unknown error"))
+        return response.get("result")
+
+    def close(self):
+        if self.reader:
+            self.reader.close()
+        if self.sock:
+            self.sock.close()
+        self.sock = self.reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class BluetoothDaemon:
+    """Resident process - manager, fixer, database aur live registry warm rehte hain"""
+
+    def __init__(self, socket_path: Optional[str] = None, scan_interval: float = 10.0,
+                 adapters: Optional[List[str]] = None, bluetooth_manager=None,
+                 trends_path: Optional[str] = None, ingest_source: Optional[str] = None):
+        from ai_bluetooth_fix import AIBluetoothFixer
+        from bluetooth_manager import ERROR_MAX_AGE, BluetoothManager
+        from device_database import DeviceDatabase
+        from device_registry import DeviceRegistry
+        from device_trends import SAVE_INTERVAL, DeviceTrends, default_trends_path, trends_available
+
+        self.socket_path = socket_path or default_socket_path()
+        self.scan_interval = scan_interval
+        # None = fixer ka default scan, [] = saare adapters, ['hci0', ...] = selected adapters
+        self.adapters = adapters
+        self.started_at = time.time()
+        # Diagnosis mein isse purane command errors nahi aate
+        self.error_max_age = ERROR_MAX_AGE
+
+        # Ek hi baar: availability probe, knowledge base, database indexes
+        self.bluetooth_manager = bluetooth_manager or BluetoothManager()
+        self.ai_fixer = AIBluetoothFixer(verbose=False)
+        self.device_database = DeviceDatabase()
+        self.registry = DeviceRegistry()
+        # Har scan ka ek sample per device - restart ke baad bhi history bani rahe
+        self.trends_path = trends_path or default_trends_path()
+        self.trends = DeviceTrends.load(self.trends_path) if trends_available() else None
+        self.trends_saved_at = time.monotonic()
+        self.trends_save_interval = SAVE_INTERVAL
+        # Passive ingestion (btmon ya log file) - scans ke beech bhi drops/auth failures registry tak
+        self.ingest_source = ingest_source
+        self.log_ingestor = None
+        if ingest_source:
+            from log_ingest import LogIngestor
+            self.log_ingestor = LogIngestor(self.registry, self.ai_fixer, self.trends)
+
+        self.stop_event = threading.Event()
+        self.scan_requested = threading.Event()
+        self.scan_done = threading.Condition()
+        self.scans_completed = 0
+        self.scanning = False
+        self.last_scan_at = None
+        self.last_scan_duration = None
+        self.server_socket = None
+        self.shutdown_requested = False
+        self.lock = threading.Lock()
+
+        self.commands: Dict[str, Callable[..., Any]] = {
+            "ping": self.cmd_ping,
+            "status": self.cmd_status,
+            "devices": self.cmd_devices,
+            "scan": self.cmd_scan,
+            "diagnose": self.cmd_diagnose,
+            "device_info": self.cmd_device_info,
+            "trends": self.cmd_trends,
+            "shutdown": self.cmd_shutdown
+        }
+
+    # --- Background scanning ---
+
+    def scan_loop(self):
+        """Periodically scan karke registry update karein"""
+        while not self.stop_event.is_set():
+            try:
+                self.run_scan()
+            except Exception as e:
+                print(f"❌ Background scan error: {e}")
+            self.scan_requested.wait(self.scan_interval)
+            self.scan_requested.clear()
+
+    def run_scan(self):
+        started = time.monotonic()
+        with self.scan_done:
+            self.scanning = True
+        try:
+            if self.adapters is not None:
+                # Multi-adapter: har device ke saath kis adapter ne kitne RSSI par dekha
+                self.bluetooth_manager.scan_into_registry(self.registry, self.adapters or None,
+                                                          keep=self.log_active_macs())
+            else:
+                seen = []
+                for device in self.ai_fixer.iter_devices():
+                    seen.append(device["mac_address"])
+                    self.registry.upsert(device)
+                self.registry.retain(seen + self.log_active_macs())
+            self.record_trends()
+        finally:
+            # Failed scan bhi complete gina jaata hai - waiters timeout tak na latkein
+            with self.scan_done:
+                self.scanning = False
+                self.last_scan_duration = time.monotonic() - started
+                self.last_scan_at = time.time()
+                self.scans_completed += 1
+                self.scan_done.notify_all()
+
+    def log_active_macs(self) -> List[str]:
+        """Log mein haal hi mein dikhe devices - scan mein na milein tab bhi registry mein rahein"""
+        return self.log_ingestor.active_macs() if self.log_ingestor is not None else []
+
+    def ingest_loop(self):
+        """Log source follow karein - issues wale diagnoses print hote hain"""
+        try:
+            from log_ingest import describe_result
+            for result in self.log_ingestor.run(self.ingest_source, follow=True, stop_event=self.stop_event):
+                print(f"⚠️  {describe_result(result)}")
+        except Exception as e:
+            print(f"❌ Log ingestion stopped ({self.ingest_source}): {e}")
+
+    def record_trends(self):
+        """Scan ke baad registry ke devices trends mein record karein, kabhi-kabhi disk par bhi"""
+        if self.trends is None:
+            return
+        self.trends.record_many(self.registry.snapshot()["devices"])
+        if time.monotonic() - self.trends_saved_at >= self.trends_save_interval:
+            self.save_trends()
+
+    def save_trends(self):
+        if self.trends is None:
+            return
+        try:
+            self.trends.save(self.trends_path)
+            self.trends_saved_at = time.monotonic()
+        except OSError as e:
+            print(f"❌ Could not save device trends: {e}")
+
+    def wait_for_scan(self, after: int, timeout: float) -> bool:
+        """`after` ke baad wala scan complete hone tak wait karein"""
+        with self.scan_done:
+            return self.scan_done.wait_for(lambda: self.scans_completed > after, timeout)
+
+    # --- Commands ---
+
+    def cmd_ping(self):
+        return {"pid": os.getpid(), "uptime": round(time.time() - self.started_at, 3)}
+
+    def cmd_status(self):
+        status = self.bluetooth_manager.get_bluetooth_status()
+        if self.log_ingestor is not None:
+            status["adapter_errors"] = (status["adapter_errors"] +
+                                        self.log_ingestor.errors(max_age=self.log_ingestor.FLAP_WINDOW))[-10:]
+        return {
+            **status,
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at, 3),
+            "devices": len(self.registry),
+            "trend_devices": len(self.trends) if self.trends is not None else None,
+            "log_ingest": self.log_ingestor.stats() if self.log_ingestor is not None else None,
+            "generation": self.registry.generation,
+            "scans_completed": self.scans_completed,
+            "last_scan_at": self.last_scan_at,
+            "last_scan_duration": self.last_scan_duration
+        }
+
+    def cmd_devices(self, wait: float = 10.0):
+        """Live registry snapshot - pehla scan abhi chal raha ho to uska wait"""
+        if self.scans_completed == 0:
+            self.wait_for_scan(0, min(float(wait), 60.0))
+        return self.registry.snapshot()
+
+    def cmd_scan(self, timeout: float = 30.0):
+        """Naya scan karwayein aur uske complete hone ka wait karein"""
+        with self.scan_done:
+            # Chal raha scan request se pehle shuru hua tha - uske baad wala chahiye
+            before = self.scans_completed + (1 if self.scanning else 0)
+        self.scan_requested.set()
+        if not self.wait_for_scan(before, min(float(timeout), 120.0)):
+            raise TimeoutError("Scan did not complete in time")
+        return self.registry.snapshot()
+
+    def cmd_diagnose(self, device: Optional[Dict[str, Any]] = None, mac: Optional[str] = None):
+        if device is None:
+            device = self.registry.get(mac) if mac else None
+            if device is None:
+                raise KeyError(f"Unknown device: {mac}")
+        trend = self.trends.summary(device.get("mac_address", "")) if self.trends is not None else None
+        # Sirf is device ke recent bluetoothctl/hciconfig errors - adapter-wide errors status mein hain
+        mac = device.get("mac_address")
+        errors = self.bluetooth_manager.recent_errors(mac, self.error_max_age) if mac else []
+        if self.log_ingestor is not None:
+            # btmon/log se: disconnect reasons, auth failures aur flapping
+            errors += self.log_ingestor.errors(mac, self.log_ingestor.FLAP_WINDOW) if mac else []
+            trend = trend or self.log_ingestor.activity(device.get("mac_address", ""))
+        return self.ai_fixer.analyze_device(device, trend=trend, errors=errors)
+
+    def cmd_device_info(self, mac: str = "", name: str = ""):
+        return self.device_database.get_device_info(mac, name)
+
+    def cmd_trends(self, mac: str, window: Optional[int] = None):
+        """Ek device ki rolling statistics (numpy na ho ya device unknown ho to None)"""
+        return self.trends.summary(mac, window) if self.trends is not None else None
+
+    def cmd_shutdown(self):
+        # Response bhejne ke baad handle_connection stop() karega
+        self.shutdown_requested = True
+        return {"stopping": True}
+
+    def dispatch(self, line: str) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+            handler = self.commands.get(request.get("cmd"))
+            if handler is None:
+                raise ValueError(f"Unknown command: {request.get('cmd')}")
+            return {"ok": True, "result": handler(**(request.get("args") or {}))}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    # --- Socket server ---
+
+    def handle_connection(self, conn: socket.socket):
+        with conn, conn.makefile("rb") as reader:
+            for line in iter(lambda: reader.readline(MAX_REQUEST_BYTES + 1), b""):
+                if len(line) > MAX_REQUEST_BYTES:
+                    conn.sendall(b'{"ok": false, "error": "request too large"}\n')
+                    return
+                if not line.strip():
+                    continue
+                response = self.dispatch(line.decode("utf-8"))
+                conn.sendall((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                if self.shutdown_requested:
+                    self.stop()
+                    return
+
+    def bind(self):
+        """Socket bind karein - stale socket hatayein, chal rahe daemon ke saath conflict na karein"""
+        if os.path.exists(self.socket_path):
+            client = DaemonClient.connect(self.socket_path, timeout=1.0)
+            if client is not None:
+                client.close()
+                raise RuntimeError(f"Daemon already running on {self.socket_path}")
+            os.unlink(self.socket_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Sirf current user connect kar sake
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        sock.listen(64)
+        # accept() timeout - stop_event har thodi der mein check ho
+        sock.settimeout(0.5)
+        self.server_socket = sock
+
+    def serve_forever(self):
+        self.bind()
+        threading.Thread(target=self.scan_loop, daemon=True).start()
+        if self.log_ingestor is not None:
+            threading.Thread(target=self.ingest_loop, daemon=True).start()
+            print(f"📜 Ingesting Bluetooth logs from {self.ingest_source}")
+        print(f"✅ Bluetooth AI daemon listening on {self.socket_path}")
+        try:
+            while not self.stop_event.is_set():
+                sock = self.server_socket
+                if sock is None:
+                    break
+                try:
+                    conn, _ = sock.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    # stop() ne socket band kiya
+                    break
+                conn.settimeout(None)
+                threading.Thread(target=self.handle_connection, args=(conn,), daemon=True).start()
+        finally:
+            self.stop()
+
+    def stop(self):
+        self.stop_event.set()
+        self.scan_requested.set()
+        with self.lock:
+            sock, self.server_socket = self.server_socket, None
+        if sock is None:
+            return
+        sock.close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        self.save_trends()
+        print("🛑 Bluetooth AI daemon stopped")
+
+def run_daemon(socket_path: Optional[str] = None, scan_interval: float = 10.0,
+               adapters: Optional[List[str]] = None, ingest_source: Optional[str] = None):
+    """--daemon entry point (foreground; SIGTERM/Ctrl+C par clean shutdown)"""
+    import signal
+
+    daemon = BluetoothDaemon(socket_path, scan_interval, adapters, ingest_source=ingest_source)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.stop()
@@ -1,12 +1,19 @@
 # src/device_database.py
 import json
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+from profiling import profiled
+
+# Repo ka data/ folder - working directory (e.g. scripts ka `cd src`) kahin bhi ho
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "data", "device_database.json")
 
 class DeviceDatabase:
-    def __init__(self, db_path: str = "data/device_database.json"):
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
         self.db_path = db_path
         self.devices = self.load_database()
+        self.build_indexes()
     
     def load_database(self) -> Dict[str, Any]:
         """Device database load karein"""
@@ -116,33 +123,39 @@ class DeviceDatabase:
             print(f"Database load error: {e}")
             return default_db
     
+    def build_indexes(self):
+        """MAC prefix aur model name ke lookup indexes banayein (har lookup par full scan nahi)"""
+        prefix_index: Dict[str, Dict[str, Any]] = {}
+        name_index: List[Tuple[str, Dict[str, Any]]] = []
+        for company, models in self.devices.get("devices", {}).items():
+            for model, info in models.items():
+                entry = {
+                    "company": company,
+                    "model": model,
+                    "device_type": info.get("device_type", "unknown"),
+                    **info
+                }
+                # Pehla match hi jeetta hai - purane linear search jaisa
+                prefix_index.setdefault(info.get("mac_prefix", "").replace(':', '').upper(), entry)
+                name_index.append((model.lower(), entry))
+        self.prefix_index = prefix_index
+        self.name_index = name_index
+    
+    @profiled("db.lookup")
     def get_device_info(self, mac_address: str, device_name: str = "") -> Dict[str, Any]:
         """Device information get karein MAC address ya name se"""
         # MAC prefix se search karein
         mac_prefix = mac_address.replace(':', '')[:4].upper()
-        
-        for company, models in self.devices.get("devices", {}).items():
-            for model, info in models.items():
-                if info.get("mac_prefix", "").replace(':', '') == mac_prefix:
-                    return {
-                        "company": company,
-                        "model": model,
-                        "device_type": info.get("device_type", "unknown"),
-                        **info
-                    }
+        entry = self.prefix_index.get(mac_prefix)
+        if entry is not None:
+            return dict(entry)
         
         # Name se search karein agar MAC match na ho
         if device_name:
             device_lower = device_name.lower()
-            for company, models in self.devices.get("devices", {}).items():
-                for model, info in models.items():
-                    if model.lower() in device_lower:
-                        return {
-                            "company": company, 
-                            "model": model,
-                            "device_type": info.get("device_type", "unknown"),
-                            **info
-                        }
+            for model_lower, entry in self.name_index:
+                if model_lower in device_lower:
+                    return dict(entry)
         
         # Default device info agar kuch na mile
         return {
@@ -208,6 +221,8 @@ class DeviceDatabase:
                 "ai_optimization": device_data.get("ai_optimization", "low")
             }
             
+            self.build_indexes()
+            
             # Save updated database
             with open(self.db_path, 'w', encoding='utf-8') as f:
                 json.dump(self.devices, f, indent=2)
@@ -218,6 +233,7 @@ class DeviceDatabase:
             print(f"Add device error: {e}")
             return False
     
+    @profiled("db.search")
     def search_devices(self, query: str) -> List[Dict[str, Any]]:
         """Devices search karein query se"""
         results = []
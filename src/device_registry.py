@@ -0,0 +1,219 @@
+# src/device_registry.py
+import hashlib
+import json
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional
+
+class DeviceRegistry:
+    """Latest device snapshot - har change par generation counter badhta hai"""
+
+    def __init__(self, max_removed: int = 1024):
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.devices: Dict[str, Dict[str, Any]] = {}
+        self.changed_at: Dict[str, int] = {}
+        self.removed: "OrderedDict[str, int]" = OrderedDict()
+        self.max_removed = max_removed
+        # Itne purane generation se delta nahi ban sakta (tombstones trim ho gaye)
+        self.oldest_delta_generation = 0
+        self._etag = None
+        self._etag_generation = -1
+        self.subscribers: List[queue.Queue] = []
+
+    def subscribe(self, maxsize: int = 1000) -> queue.Queue:
+        """Live change events ke liye queue register karein"""
+        q = queue.Queue(maxsize=maxsize)
+        with self.lock:
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        """Subscriber queue hatayein"""
+        with self.lock:
+            if q in self.subscribers:
+                self.subscribers.remove(q)
+
+    def publish(self, event: Dict[str, Any]):
+        """Sab subscribers ko event bhejein"""
+        with self.lock:
+            self._publish_locked(event)
+
+    def _publish_locked(self, event: Dict[str, Any]):
+        for q in self.subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # Slow consumer - pending events hata kar resync maangein
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait({"type": "resync", "generation": self.generation})
+
+    def _store(self, device: Dict[str, Any]) -> bool:
+        """Device store karein, lock pehle se held hona chahiye"""
+        mac = device.get("mac_address")
+        if not mac:
+            return False
+        if self.devices.get(mac) == device:
+            return False
+        self.devices[mac] = dict(device)
+        self.changed_at[mac] = self.generation + 1
+        self.removed.pop(mac, None)
+        return True
+
+    def _drop(self, mac: str):
+        """Device hatayein aur tombstone rakhein, lock held hona chahiye"""
+        self.devices.pop(mac, None)
+        self.changed_at.pop(mac, None)
+        self.removed[mac] = self.generation + 1
+        self.removed.move_to_end(mac)
+        while len(self.removed) > self.max_removed:
+            _, gen = self.removed.popitem(last=False)
+            self.oldest_delta_generation = max(self.oldest_delta_generation, gen)
+
+    def upsert(self, device: Dict[str, Any]) -> bool:
+        """Ek device add/update karein - change hone par True"""
+        with self.lock:
+            if self._store(device):
+                self.generation += 1
+                self._publish_locked({"type": "device", "generation": self.generation,
+                                      "device": self.devices[device["mac_address"]]})
+                return True
+            return False
+
+    def remove(self, mac: str) -> bool:
+        """Device registry se hatayein"""
+        with self.lock:
+            if mac not in self.devices:
+                return False
+            self._drop(mac)
+            self.generation += 1
+            self._publish_locked({"type": "removed", "generation": self.generation,
+                                  "mac_address": mac})
+            return True
+
+    def retain(self, macs: Iterable[str]) -> List[str]:
+        """Jo devices is set mein nahi hain unhe hatayein (scan ke end par)"""
+        keep = set(macs)
+        with self.lock:
+            stale = [mac for mac in self.devices if mac not in keep]
+            for mac in stale:
+                self._drop(mac)
+                self.generation += 1
+                self._publish_locked({"type": "removed", "generation": self.generation,
+                                      "mac_address": mac})
+            return stale
+
+    def replace_all(self, devices: Iterable[Dict[str, Any]]) -> bool:
+        """Poore scan ka result ek generation mein apply karein"""
+        with self.lock:
+            seen = set()
+            changed = []
+            removed = []
+            for device in devices:
+                seen.add(device.get("mac_address"))
+                if self._store(device):
+                    changed.append(device["mac_address"])
+            for mac in [m for m in self.devices if m not in seen]:
+                self._drop(mac)
+                removed.append(mac)
+            if not (changed or removed):
+                return False
+            self.generation += 1
+            for mac in changed:
+                self._publish_locked({"type": "device", "generation": self.generation,
+                                      "device": self.devices[mac]})
+            for mac in removed:
+                self._publish_locked({"type": "removed", "generation": self.generation,
+                                      "mac_address": mac})
+            return True
+
+    def export_state(self) -> Dict[str, Any]:
+        """Poori state (tombstones samet) - doosra process apply_state() se adopt kar sake"""
+        with self.lock:
+            return {
+                "generation": self.generation,
+                "devices": list(self.devices.values()),
+                "changed_at": dict(self.changed_at),
+                "removed": list(self.removed.items()),
+                "oldest_delta_generation": self.oldest_delta_generation
+            }
+
+    def apply_state(self, state: Dict[str, Any]) -> bool:
+        """Doosre process ki state adopt karein - generation numbers wahi rehte hain,
+        isliye ?since= aur Last-Event-ID har process par same matlab rakhte hain"""
+        with self.lock:
+            devices = {device["mac_address"]: device for device in state["devices"]}
+            if state["generation"] == self.generation and devices == self.devices:
+                return False
+            changed = [mac for mac, device in devices.items() if self.devices.get(mac) != device]
+            removed = [mac for mac in self.devices if mac not in devices]
+            self.devices = devices
+            self.changed_at = dict(state["changed_at"])
+            self.removed = OrderedDict((mac, generation) for mac, generation in state["removed"])
+            self.oldest_delta_generation = state["oldest_delta_generation"]
+            self.generation = state["generation"]
+            for mac in changed:
+                self._publish_locked({"type": "device", "generation": self.generation,
+                                      "device": self.devices[mac]})
+            for mac in removed:
+                self._publish_locked({"type": "removed", "generation": self.generation,
+                                      "mac_address": mac})
+            return True
+
+    def etag(self) -> str:
+        """Current snapshot ka content hash (workers ke beech stable)"""
+        with self.lock:
+            return self._etag_locked()
+
+    def _etag_locked(self) -> str:
+        if self._etag_generation != self.generation:
+            payload = json.dumps(self.devices, sort_keys=True, separators=(",", ":"))
+            self._etag = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+            self._etag_generation = self.generation
+        return self._etag
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Poora snapshot return karein"""
+        with self.lock:
+            return {
+                "generation": self.generation,
+                "etag": self._etag_locked(),
+                "devices": list(self.devices.values())
+            }
+
+    def changes_since(self, since: int) -> Dict[str, Any]:
+        """Diye gaye generation ke baad ke changes - cursor "generation" hai, ETag nahi (body delta hai)"""
+        with self.lock:
+            if since < self.oldest_delta_generation or since > self.generation:
+                # Delta possible nahi - client ko full snapshot chahiye
+                return {
+                    "generation": self.generation,
+                    "full": True,
+                    "devices": list(self.devices.values()),
+                    "removed": []
+                }
+            return {
+                "generation": self.generation,
+                "full": False,
+                "devices": [device for mac, device in self.devices.items()
+                            if self.changed_at.get(mac, 0) > since],
+                "removed": [mac for mac, gen in self.removed.items() if gen > since]
+            }
+
+    def get(self, mac: str) -> Optional[Dict[str, Any]]:
+        """MAC se device return karein"""
+        with self.lock:
+            device = self.devices.get(mac)
+            return dict(device) if device else None
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+if __name__ == "__main__":
+    registry = DeviceRegistry()
+    registry.replace_all([{"mac_address": "04:5F:01:02:03", "name": "Sony WH-1000XM4"}])
+    registry.upsert({"mac_address": "DC:56:04:05:06", "name": "Apple AirPods Pro"})
+    print(registry.snapshot())
+    print(registry.changes_since(1))
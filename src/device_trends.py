@@ -0,0 +1,217 @@
+# src/device_trends.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional - numpy na ho to diagnosis sirf snapshot par chalta hai
+    np = None
+
+# Har device ke kitne samples yaad rahte hain (ring buffer size)
+DEFAULT_CAPACITY = 256
+# Itne se zyada devices par sabse purana (least recently seen) device hat jaata hai
+DEFAULT_MAX_DEVICES = 2048
+# Isse chhote time span par slope noise hai (e.g. ek saath record hue samples)
+MIN_SLOPE_SPAN_SECONDS = 60.0
+# Long-running processes (daemon, web server) snapshot itni der mein disk par likhte hain (seconds)
+SAVE_INTERVAL = 300.0
+
+# Ring buffer columns
+TIMESTAMP, RSSI, BATTERY, CONNECTED = range(4)
+COLUMNS = 4
+
+def trends_available() -> bool:
+    return np is not None
+
+def default_trends_path() -> str:
+    """Snapshot file ($XDG_STATE_HOME ho to wahan, warna ~/.local/state)"""
+    state_dir = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(state_dir, "bluetooth-ai-fix", "trends.npz")
+
+def _value(device: Dict[str, Any], key: str) -> float:
+    value = device.get(key)
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    return float("nan")
+
+def _slope(x, y) -> Optional[float]:
+    """Least-squares slope (NaN samples ignore), do se kam points par None"""
+    mask = ~np.isnan(y)
+    if mask.sum() < 2:
+        return None
+    x, y = x[mask], y[mask]
+    dx = x - x.mean()
+    denominator = float(np.dot(dx, dx))
+    if denominator == 0.0:
+        return None
+    return float(np.dot(dx, y - y.mean()) / denominator)
+
+class DeviceTrends:
+    """Per-MAC fixed-size ring buffers (RSSI, battery, connected) - memory uptime se independent"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_devices: int = DEFAULT_MAX_DEVICES):
+        if np is None:
+            raise RuntimeError("numpy is required for device trends")
+        self.capacity = capacity
+        self.max_devices = max_devices
+        self.lock = threading.Lock()
+        # mac -> (capacity x COLUMNS) buffer; head = agla write slot, count = bhare samples
+        self.buffers: "OrderedDict[str, Any]" = OrderedDict()
+        self.heads: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+
+    def record(self, device: Dict[str, Any], timestamp: Optional[float] = None) -> bool:
+        """Ek observation append karein - O(1), koi copy nahi"""
+        mac = device.get("mac_address")
+        if not mac:
+            return False
+        row = (time.time() if timestamp is None else timestamp, _value(device, "signal_strength"),
+               _value(device, "battery_level"), _value(device, "connected"))
+        with self.lock:
+            buffer = self.buffers.get(mac)
+            if buffer is None:
+                if len(self.buffers) >= self.max_devices:
+                    evicted, _ = self.buffers.popitem(last=False)
+                    self.heads.pop(evicted, None)
+                    self.counts.pop(evicted, None)
+                buffer = np.full((self.capacity, COLUMNS), np.nan)
+                self.buffers[mac] = buffer
+                self.heads[mac] = 0
+                self.counts[mac] = 0
+            else:
+                self.buffers.move_to_end(mac)
+            head = self.heads[mac]
+            buffer[head] = row
+            self.heads[mac] = (head + 1) % self.capacity
+            self.counts[mac] = min(self.counts[mac] + 1, self.capacity)
+        return True
+
+    def record_many(self, devices: Iterable[Dict[str, Any]], timestamp: Optional[float] = None) -> int:
+        """Poore scan ke devices ek hi timestamp par record karein"""
+        timestamp = time.time() if timestamp is None else timestamp
+        return sum(1 for device in devices if self.record(device, timestamp))
+
+    def samples(self, mac: str, window: Optional[int] = None):
+        """Purane se naye order mein samples ki copy (window = sirf aakhri N)"""
+        with self.lock:
+            buffer = self.buffers.get(mac)
+            if buffer is None:
+                return None
+            count = self.counts[mac]
+            if window:
+                count = min(count, window)
+            indexes = (self.heads[mac] - count + np.arange(count)) % self.capacity
+            return buffer[indexes]
+
+    def summary(self, mac: str, window: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Rolling statistics - mean/std/slope, connection drops; device unknown ho to None"""
+        data = self.samples(mac, window)
+        if data is None or not len(data):
+            return None
+        timestamps = data[:, TIMESTAMP]
+        minutes = (timestamps - timestamps[0]) / 60.0
+        rssi = data[:, RSSI]
+        battery = data[:, BATTERY]
+        connected = data[:, CONNECTED]
+
+        def stats(values):
+            valid = values[~np.isnan(values)]
+            if not len(valid):
+                return None, None, None, None
+            return float(valid.mean()), float(valid.std()), float(valid.min()), float(valid[-1])
+
+        rssi_mean, rssi_std, rssi_min, rssi_latest = stats(rssi)
+        _, _, _, battery_latest = stats(battery)
+        rssi_slope = battery_slope = None
+        if timestamps[-1] - timestamps[0] >= MIN_SLOPE_SPAN_SECONDS:
+            rssi_slope = _slope(minutes, rssi)
+            battery_slope = _slope(minutes / 60.0, battery)
+        states = connected[~np.isnan(connected)]
+        # Connected -> disconnected transitions
+        drops = int(np.count_nonzero((states[:-1] == 1.0) & (states[1:] == 0.0))) if len(states) > 1 else 0
+
+        def rounded(value, digits=2):
+            return None if value is None else round(value, digits)
+
+        return {
+            "samples": int(len(data)),
+            "span_seconds": round(float(timestamps[-1] - timestamps[0]), 1),
+            "rssi_mean": rounded(rssi_mean),
+            "rssi_std": rounded(rssi_std),
+            "rssi_min": rounded(rssi_min),
+            "rssi_latest": rounded(rssi_latest),
+            "rssi_slope_per_minute": rounded(rssi_slope, 3),
+            "battery_latest": rounded(battery_latest),
+            "battery_slope_per_hour": rounded(battery_slope),
+            "connection_drops": drops
+        }
+
+    def macs(self) -> List[str]:
+        with self.lock:
+            return list(self.buffers)
+
+    def __len__(self) -> int:
+        return len(self.buffers)
+
+    # --- Persistence ---
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Compact .npz snapshot atomically likhein (temp file + rename)"""
+        path = path or default_trends_path()
+        with self.lock:
+            macs = list(self.buffers)
+            data = np.stack([self.buffers[mac] for mac in macs]) if macs else \
+                np.empty((0, self.capacity, COLUMNS))
+            heads = np.array([self.heads[mac] for mac in macs], dtype=np.int32)
+            counts = np.array([self.counts[mac] for mac in macs], dtype=np.int32)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            # float32 values + float64 timestamps - disk par aadha size
+            np.savez_compressed(f, macs=np.array(macs, dtype=str), values=data[:, :, RSSI:].astype(np.float32),
+                                timestamps=data[:, :, TIMESTAMP], heads=heads, counts=counts)
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, capacity: int = DEFAULT_CAPACITY,
+             max_devices: int = DEFAULT_MAX_DEVICES) -> "DeviceTrends":
+        """Snapshot load karein - file na ho ya corrupt ho to khaali store"""
+        trends = cls(capacity, max_devices)
+        path = path or default_trends_path()
+        if not os.path.exists(path):
+            return trends
+        try:
+            with np.load(path, allow_pickle=False) as snapshot:
+                macs = [str(mac) for mac in snapshot["macs"]]
+                values, timestamps = snapshot["values"], snapshot["timestamps"]
+                heads, counts = snapshot["heads"], snapshot["counts"]
+        except Exception as e:
+            print(f"❌ Could not load device trends from {path}: {e}")
+            return trends
+
+        for index, mac in enumerate(macs[-max_devices:], max(len(macs) - max_devices, 0)):
+            count = int(counts[index])
+            # Purane (ya alag capacity wale) snapshot ko chronological order mein re-pack karein
+            rows = (int(heads[index]) - count + np.arange(count)) % values.shape[1]
+            kept = rows[-capacity:]
+            buffer = np.full((capacity, COLUMNS), np.nan)
+            buffer[:len(kept), TIMESTAMP] = timestamps[index, kept]
+            buffer[:len(kept), RSSI:] = values[index, kept]
+            trends.buffers[mac] = buffer
+            trends.heads[mac] = len(kept) % capacity
+            trends.counts[mac] = len(kept)
+        return trends
+
+if __name__ == "__main__":
+    trends = DeviceTrends(capacity=32)
+    now = time.time()
+    for step in range(40):
+        trends.record({"mac_address": "04:5F:01:02:03", "signal_strength": -45 - (step % 4 == 0) * 20,
+                       "battery_level": 90 - step * 0.5, "connected": step % 10 != 9}, now + step * 60)
+    print(trends.summary("04:5F:01:02:03"))
@@ -0,0 +1,156 @@
+# src/error_knowledge.py
+import json
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_ERROR_CODES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                        "data", "error_codes.json")
+
+# Ek hi pass mein line se concrete codes nikaalein:
+#   org.bluez.Error.AuthenticationFailed | br-connection-page-timeout |
+#   "Status: Page Timeout (0x04)" (btmon) | "status 0x05" / "reason=0x13" (btmgmt, kernel)
+CODE_TOKENS = re.compile(
+    r"(?P<bluez>org\.bluez\.Error\.[A-Za-z]+)"
+    r"|\b(?P<reason>(?:br|le)-connection-[a-z]+(?:-[a-z]+)*)"
+    r"|\b(?:status|reason)\b[^()\n]{0,80}\((?P<hci_paren>0x[0-9a-fA-F]{2})\)"
+    r"|\b(?:status|reason)\s*[:=]?\s*(?P<hci>0x[0-9a-fA-F]{2})\b",
+    re.IGNORECASE
+)
+
+SEVERITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+class ErrorKnowledgeBase:
+    """BlueZ/HCI error codes ka hashed index + message patterns ka ek compiled matcher"""
+
+    def __init__(self, path: str = DEFAULT_ERROR_CODES_PATH):
+        self.path = path
+        self.data = self.load()
+        self.build_indexes()
+
+    def load(self) -> Dict[str, Any]:
+        """error_codes.json load karein - na ho ya kharab ho to khaali knowledge base"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("top-level value must be an object")
+            return data
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"❌ Error code database load error: {e}")
+            return {}
+
+    def build_indexes(self):
+        """Lowercased code -> entry index aur saare patterns ka ek combined regex"""
+        codes: Dict[str, Dict[str, Any]] = {}
+        sections = (("hci_status", "hci"), ("bluez_errors", "bluez"),
+                    ("connection_reasons", "reason"), ("messages", "message"))
+        for section, source in sections:
+            for code, info in self.data.get(section, {}).items():
+                key = self.normalize(source, code)
+                codes[key] = {"code": f"HCI {code.lower()}" if source == "hci" else code,
+                              "source": source, **info}
+        self.codes = codes
+
+        # Har pattern ek named group - match ka lastgroup seedha code batata hai
+        alternatives = []
+        self.pattern_codes: Dict[str, Dict[str, Any]] = {}
+        for index, item in enumerate(self.data.get("patterns", [])):
+            entry = codes.get(self.normalize("message", item.get("code", "")))
+            if entry is None:
+                continue
+            try:
+                re.compile(item["pattern"])
+            except (re.error, KeyError) as e:
+                print(f"❌ Invalid error pattern for {item.get('code')}: {e}")
+                continue
+            alternatives.append(f"(?P<p{index}>{item['pattern']})")
+            self.pattern_codes[f"p{index}"] = entry
+        self.matcher = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+
+    @staticmethod
+    def normalize(source: str, code: str) -> str:
+        if source == "hci":
+            try:
+                return f"hci:0x{int(code, 16):02x}"
+            except ValueError:
+                return f"hci:{code.lower()}"
+        return code.lower()
+
+    def lookup(self, code: str) -> Optional[Dict[str, Any]]:
+        """Exact code lookup - '0x05', 'org.bluez.Error.Failed', 'br-connection-busy'"""
+        code = code.strip()
+        if code.lower().startswith("0x"):
+            return self.codes.get(self.normalize("hci", code))
+        return self.codes.get(code.lower())
+
+    def classify(self, line: str) -> Optional[Dict[str, Any]]:
+        """Ek error/log line classify karein - pehle concrete code (hash lookup), phir message patterns.
+
+        Returned entry shared hai (copy nahi) - caller use modify na kare."""
+        # Generic codes (e.g. org.bluez.Error.Failed) tabhi jab line mein kuch aur specific na ho
+        generic = None
+        for match in CODE_TOKENS.finditer(line):
+            kind = match.lastgroup
+            token = match.group(kind)
+            if kind in ("hci", "hci_paren"):
+                entry = self.codes.get(self.normalize("hci", token))
+            else:
+                entry = self.codes.get(token.lower())
+            if entry is not None:
+                if not entry.get("generic"):
+                    return entry
+                generic = generic or entry
+        if self.matcher is not None:
+            match = self.matcher.search(line)
+            if match:
+                return self.pattern_codes[match.lastgroup]
+        return generic
+
+    def classify_lines(self, lines: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Log stream classify karein - sirf pehchaani gayi lines (line, entry) yield hoti hain"""
+        classify = self.classify
+        for line in lines:
+            entry = classify(line)
+            if entry is not None:
+                yield line, entry
+
+    def issues_from_errors(self, errors: Iterable[str]) -> List[Dict[str, Any]]:
+        """Error lines ko diagnosis issues mein badlein (har code ek baar, severe pehle)"""
+        issues: Dict[str, Dict[str, Any]] = {}
+        for line, entry in self.classify_lines(errors):
+            issue = issues.get(entry["code"])
+            if issue is not None:
+                issue["occurrences"] += 1
+                continue
+            issues[entry["code"]] = {
+                "type": entry.get("issue", "connection_issues"),
+                "confidence": entry.get("confidence", 0.8),
+                "description": f"{entry.get('title', entry['code'])} ({entry['code']})",
+                "severity": entry.get("severity", "medium"),
+                "error_code": entry["code"],
+                "fixes": list(entry.get("fixes", [])),
+                "evidence": line.strip()[:200],
+                "occurrences": 1
+            }
+        return sorted(issues.values(), key=lambda issue: SEVERITY_ORDER.get(issue["severity"], 3))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+if __name__ == "__main__":
+    # Log file (ya stdin) ki error lines classify karein: python src/error_knowledge.py btmon.log
+    knowledge = ErrorKnowledgeBase()
+    stream = open(sys.argv[1], "r", encoding="utf-8", errors="replace") if len(sys.argv) > 1 else sys.stdin
+    counts: Counter = Counter()
+    titles: Dict[str, str] = {}
+    for _, entry in knowledge.classify_lines(stream):
+        counts[entry["code"]] += 1
+        titles[entry["code"]] = entry.get("title", "")
+    print(f"Known codes: {len(knowledge)}")
+    for code, count in counts.most_common():
+        print(f"{count:>8}  {code:<40}{titles[code]}")
@@ -0,0 +1,203 @@
+# src/gui_device_list.py
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+class DeviceListView:
+    """MAC-keyed, virtualized device list - sirf visible rows Treeview mein rehti hain"""
+
+    COLUMNS = ('Name', 'MAC', 'Status', 'Signal')
+    DEFAULT_ROW_HEIGHT = 20
+    # Visible window ke upar/neeche extra rows (scroll par flicker kam)
+    OVERSCAN = 5
+
+    def __init__(self, parent, on_select=None):
+        self.on_select = on_select
+        # Model: saare devices, first-seen order mein
+        self.devices: Dict[str, Dict[str, Any]] = {}
+        self.order: List[str] = []
+        self.positions: Dict[str, int] = {}
+        # View: abhi Treeview mein kaunsi rows aur unki values
+        self.rendered: Dict[str, Tuple] = {}
+        self.selected: Set[str] = set()
+        self.offset = 0
+        self.visible_rows = 10
+        self.syncing_selection = False
+
+        self.tree = ttk.Treeview(parent, columns=self.COLUMNS, show='headings')
+        self.tree.heading('Name', text='Device Name')
+        self.tree.heading('MAC', text='MAC Address')
+        self.tree.heading('Status', text='Status')
+        self.tree.heading('Signal', text='Signal')
+
+        # Configure columns
+        self.tree.column('Name', width=200)
+        self.tree.column('MAC', width=150)
+        self.tree.column('Status', width=100)
+        self.tree.column('Signal', width=80)
+
+        # Scrollbar poore model ko represent karta hai, Treeview ki rows ko nahi
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.on_scrollbar)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+        self.tree.bind('<Up>', lambda event: self.on_arrow(-1))
+        self.tree.bind('<Down>', lambda event: self.on_arrow(1))
+        self.tree.bind('<Prior>', lambda event: self.scroll_by(-self.visible_rows) or "break")
+        self.tree.bind('<Next>', lambda event: self.scroll_by(self.visible_rows) or "break")
+
+    @staticmethod
+    def row_values(device: Dict[str, Any]) -> Tuple:
+        """Device ko Treeview row values mein badlein"""
+        status = "Connected" if device.get('connected', False) else "Available"
+        signal = f"{device.get('signal_strength', 0)} dBm"
+        return (device.get('name', 'Unknown'), device['mac_address'], status, signal)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def get(self, mac: str) -> Optional[Dict[str, Any]]:
+        return self.devices.get(mac)
+
+    def apply(self, upserts: Iterable[Dict[str, Any]] = (), removals: Iterable[str] = ()):
+        """Ek batch mein devices add/update/remove karein, phir sirf badli rows redraw"""
+        removed = False
+        for mac in removals:
+            if self.devices.pop(mac, None) is not None:
+                self.selected.discard(mac)
+                removed = True
+        if removed:
+            self.order = [mac for mac in self.order if mac in self.devices]
+            self.positions = {mac: index for index, mac in enumerate(self.order)}
+
+        for device in upserts:
+            mac = device['mac_address']
+            if mac not in self.devices:
+                self.positions[mac] = len(self.order)
+                self.order.append(mac)
+            self.devices[mac] = device
+        self.refresh()
+
+    def replace(self, devices: Iterable[Dict[str, Any]]):
+        """Poori list ek snapshot se sync karein (jo snapshot mein nahi, woh hatayein)"""
+        devices = list(devices)
+        seen = {device['mac_address'] for device in devices}
+        self.apply(devices, [mac for mac in self.order if mac not in seen])
+
+    def clear(self):
+        self.apply(removals=list(self.order))
+
+    def refresh(self):
+        """Visible window ko model se diff karke Treeview update karein"""
+        max_offset = max(0, len(self.order) - self.visible_rows)
+        self.offset = min(self.offset, max_offset)
+        start = max(0, self.offset - self.OVERSCAN)
+        window = self.order[start:self.offset + self.visible_rows + self.OVERSCAN]
+        wanted = set(window)
+
+        for mac in [mac for mac in self.rendered if mac not in wanted]:
+            self.tree.delete(mac)
+            del self.rendered[mac]
+
+        for index, mac in enumerate(window):
+            values = self.row_values(self.devices[mac])
+            current = self.rendered.get(mac)
+            if current is None:
+                self.tree.insert('', index, iid=mac, values=values)
+                self.rendered[mac] = values
+            else:
+                if current != values:
+                    self.tree.item(mac, values=values)
+                    self.rendered[mac] = values
+                if self.tree.index(mac) != index:
+                    self.tree.move(mac, '', index)
+
+        self.sync_selection(window)
+        if window:
+            # Overscan rows ke baad pehli "asli" visible row top par rahe
+            self.tree.yview_moveto((self.offset - start) / len(window))
+        self.update_scrollbar()
+
+    def sync_selection(self, window: List[str]):
+        """Window mein wapas aayi selected rows ko dobara select karein"""
+        visible_selected = [mac for mac in window if mac in self.selected]
+        if set(self.tree.selection()) != set(visible_selected):
+            self.syncing_selection = True
+            self.tree.selection_set(visible_selected)
+            self.syncing_selection = False
+
+    def update_scrollbar(self):
+        total = len(self.order)
+        if total <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.visible_rows) / total)
+
+    def scroll_to(self, offset: int):
+        offset = max(0, min(offset, len(self.order) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def scroll_by(self, rows: int):
+        self.scroll_to(self.offset + rows)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.order)))
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def on_arrow(self, direction: int):
+        """Keyboard navigation window ke kinare par model ko scroll karein"""
+        focus = self.tree.focus()
+        position = self.positions.get(focus)
+        if position is None:
+            return None
+        target = position + direction
+        if not 0 <= target < len(self.order):
+            return "break"
+        if target < self.offset:
+            self.scroll_to(target)
+        elif target >= self.offset + self.visible_rows:
+            self.scroll_to(target - self.visible_rows + 1)
+        mac = self.order[target]
+        self.selected = {mac}
+        self.refresh()
+        self.tree.focus(mac)
+        self.tree.see(mac)
+        if self.on_select:
+            self.on_select()
+        return "break"
+
+    def on_resize(self, event):
+        row_height = ttk.Style().lookup('Treeview', 'rowheight') or self.DEFAULT_ROW_HEIGHT
+        # Heading ki ek row minus karein
+        visible_rows = max(1, event.height // int(row_height) - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.refresh()
+
+    def on_tree_select(self, event):
+        if self.syncing_selection:
+            return
+        # Window ke bahar ki selection bani rehti hai, window ke andar Treeview se lein
+        window = set(self.rendered)
+        self.selected = {mac for mac in self.selected if mac not in window} | set(self.tree.selection())
+        if self.on_select:
+            self.on_select()
+
+    def selected_devices(self) -> List[Dict[str, Any]]:
+        """Selected devices (model order mein) - positional index par depend nahi"""
+        return [self.devices[mac] for mac in self.order if mac in self.selected]
@@ -0,0 +1,88 @@
+# src/gui_fix_pipeline.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional
+
+class FixPipeline:
+    """Selected devices ke suggested fixes background pool par - UI kabhi block nahi hoti"""
+
+    FINAL_STATES = ("succeeded", "failed", "cancelled")
+
+    def __init__(self, ai_fixer, notify: Callable[[Dict[str, Any]], None], max_workers: int = 4):
+        self.ai_fixer = ai_fixer
+        # notify(progress) worker threads se call hota hai - GUI ise UI queue mein daalti hai
+        self.notify = notify
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-fix")
+        # Har batch ka apna cancel event - naya batch purane cancel ko reset nahi karta
+        self.cancel_events: List[threading.Event] = []
+
+    def start(self, devices: List[Dict[str, Any]], diagnoses: Optional[Dict[str, Dict]] = None):
+        """Har device ka fix sequence queue karein (ek device ke fixes order mein chalte hain)"""
+        diagnoses = diagnoses or {}
+        cancel_event = threading.Event()
+        self.cancel_events = [event for event in self.cancel_events if not event.is_set()] + [cancel_event]
+        for device in devices:
+            self.report(device, "queued", "Waiting for a worker")
+            self.executor.submit(self.fix_device, device, diagnoses.get(device['mac_address']), cancel_event)
+
+    def cancel(self):
+        """Queued devices skip honge; running fix ke baad agla fix nahi chalega"""
+        for event in self.cancel_events:
+            event.set()
+
+    def report(self, device: Dict[str, Any], status: str, message: str, done: int = 0,
+               total: int = 0, results: Optional[List[Dict[str, Any]]] = None):
+        self.notify({
+            "mac_address": device['mac_address'],
+            "name": device.get('name', device['mac_address']),
+            "status": status,
+            "message": message,
+            "done": done,
+            "total": total,
+            "results": list(results or [])
+        })
+
+    def fix_device(self, device: Dict[str, Any], diagnosis: Optional[Dict[str, Any]],
+                   cancel_event: threading.Event):
+        results: List[Dict[str, Any]] = []
+        try:
+            if cancel_event.is_set():
+                self.report(device, "cancelled", "Cancelled before start")
+                return
+
+            # Diagnosis ki fix list use karein - na ho to abhi analyze karein
+            if diagnosis is None:
+                self.report(device, "diagnosing", "Analyzing device")
+                diagnosis = self.ai_fixer.analyze_device(device)
+            actions = [fix['action'] for fix in diagnosis.get('suggested_fixes', [])]
+            if not actions:
+                self.report(device, "succeeded", "No issues detected - nothing to fix")
+                return
+
+            for index, action in enumerate(actions):
+                if cancel_event.is_set():
+                    self.report(device, "cancelled", f"Cancelled after {index}/{len(actions)} fixes",
+                                index, len(actions), results)
+                    return
+                self.report(device, "running", f"Applying {action}", index, len(actions), results)
+                started = time.monotonic()
+                try:
+                    result = self.ai_fixer.apply_fix(action, device)
+                    results.append({"action": action, "status": result.get("status", "success"),
+                                    "message": result.get("message", ""),
+                                    "seconds": round(time.monotonic() - started, 2)})
+                except Exception as e:
+                    results.append({"action": action, "status": "failed", "message": str(e),
+                                    "seconds": round(time.monotonic() - started, 2)})
+
+            failed = sum(1 for result in results if result["status"] == "failed")
+            status = "failed" if failed == len(results) else "succeeded"
+            message = f"Applied {len(results) - failed}/{len(results)} fixes"
+            self.report(device, status, message, len(actions), len(actions), results)
+        except Exception as e:
+            self.report(device, "failed", f"Fix pipeline error: {e}", results=results)
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
@@ -1,27 +1,85 @@
 # src/gui_interface.py
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+import queue
 import threading
 import time
 
+from gui_device_list import DeviceListView
+from gui_fix_pipeline import FixPipeline
+
 class BluetoothAIGUI:
+    # UI queue itne ms mein ek baar drain hoti hai (~30 fps)
+    UI_FRAME_MS = 33
+    # Ek tick mein maximum events - baaki agle frame mein
+    MAX_EVENTS_PER_TICK = 5000
+    
     def __init__(self):
         self.root = tk.Tk()
         self.ai_fixer = None
         self.devices = []
+        # Auto fix background pool par chalta hai - progress UI queue se aata hai
+        self.fix_pipeline = None
+        self.active_fixes = set()
+        self.diagnoses = {}
+        
+        # Worker threads sirf is queue mein likhte hain - Tk widgets sirf main thread chhoota hai
+        self.ui_queue = queue.Queue()
         
         self.setup_gui()
+        self.root.after(self.UI_FRAME_MS, self.drain_ui_queue)
         self.load_ai_fixer()
+    
+    def post_ui(self, callback, *args):
+        """Kisi bhi thread se UI callback schedule karein (agle frame par chalega)"""
+        self.ui_queue.put(("call", callback, args))
+    
+    def drain_ui_queue(self):
+        """Har frame par queue khaali karein - device updates MAC par coalesce, ek batch mein apply"""
+        upserts = {}
+        removals = set()
+        
+        def flush():
+            if upserts or removals:
+                self.device_list.apply(upserts.values(), removals)
+                upserts.clear()
+                removals.clear()
         
+        try:
+            for _ in range(self.MAX_EVENTS_PER_TICK):
+                try:
+                    event = self.ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                kind = event[0]
+                if kind == "device":
+                    device = event[1]
+                    removals.discard(device['mac_address'])
+                    upserts[device['mac_address']] = device
+                elif kind == "removed":
+                    upserts.pop(event[1], None)
+                    removals.add(event[1])
+                else:
+                    # Callbacks pichhle device updates ke baad hi chalein
+                    flush()
+                    _, callback, args = event
+                    try:
+                        callback(*args)
+                    except Exception as e:
+                        print(f"❌ UI callback error: {e}")
+            flush()
+        finally:
+            self.root.after(self.UI_FRAME_MS, self.drain_ui_queue)
+    
     def load_ai_fixer(self):
         """AI fixer load karein background mein"""
         def load():
             try:
                 from ai_bluetooth_fix import AIBluetoothFixer
                 self.ai_fixer = AIBluetoothFixer()
-                self.root.after(0, self.update_status, "✅ AI System Ready")
+                self.post_ui(self.update_status, "✅ AI System Ready")
             except Exception as e:
-                self.root.after(0, self.update_status, f"❌ AI System Failed: {e}")
+                self.post_ui(self.update_status, f"❌ AI System Failed: {e}")
         
         threading.Thread(target=load, daemon=True).start()
         self.update_status("🔄 Loading AI System...")
@@ -114,6 +172,19 @@ class BluetoothAIGUI:
         )
         self.fix_btn.pack(pady=5)
         
+        self.cancel_fix_btn = tk.Button(
+            ai_frame,
+            text="⏹️ Cancel Fixes",
+            command=self.cancel_fixes,
+            bg='#999999',
+            fg='white',
+            font=('Arial', 11),
+            width=20,
+            height=2,
+            state=tk.DISABLED
+        )
+        self.cancel_fix_btn.pack(pady=5)
+        
         # Right panel - Results
         right_frame = tk.Frame(main_frame, bg='#f0f0f0')
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
@@ -123,25 +194,30 @@ class BluetoothAIGUI:
                                     font=('Arial', 12, 'bold'), bg='#f0f0f0')
         devices_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
-        # Treeview for devices
-        self.devices_tree = ttk.Treeview(devices_frame, columns=('Name', 'MAC', 'Status', 'Signal'), show='headings')
-        self.devices_tree.heading('Name', text='Device Name')
-        self.devices_tree.heading('MAC', text='MAC Address')
-        self.devices_tree.heading('Status', text='Status')
-        self.devices_tree.heading('Signal', text='Signal')
-        
-        # Configure columns
-        self.devices_tree.column('Name', width=200)
-        self.devices_tree.column('MAC', width=150)
-        self.devices_tree.column('Status', width=100)
-        self.devices_tree.column('Signal', width=80)
-        
-        # Scrollbar for treeview
-        tree_scroll = ttk.Scrollbar(devices_frame, orient=tk.VERTICAL, command=self.devices_tree.yview)
-        self.devices_tree.configure(yscrollcommand=tree_scroll.set)
-        
-        self.devices_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        # Devices list - MAC-keyed, virtualized Treeview
+        self.device_list = DeviceListView(devices_frame)
+        self.devices_tree = self.device_list.tree
+        
+        # Auto fix progress - har device ek row, har applied fix uski child row
+        fixes_frame = tk.LabelFrame(right_frame, text="Auto Fix Progress",
+                                  font=('Arial', 12, 'bold'), bg='#f0f0f0')
+        fixes_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.fix_tree = ttk.Treeview(fixes_frame, columns=('Device', 'Progress', 'Status', 'Details'),
+                                     show='headings', height=5)
+        self.fix_tree.heading('Device', text='Device / Fix')
+        self.fix_tree.heading('Progress', text='Progress')
+        self.fix_tree.heading('Status', text='Status')
+        self.fix_tree.heading('Details', text='Details')
+        self.fix_tree.column('Device', width=200)
+        self.fix_tree.column('Progress', width=80)
+        self.fix_tree.column('Status', width=100)
+        self.fix_tree.column('Details', width=250)
+        
+        fix_scroll = ttk.Scrollbar(fixes_frame, orient=tk.VERTICAL, command=self.fix_tree.yview)
+        self.fix_tree.configure(yscrollcommand=fix_scroll.set)
+        self.fix_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        fix_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Results section
         results_frame = tk.LabelFrame(right_frame, text="AI Diagnosis Results",
@@ -176,51 +252,50 @@ class BluetoothAIGUI:
         threading.Thread(target=self.scan_devices, daemon=True).start()
     
     def scan_devices(self):
-        """Bluetooth devices scan karein"""
+        """Bluetooth devices scan karein - har device milte hi UI queue mein"""
         try:
-            self.devices = self.ai_fixer.scan_devices()
-            self.root.after(0, self.update_devices_list)
-            self.root.after(0, self.update_status, f"✅ Found {len(self.devices)} devices")
+            seen = []
+            for device in self.ai_fixer.iter_devices():
+                seen.append(device['mac_address'])
+                self.ui_queue.put(("device", device))
+            self.post_ui(self.finish_scan, seen)
             
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Scan Error", f"Scan failed: {str(e)}"))
-            self.root.after(0, self.update_status, "❌ Scan failed")
+            self.post_ui(messagebox.showerror, "Scan Error", f"Scan failed: {str(e)}")
+            self.post_ui(self.update_status, "❌ Scan failed")
         finally:
-            self.root.after(0, self.scan_btn.config, {"state": tk.NORMAL, "text": "🔍 Scan Bluetooth Devices"})
+            self.post_ui(self.scan_btn.config, {"state": tk.NORMAL, "text": "🔍 Scan Bluetooth Devices"})
+    
+    def finish_scan(self, seen):
+        """Scan mein na mile devices hatayein aur buttons update karein"""
+        seen = set(seen)
+        self.devices = [self.device_list.get(mac) for mac in self.device_list.order if mac in seen]
+        self.update_devices_list()
+        self.update_status(f"✅ Found {len(self.devices)} devices")
     
     def update_devices_list(self):
-        """Devices list update karein"""
-        # Clear existing items
-        for item in self.devices_tree.get_children():
-            self.devices_tree.delete(item)
-        
-        # Add new devices
-        for device in self.devices:
-            status = "Connected" if device.get('connected', False) else "Available"
-            signal = f"{device.get('signal_strength', 0)} dBm"
-            
-            self.devices_tree.insert('', tk.END, values=(
-                device['name'],
-                device['mac_address'],
-                status,
-                signal
-            ))
+        """Devices list update karein - sirf badli rows redraw hoti hain"""
+        self.device_list.replace(self.devices)
         
         # Enable diagnose button if devices found
         if self.devices:
             self.diagnose_btn.config(state=tk.NORMAL)
             self.fix_btn.config(state=tk.NORMAL)
     
+    def get_selected_device(self):
+        """Selected device MAC se resolve karein (list badalne par bhi sahi)"""
+        selected = self.device_list.selected_devices()
+        if not selected:
+            messagebox.showwarning("Warning", "Please select a device first")
+            return None
+        return selected[0]
+    
     def run_diagnosis(self):
         """AI diagnosis run karein"""
-        selected_item = self.devices_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Warning", "Please select a device first")
+        device_data = self.get_selected_device()
+        if device_data is None:
             return
         
-        device_index = self.devices_tree.index(selected_item[0])
-        device_data = self.devices[device_index]
-        
         self.diagnose_btn.config(state=tk.DISABLED, text="🔬 Diagnosing...")
         self.update_status(f"🔬 Diagnosing {device_data['name']}...")
         
@@ -230,18 +305,20 @@ class BluetoothAIGUI:
         """Perform actual diagnosis"""
         try:
             diagnosis = self.ai_fixer.diagnose_device(device_data)
-            self.root.after(0, self.display_diagnosis, diagnosis)
-            self.root.after(0, self.update_status, f"✅ Diagnosis complete for {device_data['name']}")
+            self.post_ui(self.display_diagnosis, diagnosis)
+            self.post_ui(self.update_status, f"✅ Diagnosis complete for {device_data['name']}")
             
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Diagnosis Error", f"Diagnosis failed: {str(e)}"))
-            self.root.after(0, self.update_status, "❌ Diagnosis failed")
+            self.post_ui(messagebox.showerror, "Diagnosis Error", f"Diagnosis failed: {str(e)}")
+            self.post_ui(self.update_status, "❌ Diagnosis failed")
         finally:
-            self.root.after(0, self.diagnose_btn.config, {"state": tk.NORMAL, "text": "🤖 Run AI Diagnosis"})
+            self.post_ui(self.diagnose_btn.config, {"state": tk.NORMAL, "text": "🤖 Run AI Diagnosis"})
     
     def display_diagnosis(self, diagnosis):
         """Diagnosis results display karein"""
         device = diagnosis['device']
+        # Auto fix isi diagnosis ki fix list use karega
+        self.diagnoses[device['mac_address']] = diagnosis
         
         results = f"🤖 AI DIAGNOSIS REPORT\n"
         results += "=" * 50 + "\n\n"
@@ -278,22 +355,67 @@ class BluetoothAIGUI:
         self.results_text.insert(1.0, results)
     
     def auto_fix(self):
-        """Auto fix issues"""
-        selected_item = self.devices_tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Warning", "Please select a device first")
+        """Selected devices ke suggested fixes background mein chalayein"""
+        if not self.ai_fixer:
+            messagebox.showerror("Error", "AI system not ready yet!")
+            return
+        devices = [device for device in self.device_list.selected_devices()
+                   if device['mac_address'] not in self.active_fixes]
+        if not devices:
+            if self.device_list.selected_devices():
+                messagebox.showinfo("Auto Fix", "Fixes are already running for the selected devices")
+            else:
+                messagebox.showwarning("Warning", "Please select a device first")
             return
         
-        device_index = self.devices_tree.index(selected_item[0])
-        device_data = self.devices[device_index]
-        
-        # For demo, show a simple fix
-        result = self.ai_fixer.apply_fix("reset_bluetooth_stack", device_data)
-        messagebox.showinfo("Auto Fix", f"Applied fix: {result['message']}")
+        if self.fix_pipeline is None:
+            self.fix_pipeline = FixPipeline(
+                self.ai_fixer, lambda progress: self.post_ui(self.on_fix_progress, progress))
+        
+        for device in devices:
+            mac = device['mac_address']
+            self.active_fixes.add(mac)
+            if self.fix_tree.exists(mac):
+                self.fix_tree.delete(mac)
+        self.fix_pipeline.start(devices, self.diagnoses)
+        self.cancel_fix_btn.config(state=tk.NORMAL)
+        self.update_status(f"🔧 Auto fixing {len(devices)} device(s)...")
+    
+    def cancel_fixes(self):
+        """Queued aur chal rahe fix sequences cancel karein"""
+        if self.fix_pipeline:
+            self.fix_pipeline.cancel()
+            self.update_status("⏹️ Cancelling fixes (current fix step will finish first)...")
+    
+    def on_fix_progress(self, progress):
+        """Fix progress event (UI thread par) - device row aur uske fix results update karein"""
+        mac = progress['mac_address']
+        total = progress['total']
+        values = (progress['name'], f"{progress['done']}/{total}" if total else "-",
+                  progress['status'].title(), progress['message'])
+        if self.fix_tree.exists(mac):
+            self.fix_tree.item(mac, values=values)
+        else:
+            self.fix_tree.insert('', tk.END, iid=mac, values=values, open=True)
+        
+        for index, result in enumerate(progress['results']):
+            child = f"{mac}/{index}"
+            if not self.fix_tree.exists(child):
+                self.fix_tree.insert(mac, tk.END, iid=child, values=(
+                    f"   {result['action']}", f"{result['seconds']}s",
+                    result['status'].title(), result['message']))
+        
+        if progress['status'] in FixPipeline.FINAL_STATES:
+            self.active_fixes.discard(mac)
+            if not self.active_fixes:
+                self.cancel_fix_btn.config(state=tk.DISABLED)
+                self.update_status("✅ Auto fix finished")
     
     def run(self):
         """GUI run karein"""
         self.root.mainloop()
+        if self.fix_pipeline:
+            self.fix_pipeline.shutdown()
 
 if __name__ == "__main__":
     app = BluetoothAIGUI()
@@ -0,0 +1,221 @@
+# src/job_manager.py
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional
+
+JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobManager:
+    """Fix jobs background worker pool par chalayein - HTTP request turant free"""
+
+    FINISHED_STATES = ("succeeded", "failed")
+    # Shared store: doosre worker ke job ki file long-poll mein itni der mein dobara padhein
+    POLL_INTERVAL = 0.2
+
+    def __init__(self, max_workers: int = 4, max_finished: int = 200):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="fix-job")
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_finished = max_finished
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        # Drain par long-polls/SSE turant lautein (worker 30s tak na atke)
+        self.closing = False
+        # Pre-fork mode: har job ki JSON file yahan, taaki kisi bhi worker se status mil sake
+        self.store_dir: Optional[str] = None
+
+    def share(self, store_dir: str):
+        """Jobs ko workers ke beech share karein (fork se pehle call karein)"""
+        os.makedirs(store_dir, exist_ok=True)
+        self.store_dir = store_dir
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.store_dir, f"{job_id}.json")
+
+    def _persist(self, job: Dict[str, Any]):
+        """Job file atomically likhein - lock held hona chahiye"""
+        if self.store_dir is None:
+            return
+        path = self._path(job["id"])
+        try:
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"owner": os.getpid(), "job": job}, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"❌ Could not store job {job['id']}: {e}")
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Doosre worker ka job shared store se padhein"""
+        if self.store_dir is None or not JOB_ID.fullmatch(job_id):
+            return None
+        try:
+            with open(self._path(job_id), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        job = record["job"]
+        if job["status"] not in self.FINISHED_STATES and not _process_alive(record["owner"]):
+            # Owner worker job khatam hone se pehle mar gaya - hamesha "running" na dikhe
+            job.update(status="failed", error="Worker exited before the job finished",
+                       version=job["version"] + 1)
+        return job
+
+    def submit(self, fix_action: str, device_info: Dict[str, Any],
+               runner: Callable[[str, Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Naya fix job queue karein aur uski copy return karein"""
+        job = {
+            "id": uuid.uuid4().hex,
+            "action": fix_action,
+            "device": {
+                "name": device_info.get("name"),
+                "mac_address": device_info.get("mac_address")
+            },
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "logs": [f"Queued {fix_action}"],
+            "result": None,
+            "error": None,
+            "version": 0
+        }
+        with self.lock:
+            if self.closing:
+                # Drain shuru ho chuka - naya job is process ke saath mar jaata
+                raise RuntimeError("Server is shutting down")
+            self.jobs[job["id"]] = job
+            self._trim_finished()
+            self._persist(job)
+            snapshot = self._copy(job)
+        self.executor.submit(self._run, job["id"], fix_action, device_info, runner)
+        return snapshot
+
+    def _run(self, job_id: str, fix_action: str, device_info: Dict[str, Any], runner):
+        """Worker thread mein fix chalayein"""
+        self._update(job_id, status="running", started_at=time.time())
+        try:
+            result = runner(fix_action, device_info)
+            self._update(job_id, status="succeeded", finished_at=time.time(),
+                         result=result, logs=result.get("logs", []))
+        except Exception as e:
+            self._update(job_id, status="failed", finished_at=time.time(),
+                         error=str(e), log=f"Failed: {e}")
+
+    def _update(self, job_id: str, log: Optional[str] = None,
+                logs: Optional[List[str]] = None, **fields):
+        with self.changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            if log:
+                job["logs"].append(log)
+            if logs:
+                job["logs"].extend(logs)
+            job["version"] += 1
+            self._persist(job)
+            self.changed.notify_all()
+
+    def _trim_finished(self):
+        """Purane finished jobs hatayein taaki memory bounded rahe"""
+        finished = [job_id for job_id, job in self.jobs.items()
+                    if job["status"] in self.FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+            if self.store_dir is not None:
+                try:
+                    os.unlink(self._path(job_id))
+                except OSError:
+                    pass
+
+    def _copy(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        return {**job, "logs": list(job["logs"])}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job ka current status return karein"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job:
+                return self._copy(job)
+        return self._load(job_id)
+
+    def wait(self, job_id: str, timeout: float, after_version: int = -1) -> Optional[Dict[str, Any]]:
+        """Long-poll: job finish hone (ya version badalne) tak wait karein"""
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            local = job_id in self.jobs
+        if not local:
+            return self._wait_shared(job_id, deadline, after_version)
+        with self.changed:
+            while True:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    return None
+                if job["status"] in self.FINISHED_STATES or job["version"] > after_version >= 0 \
+                        or self.closing:
+                    return self._copy(job)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return self._copy(job)
+                self.changed.wait(remaining)
+
+    def _wait_shared(self, job_id: str, deadline: float, after_version: int) -> Optional[Dict[str, Any]]:
+        """Doosre worker ke job ka long-poll - condition yahan notify nahi hoti, isliye file poll"""
+        while True:
+            job = self._load(job_id)
+            if job is None:
+                return None
+            remaining = deadline - time.monotonic()
+            if job["status"] in self.FINISHED_STATES or job["version"] > after_version >= 0 \
+                    or self.closing or remaining <= 0:
+                return job
+            with self.changed:
+                # close_waiters() ise bhi jaga deta hai
+                self.changed.wait(min(self.POLL_INTERVAL, remaining))
+
+    def list_jobs(self, active_only: bool = True) -> List[Dict[str, Any]]:
+        """Jobs ki list return karein (default sirf queued/running) - shared store ho to saare workers ke"""
+        with self.lock:
+            jobs = {job_id: self._copy(job) for job_id, job in self.jobs.items()}
+        if self.store_dir is not None:
+            for entry in os.scandir(self.store_dir):
+                job_id = entry.name[:-len(".json")]
+                if entry.name.endswith(".json") and job_id not in jobs:
+                    job = self._load(job_id)
+                    if job is not None:
+                        jobs[job_id] = job
+        return sorted((job for job in jobs.values()
+                       if not active_only or job["status"] not in self.FINISHED_STATES),
+                      key=lambda job: job["created_at"])
+
+    def is_finished(self, job: Dict[str, Any]) -> bool:
+        return job["status"] in self.FINISHED_STATES
+
+    def close_waiters(self):
+        """Saare waiting long-polls ko current state ke saath lautayein"""
+        with self.changed:
+            self.closing = True
+            self.changed.notify_all()
+
+    def shutdown(self, timeout: float = 0.0) -> bool:
+        """Naye jobs band, queued/running jobs ke khatam hone ka timeout tak wait - sab khatam to True"""
+        self.close_waiters()
+        self.executor.shutdown(wait=False)
+        with self.changed:
+            return self.changed.wait_for(
+                lambda: all(job["status"] in self.FINISHED_STATES for job in self.jobs.values()), timeout)
@@ -1,17 +1,84 @@
 
 # src/language_manager.py
+import gzip
+import hashlib
 import json
 import os
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+from message_format import MessageFormatter
+from translation_catalog import DEFAULT_CATALOG_NAME, DEFAULT_LANG_DIR, MappedCatalog, catalog_is_stale
+
+try:
+    import brotli
+except ImportError:  # Optional - brotli na ho to sirf gzip variants
+    brotli = None
+
+# Missing keys is language se bhare jaate hain
+FALLBACK_LANGUAGE = "en"
+
+def format_message(key: str, lang_code: str = FALLBACK_LANGUAGE, lang_dir: str = DEFAULT_LANG_DIR,
+                   **params: Any) -> str:
+    """Ek message format karein sirf us language (aur fallback) ki file padh kar - CLI ke liye.
+
+    LanguageManager ki tarah saare bundles load/compress nahi karta aur kuch print nahi karta."""
+    chain = (lang_code, lang_code.split("-")[0], FALLBACK_LANGUAGE)
+    for code in dict.fromkeys(chain):
+        if os.path.basename(code) != code:
+            continue
+        try:
+            with open(os.path.join(lang_dir, f"{code}.json"), "r", encoding="utf-8") as f:
+                template = json.load(f).get(key)
+        except (OSError, ValueError):
+            continue
+        if template is not None:
+            try:
+                return MessageFormatter(template, code).format(**params)
+            except ValueError:
+                return template
+    return key
 
 class LanguageManager:
-    def __init__(self, lang_dir: str = "web_interface/translations"):
+    def __init__(self, lang_dir: str = DEFAULT_LANG_DIR, use_compiled: bool = True):
         self.lang_dir = lang_dir
         self.current_language = "en"
-        self.translations = {}
-        self.available_languages = self.discover_languages()
+        self.translations: Mapping[str, str] = MappingProxyType({})
+        self.compiled_catalog = self.open_compiled_catalog() if use_compiled else None
+        if self.compiled_catalog:
+            # Binary catalog mmap se - koi JSON parse nahi
+            self.available_languages = self.compiled_catalog.languages()
+        else:
+            self.available_languages = self.discover_languages()
+        # Sab bundles ek baar load - requests kabhi disk ya shared state nahi chhooti
+        self.fallback_chains = {code: self.build_fallback_chain(code)
+                                for code in self.available_languages}
+        if self.compiled_catalog:
+            self.catalog = self.compiled_catalog.bundles()
+            self.rendered_bundles = self.compiled_catalog.rendered_bundles()
+        else:
+            self.catalog = self.load_catalog()
+            # Har bundle pehle se serialized + compressed, web server sirf bytes bhejta hai
+            self.rendered_bundles = self.render_bundles()
+        # (lang, key) -> compiled template, har template sirf ek baar parse hota hai
+        self.formatters: Dict[Tuple[str, str], MessageFormatter] = {}
         self.load_language("en")
     
+    def open_compiled_catalog(self) -> Optional[MappedCatalog]:
+        """Compiled binary catalog (agar build kiya gaya ho) memory-map karein - purana ho to JSON"""
+        path = os.path.join(self.lang_dir, DEFAULT_CATALOG_NAME)
+        if catalog_is_stale(self.lang_dir, path):
+            print(f"⚠️ Translations changed since {path} was built, loading JSON "
+                  f"(run: python src/translation_catalog.py web_interface/translations)")
+            return None
+        try:
+            return MappedCatalog(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Ignoring translation catalog {path}: {e}")
+            return None
+    
     def discover_languages(self) -> Dict[str, str]:
         """Available languages discover karein"""
         languages = {
@@ -36,26 +103,93 @@ class LanguageManager:
         
         return available
     
-    def load_language(self, lang_code: str) -> bool:
-        """Selected language load karein"""
+    def build_fallback_chain(self, lang_code: str) -> Tuple[str, ...]:
+        """Fallback chain banayein, e.g. es-MX -> es -> en"""
+        chain = [lang_code]
+        base = lang_code.split("-")[0]
+        if base != lang_code:
+            chain.append(base)
+        if FALLBACK_LANGUAGE not in chain:
+            chain.append(FALLBACK_LANGUAGE)
+        return tuple(chain)
+    
+    def read_bundle(self, lang_code: str) -> Dict[str, str]:
+        """Ek translation file disk se padhein"""
+        lang_file = os.path.join(self.lang_dir, f"{lang_code}.json")
         try:
-            lang_file = os.path.join(self.lang_dir, f"{lang_code}.json")
-            if os.path.exists(lang_file):
-                with open(lang_file, 'r', encoding='utf-8') as f:
-                    self.translations = json.load(f)
-                self.current_language = lang_code
-                print(f"✅ Language loaded: {self.available_languages.get(lang_code, lang_code)}")
-                return True
-            else:
-                print(f"❌ Language file not found: {lang_file}")
-                return False
+            with open(lang_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
         except Exception as e:
-            print(f"❌ Language load error: {e}")
+            print(f"❌ Language load error ({lang_code}): {e}")
+            return {}
+    
+    def load_catalog(self) -> Mapping[str, Mapping[str, str]]:
+        """Sab languages ko fallback ke saath merge karke immutable catalog banayein"""
+        raw = {code: self.read_bundle(code) for code in self.available_languages}
+        catalog = {}
+        for code, chain in self.fallback_chains.items():
+            merged = {}
+            for fallback in reversed(chain):
+                merged.update(raw.get(fallback, {}))
+            catalog[code] = MappingProxyType(merged)
+        return MappingProxyType(catalog)
+    
+    def render_bundles(self) -> Mapping[str, Dict[str, Any]]:
+        """Har language ka API response ek baar JSON bytes + gzip/brotli mein render karein"""
+        rendered = {}
+        for code, bundle in self.catalog.items():
+            body = json.dumps({
+                "success": True,
+                "language": code,
+                "translations": dict(bundle),
+                "is_rtl": self.is_rtl(code)
+            }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            rendered[code] = {
+                "body": body,
+                "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+                "br": brotli.compress(body) if brotli else None,
+                "etag": hashlib.sha256(body).hexdigest()[:32]
+            }
+        return MappingProxyType(rendered)
+    
+    def get_rendered_bundle(self, lang_code: str) -> Optional[Dict[str, Any]]:
+        """Pre-rendered bundle (body, gzip, br, etag) return karein"""
+        resolved = self.resolve_language(lang_code)
+        return self.rendered_bundles[resolved] if resolved else None
+    
+    def get_bundle_versions(self) -> Dict[str, str]:
+        """Har language ka content hash - versioned (immutable) URLs ke liye"""
+        return {code: rendered["etag"] for code, rendered in self.rendered_bundles.items()}
+    
+    def resolve_language(self, lang_code: str) -> Optional[str]:
+        """Request ki language ko catalog ki language se match karein"""
+        if lang_code in self.catalog:
+            return lang_code
+        base = lang_code.split("-")[0]
+        return base if base in self.catalog else None
+    
+    def get_bundle(self, lang_code: str) -> Optional[Mapping[str, str]]:
+        """Read-only translations bundle - global state change nahi hota"""
+        resolved = self.resolve_language(lang_code)
+        return self.catalog[resolved] if resolved else None
+    
+    def load_language(self, lang_code: str) -> bool:
+        """Selected language load karein"""
+        bundle = self.get_bundle(lang_code)
+        if bundle is not None:
+            # Catalog immutable hai, sirf reference swap hota hai
+            self.translations = bundle
+            self.current_language = lang_code
+            print(f"✅ Language loaded: {self.available_languages.get(lang_code, lang_code)}")
+            return True
+        else:
+            print(f"❌ Language file not found: {os.path.join(self.lang_dir, f'{lang_code}.json')}")
             return False
     
-    def get_text(self, key: str, default: str = None) -> str:
+    def get_text(self, key: str, default: str = None, lang_code: str = None) -> str:
         """Text translation get karein"""
-        return self.translations.get(key, default or key)
+        bundle = self.translations if lang_code is None else (self.get_bundle(lang_code) or self.translations)
+        return bundle.get(key, default or key)
     
     def set_language(self, lang_code: str) -> bool:
         """User selected language set karein"""
@@ -77,15 +211,25 @@ class LanguageManager:
         """Language name get karein code se"""
         return self.available_languages.get(lang_code, lang_code)
     
-    def translate_dict(self, data_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Dictionary ki values translate karein"""
-        translated = {}
-        for key, value in data_dict.items():
-            if isinstance(value, str):
-                translated[key] = self.get_text(value, value)
-            else:
-                translated[key] = value
-        return translated
+    def get_formatter(self, key: str, lang_code: str = None) -> MessageFormatter:
+        """Compiled formatter cache se lein (pehli baar parse karein)"""
+        code = self.resolve_language(lang_code) if lang_code else self.current_language
+        cache_key = (code or self.current_language, key)
+        formatter = self.formatters.get(cache_key)
+        if formatter is None:
+            bundle = self.get_bundle(cache_key[0]) or self.translations
+            template = bundle.get(key, key)
+            try:
+                formatter = MessageFormatter(template, cache_key[0])
+            except ValueError as e:
+                print(f"❌ Invalid message template '{key}': {e}")
+                formatter = MessageFormatter.literal(template, cache_key[0])
+            formatter = self.formatters.setdefault(cache_key, formatter)
+        return formatter
+    
+    def format_text(self, key: str, lang_code: str = None, **params) -> str:
+        """Placeholders aur plural rules ke saath message format karein"""
+        return self.get_formatter(key, lang_code).format(**params)
     
     def get_rtl_languages(self) -> list:
         """RTL (Right-to-Left) languages ki list return karein"""
@@ -0,0 +1,503 @@
+# src/log_ingest.py
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+# Pipeline (har stage generator - poora log kabhi memory mein nahi):
+#   open_source() -> lines -> parse_btmon() -> events -> LogIngestor.ingest() -> diagnoses
+# Sources: "btmon" (live capture), "-" (stdin), btmon text log, btsnoop file (btmon -r se decode)
+
+BTSNOOP_MAGIC = b"btsnoop\0"
+# Follow mode mein EOF par itni der ruk kar dobara padhein (seconds)
+FOLLOW_POLL_INTERVAL = 0.5
+
+# btmon header: "> HCI Event: Connect Complete (0x03) plen 11    #5 [hci0] 2024-05-01 10:00:00.123456"
+HEADER_PREFIXES = ("<", ">", "@", "=")
+ADAPTER = re.compile(r"\[(hci\d+)\]")
+HEADER_TIME = re.compile(r"(?:(\d{4}-\d{2}-\d{2}) )?(\d{1,2}:\d{2}:\d{2}\.\d+)\s*$|\s(\d+\.\d+)\s*$")
+FIELD = re.compile(r"^\s+([A-Za-z][A-Za-z0-9 /()_-]*?):\s*(.*?)\s*$")
+MAC = re.compile(r"\b([0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5})\b")
+HEX_CODE = re.compile(r"\((0x[0-9a-fA-F]{2})\)")
+RSSI_VALUE = re.compile(r"(-?\d+)\b")
+
+# Block title (header ya LE Meta Event ki pehli line) -> event kind
+CONNECT_TITLES = ("Connect Complete", "LE Connection Complete", "LE Enhanced Connection Complete")
+AUTH_TITLES = ("Authentication Complete", "Simple Pairing Complete")
+# User/host ne khud band kiya - flapping mein gina jaata hai, par error nahi
+NORMAL_DISCONNECT_REASONS = {0x13, 0x15, 0x16}
+# RSSI 127 (0x7f) = "not available"
+MAX_VALID_RSSI = 20
+
+def open_source(source: str, follow: bool = False,
+                stop_event: Optional[threading.Event] = None) -> Iterator[str]:
+    """Source ke hisaab se text lines - btsnoop binary ho to btmon use decode karta hai"""
+    if source == "btmon":
+        return btmon_lines(stop_event=stop_event)
+    if source == "-":
+        return iter(sys.stdin)
+    with open(source, "rb") as f:
+        binary = f.read(len(BTSNOOP_MAGIC)) == BTSNOOP_MAGIC
+    if binary:
+        return btmon_lines(["-r", source], stop_event)
+    return follow_lines(source, stop_event) if follow else read_lines(source)
+
+def read_lines(path: str) -> Iterator[str]:
+    """Saved log ek-ek line replay karein (offline)"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        yield from f
+
+def follow_lines(path: str, stop_event: Optional[threading.Event] = None,
+                 poll_interval: float = FOLLOW_POLL_INTERVAL) -> Iterator[str]:
+    """`tail -F` jaisa - EOF par wait, file truncate/rotate ho to shuru se"""
+    f = open(path, "r", encoding="utf-8", errors="replace")
+    try:
+        partial = ""
+        while stop_event is None or not stop_event.is_set():
+            line = f.readline()
+            if line:
+                # Adhoori line (writer ne abhi newline nahi likha) agli read se judti hai
+                if not line.endswith("\n"):
+                    partial += line
+                    continue
+                yield partial + line
+                partial = ""
+                continue
+            try:
+                rotated = os.stat(path).st_ino != os.fstat(f.fileno()).st_ino
+                truncated = os.stat(path).st_size < f.tell()
+            except FileNotFoundError:
+                rotated = truncated = False
+            if rotated:
+                f.close()
+                f = open(path, "r", encoding="utf-8", errors="replace")
+                partial = ""
+            elif truncated:
+                f.seek(0)
+                partial = ""
+            else:
+                time.sleep(poll_interval)
+    finally:
+        f.close()
+
+def btmon_lines(args: Optional[List[str]] = None,
+                stop_event: Optional[threading.Event] = None) -> Iterator[str]:
+    """btmon ka output stream karein (-T = date + time, -r = btsnoop file replay)"""
+    process = subprocess.Popen(["btmon", "-T", *(args or [])], stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, text=True, errors="replace")
+    try:
+        for line in process.stdout:
+            if stop_event is not None and stop_event.is_set():
+                break
+            yield line
+    finally:
+        process.terminate()
+        process.stdout.close()
+        process.wait()
+
+class _Clock:
+    """Header timestamps ko epoch seconds mein - sirf time ho to aaj ki date, offset ho to start se"""
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.time() if start is None else start
+        self.last: Optional[float] = None
+        self.today = datetime.fromtimestamp(self.start).strftime("%Y-%m-%d")
+        # date -> midnight epoch (strptime har header par mehenga hai)
+        self.midnights: Dict[str, float] = {}
+
+    def midnight(self, date: str) -> float:
+        value = self.midnights.get(date)
+        if value is None:
+            value = self.midnights[date] = datetime.strptime(date, "%Y-%m-%d").timestamp()
+        return value
+
+    def parse(self, header: str) -> Optional[float]:
+        match = HEADER_TIME.search(header)
+        if match is None:
+            return None
+        day, clock, offset = match.groups()
+        if offset is not None:
+            timestamp = self.start + float(offset)
+        else:
+            date = day or self.today
+            hours, minutes, seconds = clock.split(":")
+            try:
+                timestamp = self.midnight(date) + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+            except ValueError:
+                return None
+            # Date ke bina log midnight cross kare to
+            if day is None and self.last is not None and timestamp < self.last - 43200:
+                timestamp += 86400
+        self.last = timestamp
+        return timestamp
+
+def _code(value: str) -> Optional[int]:
+    match = HEX_CODE.search(value)
+    return int(match.group(1), 16) if match else None
+
+def _handle(value: str) -> Optional[int]:
+    match = re.match(r"\d+", value)
+    return int(match.group()) if match else None
+
+def parse_btmon(lines: Iterable[str], knowledge=None, start: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """btmon text ko events mein badlein - ek waqt mein sirf current block memory mein.
+
+    Events: connected, connect_failed, disconnected, auth_failure, rssi, error. Disconnect/auth
+    events mein sirf connection handle hota hai - handle -> MAC Connect Complete se yaad rakha jaata hai.
+    Non-btmon lines (dmesg/journal) knowledge base se classify hokar error events bante hain."""
+    clock = _Clock(start)
+    handles: Dict[int, str] = {}
+    header = None
+    body: List[str] = []
+
+    def flush():
+        if header is not None:
+            yield from _block_events(header, body, clock, handles)
+
+    for line in lines:
+        if line.startswith(HEADER_PREFIXES):
+            yield from flush()
+            header, body = line.rstrip("\n"), []
+        elif line[:1] in (" ", "\t"):
+            if header is not None:
+                body.append(line.rstrip("\n"))
+        elif line.strip():
+            yield from flush()
+            header, body = None, []
+            event = _log_line_event(line, knowledge, clock)
+            if event is not None:
+                yield event
+    yield from flush()
+
+def _log_line_event(line: str, knowledge, clock: _Clock) -> Optional[Dict[str, Any]]:
+    """Kernel/daemon log line (e.g. 'Bluetooth: hci0: command 0x0c03 tx timeout')"""
+    if knowledge is None or "bluetooth" not in line.lower() and "hci" not in line.lower():
+        return None
+    entry = knowledge.classify(line)
+    if entry is None:
+        return None
+    mac = MAC.search(line)
+    adapter = re.search(r"\bhci\d+\b", line)
+    return {"type": "error", "mac": mac.group(1).upper() if mac else None,
+            "adapter": adapter.group() if adapter else None, "timestamp": clock.last or time.time(),
+            "error": line.strip(), "code": entry["code"]}
+
+def _block_events(header: str, body: List[str], clock: _Clock,
+                  handles: Dict[int, str]) -> Iterator[Dict[str, Any]]:
+    timestamp = clock.parse(header) or time.time()
+    # MGMT events (@) HCI events se hi bante hain - dobara ginne se bachne ke liye skip
+    if header.startswith("@"):
+        return
+    adapter = ADAPTER.search(header)
+    base = {"adapter": adapter.group(1) if adapter else None, "timestamp": timestamp}
+    # LE Meta Event ka asli naam pehli body line mein hota hai
+    title = header
+    if "LE Meta Event" in header and body:
+        title = body[0]
+
+    fields = [match.groups() for match in map(FIELD.match, body) if match]
+    status = reason = handle = None
+    mac = None
+    for key, value in fields:
+        if key == "Status" and status is None:
+            status = (value, _code(value))
+        elif key == "Reason" and reason is None:
+            reason = (value, _code(value))
+        elif key == "Handle" and handle is None:
+            handle = _handle(value)
+            found = MAC.search(value)
+            mac = mac or (found.group(1).upper() if found else None)
+        elif key in ("Address", "Peer address", "BR/EDR Address", "LE Address") and mac is None:
+            found = MAC.search(value)
+            mac = found.group(1).upper() if found else None
+
+    if any(name in title for name in CONNECT_TITLES) and "Disconnect" not in title:
+        if status is None:
+            return
+        if status[1] == 0:
+            if handle is not None and mac:
+                handles[handle] = mac
+            yield {**base, "type": "connected", "mac": mac}
+        else:
+            yield {**base, "type": "connect_failed", "mac": mac, "status": status[1],
+                   "error": f"Connect failed: Status: {status[0]}"}
+    elif "Disconnect Complete" in title:
+        mac = handles.pop(handle, None) or mac
+        code = reason[1] if reason else None
+        event = {**base, "type": "disconnected", "mac": mac, "reason": code}
+        if reason and code not in NORMAL_DISCONNECT_REASONS:
+            event["error"] = f"Disconnected: Reason: {reason[0]}"
+        yield event
+    elif any(name in title for name in AUTH_TITLES):
+        if status is not None and status[1]:
+            yield {**base, "type": "auth_failure", "mac": handles.get(handle) or mac, "status": status[1],
+                   "error": f"Authentication failed: Status: {status[0]}"}
+    else:
+        yield from _rssi_events(base, fields, handles)
+
+def _rssi_events(base: Dict[str, Any], fields: List[tuple], handles: Dict[int, str]) -> Iterator[Dict[str, Any]]:
+    """Advertising/inquiry reports (kai devices ek block mein) aur Read RSSI responses"""
+    mac = name = None
+    for key, value in fields:
+        if key in ("Address", "Peer address", "BR/EDR Address", "LE Address"):
+            found = MAC.search(value)
+            mac, name = (found.group(1).upper() if found else None), None
+        elif key == "Handle":
+            mac, name = handles.get(_handle(value)), None
+        elif key.startswith("Name"):
+            name = value
+        elif key == "RSSI" and mac:
+            found = RSSI_VALUE.match(value)
+            rssi = int(found.group(1)) if found else None
+            if rssi is not None and rssi < MAX_VALID_RSSI:
+                yield {**base, "type": "rssi", "mac": mac, "rssi": rssi, "name": name}
+
+class _Activity:
+    """Ek device ki recent log activity - bounded deques, memory log length se independent"""
+
+    __slots__ = ("events", "disconnects", "drops", "rssi", "errors", "last_diagnosed", "last_registry_rssi",
+                 "last_registry_update")
+
+    def __init__(self):
+        self.events: deque = deque(maxlen=256)
+        self.disconnects: deque = deque(maxlen=64)
+        self.drops: deque = deque(maxlen=64)
+        self.rssi: deque = deque(maxlen=64)
+        self.errors: deque = deque(maxlen=20)
+        self.last_diagnosed: Optional[float] = None
+        self.last_registry_rssi: Optional[int] = None
+        self.last_registry_update = 0.0
+
+class LogIngestor:
+    """Log events se registry, trends aur diagnosis incrementally update karein (scan ke bina)"""
+
+    # Itni der (seconds) mein itne disconnects = flapping
+    FLAP_WINDOW = 300.0
+    FLAP_THRESHOLD = 3
+    # Ek device ka dobara diagnosis kam se kam itne log-seconds baad
+    DIAGNOSE_INTERVAL = 30.0
+    # Advertising RSSI har packet par aata hai - registry tabhi update jab itna badle (ya 10s ho jaayein)
+    RSSI_UPDATE_DELTA = 3
+    RSSI_UPDATE_INTERVAL = 10.0
+    MAX_DEVICES = 2048
+
+    def __init__(self, registry=None, ai_fixer=None, trends=None, knowledge=None):
+        self.registry = registry
+        self.ai_fixer = ai_fixer
+        self.trends = trends
+        self.knowledge = knowledge
+        self.lock = threading.Lock()
+        self.devices: "OrderedDict[str, _Activity]" = OrderedDict()
+        self.adapter_errors: deque = deque(maxlen=50)
+        # Adapter error code (ya line) -> last report time (wahi error har line par dobara report na ho)
+        self.adapter_reported: "OrderedDict[str, float]" = OrderedDict()
+        self.counts: Dict[str, int] = {}
+        self.last_event_at: Optional[float] = None
+
+    def get_knowledge(self):
+        """Fixer ka knowledge base share karein (ek hi index)"""
+        if self.knowledge is None:
+            if self.ai_fixer is not None:
+                self.knowledge = self.ai_fixer.get_error_knowledge()
+            else:
+                from error_knowledge import ErrorKnowledgeBase
+                self.knowledge = ErrorKnowledgeBase()
+        return self.knowledge
+
+    def run(self, source: str, follow: bool = False,
+            stop_event: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """Source -> events -> diagnoses (jinmein koi issue mila)"""
+        lines = open_source(source, follow, stop_event)
+        return self.ingest(parse_btmon(lines, self.get_knowledge()))
+
+    def ingest(self, events: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for event in events:
+            result = self.process(event)
+            if result is not None:
+                yield result
+
+    def process(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Ek event apply karein - notable event par diagnosis (issues hon to) return"""
+        kind, mac, timestamp = event["type"], event.get("mac"), event["timestamp"]
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.last_event_at = timestamp
+        if not mac:
+            if event.get("error"):
+                self.adapter_errors.append((timestamp, event["error"]))
+                return self.report_adapter_error(event)
+            return None
+
+        with self.lock:
+            activity = self.devices.get(mac)
+            if activity is None:
+                if len(self.devices) >= self.MAX_DEVICES:
+                    self.devices.popitem(last=False)
+                activity = self.devices[mac] = _Activity()
+            else:
+                self.devices.move_to_end(mac)
+            activity.events.append(timestamp)
+            if kind == "rssi":
+                activity.rssi.append((timestamp, event["rssi"]))
+            elif kind == "disconnected":
+                activity.disconnects.append(timestamp)
+                if event.get("error"):
+                    activity.drops.append(timestamp)
+            if event.get("error"):
+                activity.errors.append((timestamp, event["error"]))
+
+        device = self.update_registry(mac, event, activity)
+        if kind == "rssi":
+            return None
+        return self.diagnose(mac, device, activity, event)
+
+    def update_registry(self, mac: str, event: Dict[str, Any], activity: _Activity) -> Dict[str, Any]:
+        """Registry record merge karein (naya device ho to log se bana hua)"""
+        kind, timestamp = event["type"], event["timestamp"]
+        device = (self.registry.get(mac) if self.registry is not None else None) or {
+            "name": mac, "mac_address": mac, "connected": False, "device_type": "unknown"}
+        updated = dict(device)
+        if kind == "rssi":
+            if event.get("name") and updated["name"] == mac:
+                updated["name"] = event["name"]
+            last = activity.last_registry_rssi
+            if last is None or abs(event["rssi"] - last) >= self.RSSI_UPDATE_DELTA or \
+                    timestamp - activity.last_registry_update >= self.RSSI_UPDATE_INTERVAL:
+                updated["signal_strength"] = event["rssi"]
+                activity.last_registry_rssi = event["rssi"]
+                activity.last_registry_update = timestamp
+        elif kind == "connected":
+            updated["connected"] = True
+        elif kind == "disconnected":
+            updated["connected"] = False
+        if updated == device:
+            return device
+        if self.registry is not None:
+            self.registry.upsert(updated)
+        if self.trends is not None and kind in ("rssi", "connected", "disconnected"):
+            self.trends.record(updated, timestamp)
+        return updated
+
+    def activity(self, mac: str) -> Optional[Dict[str, Any]]:
+        """FLAP_WINDOW ki log activity - analyze_device(trend=...) ke format mein"""
+        with self.lock:
+            activity = self.devices.get(mac)
+            if activity is None:
+                return None
+            now = activity.events[-1]
+            cutoff = now - self.FLAP_WINDOW
+            events = [t for t in activity.events if t >= cutoff]
+            rssi = [value for t, value in activity.rssi if t >= cutoff]
+            disconnects = sum(1 for t in activity.disconnects if t >= cutoff)
+            drops = sum(1 for t in activity.drops if t >= cutoff)
+        return {
+            "samples": len(events),
+            "span_seconds": round(now - events[0], 1) if events else 0.0,
+            "rssi_mean": round(sum(rssi) / len(rssi), 2) if rssi else None,
+            "rssi_latest": rssi[-1] if rssi else None,
+            # Flapping = baar-baar disconnect, reason kuch bhi ho
+            "connection_drops": disconnects,
+            "abnormal_disconnects": drops,
+            "flapping": disconnects >= self.FLAP_THRESHOLD,
+            "source": "log"
+        }
+
+    def errors(self, mac: Optional[str] = None, max_age: Optional[float] = None) -> List[str]:
+        """Device ki log error lines - mac na diya ho to sirf adapter-wide lines"""
+        with self.lock:
+            if mac:
+                activity = self.devices.get(mac)
+                entries = list(activity.errors) if activity else []
+            else:
+                entries = list(self.adapter_errors)
+        if max_age and self.last_event_at is not None:
+            entries = [entry for entry in entries if entry[0] >= self.last_event_at - max_age]
+        return [line for _, line in sorted(entries)]
+
+    def diagnose(self, mac: str, device: Dict[str, Any], activity: _Activity,
+                 event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.ai_fixer is None:
+            return None
+        timestamp = event["timestamp"]
+        # Errors/auth failures hamesha, baaki (connect/disconnect) rate-limited
+        if not event.get("error") and activity.last_diagnosed is not None and \
+                timestamp - activity.last_diagnosed < self.DIAGNOSE_INTERVAL:
+            return None
+        activity.last_diagnosed = timestamp
+        diagnosis = self.ai_fixer.analyze_device(device, trend=self.activity(mac),
+                                                 errors=self.errors(mac, self.FLAP_WINDOW))
+        if not diagnosis["detected_issues"]:
+            return None
+        return {"mac_address": mac, "timestamp": timestamp, "event": event["type"], "diagnosis": diagnosis}
+
+    def report_adapter_error(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adapter-wide error (koi device nahi) ka apna result - har error DIAGNOSE_INTERVAL mein ek baar"""
+        line, timestamp = event["error"], event["timestamp"]
+        key = event.get("code") or line
+        last = self.adapter_reported.get(key)
+        if last is not None and timestamp - last < self.DIAGNOSE_INTERVAL:
+            return None
+        self.adapter_reported[key] = timestamp
+        self.adapter_reported.move_to_end(key)
+        if len(self.adapter_reported) > self.adapter_errors.maxlen:
+            self.adapter_reported.popitem(last=False)
+        issues = self.get_knowledge().issues_from_errors([line]) or [
+            {"type": "adapter_issues", "description": line, "severity": "medium"}]
+        return {"mac_address": None, "timestamp": timestamp, "event": event["type"],
+                "adapter_error": line, "issues": issues}
+
+    def flapping(self) -> List[str]:
+        """Abhi flap ho rahe devices"""
+        return [mac for mac in list(self.devices) if (self.activity(mac) or {}).get("flapping")]
+
+    def active_macs(self, max_age: float = FLAP_WINDOW) -> List[str]:
+        """Jo devices log mein haal hi mein dikhe (scan inhe registry se na hataye)"""
+        if self.last_event_at is None:
+            return []
+        cutoff = self.last_event_at - max_age
+        with self.lock:
+            return [mac for mac, activity in self.devices.items() if activity.events[-1] >= cutoff]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"devices": len(self.devices), "events": dict(self.counts),
+                "last_event_at": self.last_event_at, "flapping": self.flapping(),
+                "adapter_errors": [line for _, line in self.adapter_errors][-10:]}
+
+def describe_result(result: Dict[str, Any]) -> str:
+    """Ek ingest result ki ek line (CLI aur daemon dono ke liye)"""
+    if result["mac_address"] is None:
+        issues = "; ".join(issue["description"] for issue in result["issues"])
+        return f"adapter after {result['event']}: {issues}"
+    mac, name = result["mac_address"], result["diagnosis"]["device"]["name"]
+    label = mac if name == mac else f"{name} ({mac})"
+    issues = "; ".join(issue["description"] for issue in result["diagnosis"]["detected_issues"])
+    return f"{label} after {result['event']}: {issues}"
+
+def main(source: str = "-", follow: bool = False, output_json: bool = False, quiet: bool = False) -> int:
+    """CLI entry: `main.py ingest [btmon|-|log file|btsnoop file] [--follow] [--json|--ndjson]`"""
+    from ai_bluetooth_fix import AIBluetoothFixer
+    from device_registry import DeviceRegistry
+
+    ingestor = LogIngestor(DeviceRegistry(), AIBluetoothFixer(verbose=False))
+    started = time.monotonic()
+    for result in ingestor.run(source, follow):
+        if output_json:
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+        else:
+            sys.stdout.write(f"⚠️  {describe_result(result)}\n")
+        sys.stdout.flush()
+    if not quiet:
+        stats = ingestor.stats()
+        events = sum(stats["events"].values())
+        print(f"✅ Ingested {events} events for {stats['devices']} devices in "
+              f"{time.monotonic() - started:.2f}s ({len(stats['flapping'])} flapping, "
+              f"{len(ingestor.adapter_errors)} adapter errors)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
@@ -0,0 +1,185 @@
+# src/message_format.py
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+# Template syntax (ICU MessageFormat ka chhota subset):
+#   "Hello {name}"
+#   "Found {count, plural, =0 {no devices} one {# device} other {# devices}}"
+# Plural branch ke andar "#" number se replace hota hai.
+
+def _plural_en(n: float) -> str:
+    return "one" if n == 1 else "other"
+
+def _plural_fr(n: float) -> str:
+    return "one" if 0 <= n < 2 else "other"
+
+def _plural_hi(n: float) -> str:
+    return "one" if n == 0 or n == 1 else "other"
+
+def _plural_pt(n: float) -> str:
+    return "one" if 0 <= n < 2 else "other"
+
+def _plural_ar(n: float) -> str:
+    if n == 0:
+        return "zero"
+    if n == 1:
+        return "one"
+    if n == 2:
+        return "two"
+    if n == int(n):
+        mod100 = int(n) % 100
+        if 3 <= mod100 <= 10:
+            return "few"
+        if 11 <= mod100 <= 99:
+            return "many"
+    return "other"
+
+def _plural_zh(n: float) -> str:
+    return "other"
+
+# CLDR cardinal plural categories (integers ke liye simplified)
+PLURAL_RULES: Dict[str, Callable[[float], str]] = {
+    "en": _plural_en,
+    "es": _plural_en,
+    "de": _plural_en,
+    "fr": _plural_fr,
+    "hi": _plural_hi,
+    "pt": _plural_pt,
+    "ar": _plural_ar,
+    "zh": _plural_zh,
+}
+
+def plural_rule(lang_code: str) -> Callable[[float], str]:
+    """Language ka plural category function return karein"""
+    return PLURAL_RULES.get(lang_code.split("-")[0], _plural_en)
+
+class MessageSyntaxError(ValueError):
+    pass
+
+Part = Union[str, Tuple]
+
+class MessageFormatter:
+    """Ek baar parse kiya gaya message template - format() sirf parts join karta hai"""
+
+    def __init__(self, template: str, lang_code: str = "en"):
+        self.template = template
+        self.lang_code = lang_code
+        self.plural = plural_rule(lang_code)
+        self.parts, end = self._parse(template, 0, in_plural=False)
+        if end != len(template):
+            raise MessageSyntaxError(f"Unexpected '}}' at {end} in {template!r}")
+        # Placeholder-free templates ke liye fast path
+        self.static = self.parts[0] if len(self.parts) == 1 and isinstance(self.parts[0], str) else None
+        if not self.parts:
+            self.static = ""
+
+    @classmethod
+    def literal(cls, text: str, lang_code: str = "en") -> "MessageFormatter":
+        """Bina parse kiye formatter - text jaisa hai waisa lautata hai (e.g. invalid template ka fallback)"""
+        formatter = cls("", lang_code)
+        formatter.template = text
+        formatter.parts = [text] if text else []
+        formatter.static = text
+        return formatter
+
+    def _parse(self, text: str, pos: int, in_plural: bool) -> Tuple[List[Part], int]:
+        parts: List[Part] = []
+        literal = []
+        while pos < len(text):
+            char = text[pos]
+            if char == "{":
+                if literal:
+                    parts.append("".join(literal))
+                    literal = []
+                part, pos = self._parse_argument(text, pos + 1)
+                parts.append(part)
+            elif char == "}":
+                break
+            elif char == "#" and in_plural:
+                if literal:
+                    parts.append("".join(literal))
+                    literal = []
+                parts.append(("number",))
+                pos += 1
+            else:
+                literal.append(char)
+                pos += 1
+        if literal:
+            parts.append("".join(literal))
+        return parts, pos
+
+    def _parse_argument(self, text: str, pos: int) -> Tuple[Part, int]:
+        end = self._find_any(text, pos, ",}")
+        name = text[pos:end].strip()
+        if not name:
+            raise MessageSyntaxError(f"Empty placeholder in {self.template!r}")
+        if text[end] == "}":
+            return ("arg", name), end + 1
+
+        type_end = self._find_any(text, end + 1, ",}")
+        arg_type = text[end + 1:type_end].strip()
+        if arg_type != "plural" or text[type_end] != ",":
+            raise MessageSyntaxError(f"Unsupported argument type {arg_type!r} in {self.template!r}")
+
+        categories: Dict[str, List[Part]] = {}
+        exact: Dict[float, List[Part]] = {}
+        pos = type_end + 1
+        while True:
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            if pos >= len(text):
+                raise MessageSyntaxError(f"Unterminated plural in {self.template!r}")
+            if text[pos] == "}":
+                break
+            brace = text.find("{", pos)
+            if brace < 0:
+                raise MessageSyntaxError(f"Plural selector without branch in {self.template!r}")
+            selector = text[pos:brace].strip()
+            branch, pos = self._parse(text, brace + 1, in_plural=True)
+            if pos >= len(text) or text[pos] != "}":
+                raise MessageSyntaxError(f"Unterminated plural branch in {self.template!r}")
+            pos += 1
+            if selector.startswith("="):
+                exact[float(selector[1:])] = branch
+            else:
+                categories[selector] = branch
+        if "other" not in categories:
+            raise MessageSyntaxError(f"Plural without 'other' branch in {self.template!r}")
+        return ("plural", name, categories, exact), pos + 1
+
+    @staticmethod
+    def _find_any(text: str, pos: int, chars: str) -> int:
+        for index in range(pos, len(text)):
+            if text[index] in chars:
+                return index
+        raise MessageSyntaxError(f"Unterminated placeholder in {text!r}")
+
+    def format(self, **params: Any) -> str:
+        """Params ke saath message render karein"""
+        if self.static is not None:
+            return self.static
+        out: List[str] = []
+        self._render(self.parts, params, None, out)
+        return "".join(out)
+
+    def _render(self, parts: List[Part], params: Dict[str, Any], number, out: List[str]):
+        for part in parts:
+            if isinstance(part, str):
+                out.append(part)
+            elif part[0] == "arg":
+                value = params.get(part[1])
+                out.append("{" + part[1] + "}" if value is None else str(value))
+            elif part[0] == "number":
+                out.append(str(number))
+            else:
+                _, name, categories, exact = part
+                value = params.get(name, 0)
+                branch = exact.get(value)
+                if branch is None:
+                    branch = categories.get(self.plural(value), categories["other"])
+                self._render(branch, params, value, out)
+
+if __name__ == "__main__":
+    formatter = MessageFormatter("Found {count, plural, =0 {no devices} one {# device} other {# devices}}")
+    for count in (0, 1, 5):
+        print(formatter.format(count=count))
+    print(MessageFormatter("{count, plural, zero {#} one {واحد} two {اثنان} few {# قليل} other {#}}", "ar").format(count=4))
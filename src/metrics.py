@@ -0,0 +1,253 @@
+# src/metrics.py
+import bisect
+import json
+import os
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+# Prometheus default-jaise latency buckets (seconds)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def escape_label_value(value: Any) -> str:
+    """Prometheus text format ke liye label value escape karein (\\, \" aur newline)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def escape_help(text: str) -> str:
+    """HELP text mein sirf \\ aur newline escape hote hain"""
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+class _ShardLocal(threading.local):
+    """Har thread ka shard - pehli access par ek hi baar banta hai, bina global lock ke"""
+
+    def __init__(self, registry: "MetricsRegistry"):
+        self.shard = registry._new_shard()
+        registry._register_shard(self.shard)
+
+class MetricsRegistry:
+    """Lock-light metrics - har thread apne shard mein likhta hai, scrape par merge"""
+
+    # Itne shards hone par dead threads ke shards fold kar diye jaate hain
+    MAX_SHARDS = 64
+    # Pre-fork: exit ho chuke processes ke snapshots is file mein fold hote hain
+    RETIRED_SNAPSHOT = "retired.json"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.shards: List[Tuple[threading.Thread, Dict[str, Dict]]] = []
+        # Naye threads ke shards yahan aate hain (deque append atomic) - scrape par shards mein jaate hain
+        self.pending: deque = deque()
+        self.retired = self._new_shard()
+        self.meta: Dict[str, Tuple[str, str]] = {}
+        self.buckets: Dict[str, Tuple[float, ...]] = {}
+        self.gauges: Dict[str, Callable[[], Dict[Labels, float]]] = {}
+        # Pre-fork mode: har process apna snapshot yahan likhta hai, render sabko merge karta hai
+        self.snapshot_dir: Optional[str] = None
+        self.local = _ShardLocal(self)
+
+    def _new_shard(self) -> Dict[str, Dict]:
+        return {"counters": {}, "histograms": {}}
+
+    def _shard(self) -> Dict[str, Dict]:
+        return self.local.shard
+
+    def _register_shard(self, shard: Dict[str, Dict]):
+        """Naya shard pending mein - request path par lock ka wait nahi"""
+        self.pending.append((threading.current_thread(), shard))
+        # Bina scrape ke bahut threads aayein to dead shards fold karein - lock busy ho to agli baar
+        if len(self.pending) >= self.MAX_SHARDS and self.lock.acquire(blocking=False):
+            try:
+                self._fold_dead_shards()
+            finally:
+                self.lock.release()
+
+    def _fold_dead_shards(self):
+        """Pending shards lein aur khatam ho chuke threads ke shards retired mein merge karein (lock held)"""
+        while self.pending:
+            self.shards.append(self.pending.popleft())
+        alive = []
+        for thread, shard in self.shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                self._merge(self.retired, shard)
+        self.shards = alive
+
+    def _merge(self, target: Dict[str, Dict], shard: Dict[str, Dict]):
+        for key, value in list(shard["counters"].items()):
+            target["counters"][key] = target["counters"].get(key, 0) + value
+        for key, (counts, total, count) in list(shard["histograms"].items()):
+            existing = target["histograms"].get(key)
+            if existing is None:
+                target["histograms"][key] = [list(counts), total, count]
+            else:
+                existing[0] = [a + b for a, b in zip(existing[0], counts)]
+                existing[1] += total
+                existing[2] += count
+
+    def describe(self, name: str, metric_type: str, help_text: str, buckets=None):
+        """Metric ka type aur help text register karein"""
+        self.meta[name] = (metric_type, help_text)
+        if metric_type == "histogram":
+            self.buckets[name] = tuple(buckets or DEFAULT_BUCKETS)
+
+    def register_gauge(self, name: str, help_text: str, collect: Callable[[], Dict[Labels, float]]):
+        """Gauge jiski value scrape ke time callback se aati hai"""
+        self.meta[name] = ("gauge", help_text)
+        self.gauges[name] = collect
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1):
+        """Counter badhayein"""
+        counters = self._shard()["counters"]
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, labels: Labels = ()):
+        """Histogram mein ek observation record karein"""
+        histograms = self._shard()["histograms"]
+        key = (name, labels)
+        entry = histograms.get(key)
+        if entry is None:
+            entry = histograms[key] = [[0] * (len(self.buckets[name]) + 1), 0.0, 0]
+        entry[0][bisect.bisect_left(self.buckets[name], value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def collect(self) -> Dict[str, Dict]:
+        """Sab shards merge karke ek snapshot banayein"""
+        merged = self._new_shard()
+        with self.lock:
+            self._fold_dead_shards()
+            self._merge(merged, self.retired)
+            for _, shard in self.shards:
+                self._merge(merged, shard)
+        return merged
+
+    def counter_value(self, name: str, labels: Labels = ()) -> float:
+        """Ek counter ki current value (sab shards ka total)"""
+        return self.collect()["counters"].get((name, labels), 0)
+
+    def share(self, snapshot_dir: str):
+        """Processes ke metrics aggregate karein (fork se pehle call karein)"""
+        os.makedirs(snapshot_dir, exist_ok=True)
+        self.snapshot_dir = snapshot_dir
+
+    @staticmethod
+    def _dump(data: Dict[str, Dict]) -> Dict[str, List]:
+        return {kind: [[name, [list(pair) for pair in labels], value] for (name, labels), value in entries.items()]
+                for kind, entries in data.items()}
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Any]:
+        """Snapshot file padhein - (name, labels) keys wapas tuples mein"""
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        record["data"] = {kind: {(name, tuple(tuple(pair) for pair in labels)): value
+                                 for name, labels, value in entries}
+                          for kind, entries in record["data"].items()}
+        return record
+
+    def _write_file(self, path: str, record: Dict[str, Any]):
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(f"{path}.tmp", path)
+
+    def write_snapshot(self):
+        """Is process ke metrics shared dir mein likhein (worker/scanner periodically aur exit par)"""
+        if self.snapshot_dir is None:
+            return
+        try:
+            self._write_file(os.path.join(self.snapshot_dir, f"{os.getpid()}.json"),
+                             {"data": self._dump(self.collect())})
+        except OSError as e:
+            print(f"❌ Could not write metrics snapshot: {e}")
+
+    def fold_snapshot(self, pid: int):
+        """Exit ho chuke process ka snapshot retired mein merge karein - counters reset na dikhein (sirf master)"""
+        if self.snapshot_dir is None:
+            return
+        path = os.path.join(self.snapshot_dir, f"{pid}.json")
+        retired_path = os.path.join(self.snapshot_dir, self.RETIRED_SNAPSHOT)
+        try:
+            snapshot = self._load(path)["data"]
+        except (OSError, ValueError):
+            return
+        try:
+            retired = self._load(retired_path)
+        except (OSError, ValueError):
+            retired = {"data": self._new_shard(), "folded": []}
+        self._merge(retired["data"], snapshot)
+        # Folded pids yaad rahein taaki beech mein padhne wala unhe do baar na gine
+        folded = (retired["folded"] + [pid])[-self.MAX_SHARDS:]
+        try:
+            self._write_file(retired_path, {"data": self._dump(retired["data"]), "folded": folded})
+            os.remove(path)
+        except OSError as e:
+            print(f"❌ Could not fold metrics snapshot {pid}: {e}")
+
+    def collect_all(self) -> Dict[str, Dict]:
+        """Is process ke metrics + (pre-fork mode mein) baaki processes ke snapshots"""
+        merged = self.collect()
+        if self.snapshot_dir is None:
+            return merged
+        own = f"{os.getpid()}.json"
+        folded = set()
+        try:
+            retired = self._load(os.path.join(self.snapshot_dir, self.RETIRED_SNAPSHOT))
+            self._merge(merged, retired["data"])
+            folded = {f"{pid}.json" for pid in retired["folded"]}
+        except (OSError, ValueError):
+            pass
+        for entry in os.scandir(self.snapshot_dir):
+            if entry.name == own or entry.name == self.RETIRED_SNAPSHOT or entry.name in folded \
+                    or not entry.name.endswith(".json"):
+                continue
+            try:
+                self._merge(merged, self._load(entry.path)["data"])
+            except (OSError, ValueError):
+                continue
+        return merged
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+        pairs = labels + extra
+        if not pairs:
+            return ""
+        body = ",".join(f'{key}="{escape_label_value(value)}"' for key, value in pairs)
+        return "{" + body + "}"
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        data = self.collect_all()
+        lines: List[str] = []
+        by_name: Dict[str, List[Any]] = {}
+        for (name, labels), value in data["counters"].items():
+            by_name.setdefault(name, []).append(("counter", labels, value))
+        for (name, labels), value in data["histograms"].items():
+            by_name.setdefault(name, []).append(("histogram", labels, value))
+        for name, collect in self.gauges.items():
+            try:
+                for labels, value in collect().items():
+                    by_name.setdefault(name, []).append(("gauge", labels, value))
+            except Exception as e:
+                print(f"⚠️ Gauge {name} failed: {e}")
+
+        for name in sorted(by_name):
+            metric_type, help_text = self.meta.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {escape_help(help_text)}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for kind, labels, value in sorted(by_name[name], key=lambda item: item[1]):
+                if kind == "histogram":
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets[name] + (float("inf"),), counts):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{self._format_labels(labels, (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{self._format_labels(labels)} {total}")
+                    lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+                else:
+                    lines.append(f"{name}{self._format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
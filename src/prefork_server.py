@@ -0,0 +1,287 @@
+# src/prefork_server.py
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from werkzeug.serving import make_server
+
+
+class InFlightCounter:
+    """WSGI middleware jo active requests count karta hai (drain ke liye)"""
+
+    def __init__(self, app):
+        self.app = app
+        self.active = 0
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+
+    def __call__(self, environ, start_response):
+        with self.lock:
+            self.active += 1
+        result = None
+        try:
+            result = self.app(environ, start_response)
+            for chunk in result:
+                yield chunk
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+            with self.lock:
+                self.active -= 1
+                if self.active == 0:
+                    self.idle.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Sab in-flight requests khatam hone ka wait karein"""
+        with self.lock:
+            return self.idle.wait_for(lambda: self.active == 0, timeout)
+
+
+class PreforkServer:
+    """Pre-fork multi-process server - har worker warm state ke saath traffic leta hai"""
+
+    def __init__(self, web_server, workers: int = 2, reuse_port: bool = False,
+                 graceful_timeout: Optional[float] = None):
+        self.web_server = web_server
+        self.workers = max(1, workers)
+        self.reuse_port = reuse_port and hasattr(socket, "SO_REUSEPORT")
+        self.graceful_timeout = web_server.GRACEFUL_TIMEOUT if graceful_timeout is None else graceful_timeout
+        self.listener: Optional[socket.socket] = None
+        self.children: Dict[int, int] = {}  # pid -> worker index
+        # Ek hi scanner process - N workers N radio scans na chalayein
+        self.scanner_pid: Optional[int] = None
+        self.shared_dir: Optional[str] = None
+        self.stopping = False
+        self.reloading = False
+
+    def create_listener(self) -> socket.socket:
+        """Listening socket banayein (shared ya SO_REUSEPORT wala)"""
+        family = socket.AF_INET6 if ":" in self.web_server.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self.web_server.host, self.web_server.port))
+        sock.listen(socket.SOMAXCONN)
+        sock.set_inheritable(True)
+        return sock
+
+    def run(self):
+        """Master process: workers fork karein aur supervise karein"""
+        if not hasattr(os, "fork"):
+            print("⚠️ Pre-fork mode is not supported on this platform, using a single process")
+            self.web_server.run(workers=1)
+            return
+
+        # Fork se pehle preload - workers copy-on-write pages share karte hain
+        if not self.web_server.load_components():
+            # Cold workers fork karne ka koi fayda nahi - supervisor restart karega
+            print("❌ Startup warm-up failed, not starting workers")
+            sys.exit(1)
+        self.listener = self.create_listener()
+        # Scanner state (aur jobs) sab processes ke beech yahan share hote hain
+        self.shared_dir = tempfile.mkdtemp(prefix="bluetooth-ai-fix-")
+        self.web_server.shared_state_path = os.path.join(self.shared_dir, "registry.json")
+        # Fix job kisi bhi worker ne liya ho, status/long-poll/SSE har worker se chale
+        self.web_server.jobs.share(os.path.join(self.shared_dir, "jobs"))
+        # /metrics kisi bhi worker se saare processes ka total dikhaye
+        self.web_server.metrics.share(os.path.join(self.shared_dir, "metrics"))
+
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        signal.signal(signal.SIGHUP, self.handle_reload)
+        signal.signal(signal.SIGUSR1, self.handle_scan_request)
+
+        print(f"👷 Master {os.getpid()} starting {self.workers} workers")
+        self.spawn_scanner()
+        for index in range(self.workers):
+            self.spawn_worker(index)
+
+        try:
+            while not self.stopping:
+                if self.reloading:
+                    self.reloading = False
+                    self.rolling_restart()
+                self.reap_workers()
+                time.sleep(0.5)
+        finally:
+            self.shutdown_workers()
+            self.listener.close()
+            shutil.rmtree(self.shared_dir, ignore_errors=True)
+            print("\n🛑 All workers stopped")
+
+    def spawn_worker(self, index: int) -> int:
+        """Ek naya worker fork karein"""
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self.worker_main(index)
+            except Exception as e:
+                print(f"❌ Worker {index} crashed: {e}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self.children[pid] = index
+        return pid
+
+    def spawn_scanner(self) -> int:
+        """Background scanner process fork karein - workers uski state file follow karte hain"""
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                signal.signal(signal.SIGHUP, signal.SIG_DFL)
+                self.listener.close()
+                print(f"📡 Scanner (pid {os.getpid()}) started")
+                self.web_server.run_shared_scanner()
+            except Exception as e:
+                print(f"❌ Scanner crashed: {e}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self.scanner_pid = pid
+        return pid
+
+    def worker_main(self, index: int):
+        """Worker process: shared socket par requests serve karein"""
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+
+        if self.reuse_port:
+            # Har worker apna socket bind karta hai, kernel load balance karta hai
+            self.listener.close()
+            self.listener = self.create_listener()
+
+        app = InFlightCounter(self.web_server.app)
+        server = make_server(self.web_server.host, self.web_server.port, app,
+                             threaded=True, fd=self.listener.fileno())
+
+        def stop_serving():
+            server.shutdown()
+            # Naye connections band, ab open SSE streams ko bhi lautne ko kahein
+            self.web_server.begin_shutdown()
+
+        def drain(signum, frame):
+            # serve_forever isi thread mein chal raha hai, isliye shutdown alag thread se
+            threading.Thread(target=stop_serving, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, drain)
+        self.web_server.start_background_tasks()
+
+        print(f"✅ Worker {index} (pid {os.getpid()}) accepting traffic")
+        server.serve_forever()
+
+        deadline = time.monotonic() + self.graceful_timeout
+        if not app.wait_idle(self.graceful_timeout):
+            print(f"⚠️ Worker {index} drain timeout, {app.active} requests dropped")
+        server.server_close()
+        # Accepted fix jobs isi process ke executor mein hain - exit se pehle unka wait
+        if not self.web_server.jobs.shutdown(max(0.0, deadline - time.monotonic())):
+            print(f"⚠️ Worker {index} drain timeout, unfinished fix jobs dropped")
+        self.web_server.metrics.write_snapshot()
+
+    def reap_workers(self):
+        """Exit ho chuke workers ko collect karein aur zarurat ho to restart karein"""
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.web_server.metrics.fold_snapshot(pid)
+            if pid == self.scanner_pid:
+                self.scanner_pid = None
+                if not self.stopping:
+                    print(f"🔄 Scanner (pid {pid}) exited with status {status}, restarting")
+                    self.spawn_scanner()
+                continue
+            index = self.children.pop(pid, None)
+            if index is not None and not self.stopping:
+                print(f"🔄 Worker {index} (pid {pid}) exited with status {status}, restarting")
+                self.spawn_worker(index)
+
+    def rolling_restart(self):
+        """Workers ko ek-ek karke replace karein taaki capacity bani rahe"""
+        # Scanner pehle - purana exit par trends save karta hai, naye workers wahi snapshot load karte hain.
+        # Naya scanner purani state file se generations continue karta hai
+        old_scanner, self.scanner_pid = self.scanner_pid, None
+        if old_scanner:
+            self.stop_worker(old_scanner)
+        self.spawn_scanner()
+        for old_pid, index in list(self.children.items()):
+            self.spawn_worker(index)
+            self.children.pop(old_pid, None)
+            self.stop_worker(old_pid)
+        print("🔄 Rolling restart complete")
+
+    def stop_worker(self, pid: int):
+        """Worker ko SIGTERM bhejein aur drain hone ka wait karein"""
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while time.monotonic() < deadline:
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if done:
+                break
+            time.sleep(0.1)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.web_server.metrics.fold_snapshot(pid)
+
+    def shutdown_workers(self):
+        """Sab workers (aur scanner) ko gracefully band karein"""
+        if self.scanner_pid:
+            self.children[self.scanner_pid] = -1
+            self.scanner_pid = None
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.children and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.children.clear()
+
+    def handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def handle_reload(self, signum, frame):
+        self.reloading = True
+
+    def handle_scan_request(self, signum, frame):
+        """Worker ki POST /api/scan scanner process tak forward karein"""
+        if self.scanner_pid:
+            try:
+                os.kill(self.scanner_pid, signal.SIGUSR1)
+            except ProcessLookupError:
+                pass
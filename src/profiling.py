@@ -0,0 +1,197 @@
+# src/profiling.py
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional
+
+# Active trace per thread - trace na ho to span() sirf ek thread-local lookup hai
+_local = threading.local()
+
+class _NullSpan:
+    """Profiling band ho to shared no-op context manager (koi allocation nahi)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("trace", "name", "start", "depth")
+
+    def __init__(self, trace: "Trace", name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.depth = self.trace.depth
+        self.trace.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.trace.depth -= 1
+        self.trace.spans.append((self.name, self.start, end, self.depth))
+        return False
+
+class Trace:
+    """Ek operation (CLI command ya HTTP request) ke saare spans"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: List[tuple] = []
+        self.depth = 0
+        self.thread_id = threading.get_ident()
+        self.wall_start = time.time()
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def finish(self):
+        if self.finished is None:
+            self.finished = time.perf_counter()
+
+    @property
+    def total_ms(self) -> float:
+        return ((self.finished or time.perf_counter()) - self.started) * 1000
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Stage-wise timing (same naam ke spans jude hue), first-seen order mein"""
+        stages: Dict[str, Dict[str, Any]] = {}
+        top_level = 0.0
+        for name, start, end, depth in sorted(self.spans, key=lambda span: span[1]):
+            stage = stages.setdefault(name, {"name": name, "ms": 0.0, "count": 0, "depth": depth})
+            stage["ms"] += (end - start) * 1000
+            stage["count"] += 1
+            stage["depth"] = min(stage["depth"], depth)
+            if depth == 0:
+                top_level += (end - start) * 1000
+        total = self.total_ms
+        for stage in stages.values():
+            stage["ms"] = round(stage["ms"], 3)
+        return {
+            "name": self.name,
+            "total_ms": round(total, 3),
+            # Kisi span mein nahi - framework, routing, glue code
+            "other_ms": round(max(total - top_level, 0.0), 3),
+            "stages": list(stages.values())
+        }
+
+    def server_timing(self) -> str:
+        """`Server-Timing` header value (browser devtools isse Timing tab mein dikhate hain)"""
+        breakdown = self.breakdown()
+        entries = [f"{_metric_name(stage['name'])};dur={stage['ms']:.2f}" for stage in breakdown["stages"]]
+        entries.append(f"other;dur={breakdown['other_ms']:.2f}")
+        entries.append(f"total;dur={breakdown['total_ms']:.2f}")
+        return ", ".join(entries)
+
+    def chrome_events(self) -> List[Dict[str, Any]]:
+        """Chrome trace 'complete' events (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+
+        def timestamp(value: float) -> float:
+            return round((self.wall_start + value - self.started) * 1e6, 1)
+
+        events = [{"name": self.name, "cat": "trace", "ph": "X", "pid": pid, "tid": self.thread_id,
+                   "ts": timestamp(self.started), "dur": round(self.total_ms * 1000, 1)}]
+        for name, start, end, depth in self.spans:
+            events.append({"name": name, "cat": "span", "ph": "X", "pid": pid, "tid": self.thread_id,
+                           "ts": timestamp(start), "dur": round((end - start) * 1e6, 1)})
+        return events
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.\-]", "_", name)
+
+def current_trace() -> Optional[Trace]:
+    return getattr(_local, "trace", None)
+
+def span(name: str):
+    """`with span("db.lookup"):` - active trace na ho to no-op"""
+    trace = getattr(_local, "trace", None)
+    return NULL_SPAN if trace is None else _Span(trace, name)
+
+def profiled(name: str) -> Callable:
+    """Function ko span mein wrap karein - disabled path par sirf ek thread-local check"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = getattr(_local, "trace", None)
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def start_trace(name: str) -> Trace:
+    """Current thread par naya trace activate karein (request hooks ke liye)"""
+    trace = Trace(name)
+    _local.trace = trace
+    return trace
+
+def end_trace() -> Optional[Trace]:
+    """Current thread ka trace band karke return karein"""
+    trace = getattr(_local, "trace", None)
+    _local.trace = None
+    if trace is not None:
+        trace.finish()
+    return trace
+
+@contextmanager
+def tracing(name: str) -> Iterator[Trace]:
+    """`with tracing("scan") as trace:` - block ke andar ke saare spans trace mein"""
+    previous = getattr(_local, "trace", None)
+    trace = Trace(name)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _local.trace = previous
+
+@contextmanager
+def cprofile(path: Optional[str]):
+    """path ho to block ko cProfile karein aur stats file likhein (`python -m pstats path`)"""
+    if not path:
+        yield None
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+def chrome_trace(traces: Iterable[Trace]) -> Dict[str, Any]:
+    return {"traceEvents": [event for trace in traces for event in trace.chrome_events()],
+            "displayTimeUnit": "ms"}
+
+def write_chrome_trace(traces: Iterable[Trace], path: str) -> str:
+    """Chrome trace JSON likhein (chrome://tracing ya ui.perfetto.dev mein kholein)"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(traces), f)
+    return path
+
+def format_breakdown(trace: Trace) -> str:
+    """CLI ke liye stage table"""
+    breakdown = trace.breakdown()
+    lines = [f"⏱️  {breakdown['name']}: {breakdown['total_ms']:.2f} ms"]
+    for stage in breakdown["stages"]:
+        label = "  " * (stage["depth"] + 1) + stage["name"]
+        count = f" x{stage['count']}" if stage["count"] > 1 else ""
+        lines.append(f"{label:<32}{stage['ms']:>10.2f} ms{count}")
+    lines.append(f"{'  other':<32}{breakdown['other_ms']:>10.2f} ms")
+    return "\n".join(lines)
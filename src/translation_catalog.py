@@ -0,0 +1,212 @@
+# src/translation_catalog.py
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, Optional
+
+# Binary catalog layout (little-endian, gettext .mo jaisa):
+#   header | language records | sorted key index | value table | string pool
+# Value table mein har language ke liye har key ka (offset, length) hai -
+# fallback (e.g. fr -> en) compile time par hi resolve ho jaata hai.
+MAGIC = b"BTAC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIII")     # magic, version, n_langs, n_keys, lang_off, key_off, value_off, pool_off
+LANG_RECORD = struct.Struct("<13I")      # code, name, body, gzip, br, etag (off, len) + present key count
+SPAN = struct.Struct("<II")              # (offset, length)
+MISSING = 0xFFFFFFFF
+
+DEFAULT_CATALOG_NAME = "catalog.bin"
+# Repo ka translations folder - working directory kahin bhi ho
+DEFAULT_LANG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "web_interface", "translations")
+
+def catalog_is_stale(lang_dir: str, path: str) -> bool:
+    """Koi *.json translation compiled catalog ke baad edit hui ho to True"""
+    try:
+        built_at = os.stat(path).st_mtime_ns
+        return any(entry.name.endswith(".json") and entry.stat().st_mtime_ns > built_at
+                   for entry in os.scandir(lang_dir))
+    except OSError:
+        return False
+
+class StringPool:
+    """Strings/blobs ko dedupe karke ek buffer mein jodein"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets: Dict[bytes, int] = {}
+
+    def add(self, data: Optional[bytes]):
+        if data is None:
+            return (MISSING, MISSING)
+        if data not in self.offsets:
+            self.offsets[data] = len(self.buffer)
+            self.buffer += data
+        return (self.offsets[data], len(data))
+
+def compile_catalog(lang_dir: str = DEFAULT_LANG_DIR, output_path: str = None) -> str:
+    """Saari *.json translations ko ek binary catalog mein pack karein"""
+    from language_manager import LanguageManager
+
+    output_path = output_path or os.path.join(lang_dir, DEFAULT_CATALOG_NAME)
+    manager = LanguageManager(lang_dir, use_compiled=False)
+    codes = sorted(manager.catalog)
+
+    keys = sorted({key.encode("utf-8") for bundle in manager.catalog.values() for key in bundle})
+    pool = StringPool()
+
+    lang_records = []
+    value_table = bytearray()
+    for code in codes:
+        bundle = manager.catalog[code]
+        rendered = manager.rendered_bundles[code]
+        spans = []
+        for span in (code.encode("utf-8"),
+                     manager.available_languages[code].encode("utf-8"),
+                     rendered["body"], rendered["gzip"], rendered["br"],
+                     rendered["etag"].encode("ascii")):
+            spans.extend(pool.add(span))
+        lang_records.append(LANG_RECORD.pack(*spans, len(bundle)))
+        for key in keys:
+            value = bundle.get(key.decode("utf-8"))
+            value_table += SPAN.pack(*pool.add(None if value is None else value.encode("utf-8")))
+
+    key_index = b"".join(SPAN.pack(*pool.add(key)) for key in keys)
+
+    lang_off = HEADER.size
+    key_off = lang_off + LANG_RECORD.size * len(codes)
+    value_off = key_off + len(key_index)
+    pool_off = value_off + len(value_table)
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(codes), len(keys), lang_off, key_off, value_off, pool_off))
+        f.write(b"".join(lang_records))
+        f.write(key_index)
+        f.write(value_table)
+        f.write(pool.buffer)
+    # Atomic replace - chal rahe workers purana mapping use karte rahenge
+    os.replace(tmp_path, output_path)
+    return output_path
+
+class MappedBundle(Mapping):
+    """Ek language ka read-only view - values mmap se on demand decode hoti hain"""
+
+    def __init__(self, catalog: "MappedCatalog", lang_index: int, size: int):
+        self.catalog = catalog
+        self.lang_index = lang_index
+        self.size = size
+
+    def __getitem__(self, key: str) -> str:
+        value = self.catalog.lookup_index(self.lang_index, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for key_index in range(self.catalog.n_keys):
+            if self.catalog.value_span(self.lang_index, key_index)[1] != MISSING:
+                yield self.catalog.key_at(key_index).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self.size
+
+class MappedCatalog:
+    """Memory-mapped binary catalog - sab worker processes same pages share karte hain"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.n_langs, self.n_keys,
+         self.lang_off, self.key_off, self.value_off, self.pool_off) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"Unsupported translation catalog: {path}")
+        self.view = memoryview(self.mm)
+        self.lang_indexes = {self.read_string(*self.lang_record(i)[0:2]): i
+                             for i in range(self.n_langs)}
+
+    def lang_record(self, lang_index: int):
+        return LANG_RECORD.unpack_from(self.mm, self.lang_off + lang_index * LANG_RECORD.size)
+
+    def blob(self, offset: int, length: int) -> Optional[memoryview]:
+        if offset == MISSING:
+            return None
+        start = self.pool_off + offset
+        return self.view[start:start + length]
+
+    def read_string(self, offset: int, length: int) -> str:
+        start = self.pool_off + offset
+        return self.mm[start:start + length].decode("utf-8")
+
+    def key_at(self, key_index: int) -> bytes:
+        offset, length = SPAN.unpack_from(self.mm, self.key_off + key_index * SPAN.size)
+        start = self.pool_off + offset
+        return self.mm[start:start + length]
+
+    def value_span(self, lang_index: int, key_index: int):
+        position = self.value_off + (lang_index * self.n_keys + key_index) * SPAN.size
+        return SPAN.unpack_from(self.mm, position)
+
+    def find_key(self, key: str) -> int:
+        """Sorted key index par binary search - O(log n), koi parse nahi"""
+        target = key.encode("utf-8")
+        low, high = 0, self.n_keys
+        while low < high:
+            middle = (low + high) // 2
+            current = self.key_at(middle)
+            if current < target:
+                low = middle + 1
+            elif current > target:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def lookup_index(self, lang_index: int, key: str) -> Optional[str]:
+        key_index = self.find_key(key)
+        if key_index < 0:
+            return None
+        offset, length = self.value_span(lang_index, key_index)
+        if length == MISSING:
+            return None
+        return self.read_string(offset, length)
+
+    def lookup(self, lang_code: str, key: str) -> Optional[str]:
+        """Ek translation lookup karein"""
+        lang_index = self.lang_indexes.get(lang_code)
+        return None if lang_index is None else self.lookup_index(lang_index, key)
+
+    def languages(self) -> Dict[str, str]:
+        """Language code -> display name"""
+        return {code: self.read_string(*self.lang_record(index)[2:4])
+                for code, index in self.lang_indexes.items()}
+
+    def bundles(self) -> Mapping:
+        """Har language ka lazy MappedBundle"""
+        return MappingProxyType({code: MappedBundle(self, index, self.lang_record(index)[12])
+                                 for code, index in self.lang_indexes.items()})
+
+    def rendered_bundles(self) -> Mapping:
+        """Pre-rendered API bodies - mmap ke zero-copy slices"""
+        rendered = {}
+        for code, index in self.lang_indexes.items():
+            record = self.lang_record(index)
+            rendered[code] = {
+                "body": self.blob(record[4], record[5]),
+                "gzip": self.blob(record[6], record[7]),
+                "br": self.blob(record[8], record[9]),
+                "etag": self.read_string(record[10], record[11])
+            }
+        return MappingProxyType(rendered)
+
+if __name__ == "__main__":
+    lang_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LANG_DIR
+    path = compile_catalog(lang_dir)
+    catalog = MappedCatalog(path)
+    print(f"✅ Compiled {catalog.n_langs} languages, {catalog.n_keys} keys -> {path} "
+          f"({os.path.getsize(path)} bytes)")
@@ -1,54 +1,584 @@
 # src/web_server.py
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response, send_from_directory, url_for, g
+import ipaddress
 import json
+import mimetypes
+import os
+import queue
+import signal
 import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
+from asset_builder import DIST_DIR_NAME, MANIFEST_NAME, load_manifest
+from device_registry import DeviceRegistry
+from device_trends import SAVE_INTERVAL, DeviceTrends, default_trends_path, trends_available
+from job_manager import JobManager
+from metrics import MetricsRegistry
+import profiling
+
 class WebServer:
-    def __init__(self, host='0.0.0.0', port=5000):
+    # Batch diagnosis limits
+    MAX_BATCH_DEVICES = 500
+    MAX_BATCH_BYTES = 1024 * 1024
+    # Long-poll ka maximum wait (seconds)
+    MAX_JOB_WAIT = 60.0
+    # Shutdown/rolling restart par in-flight requests aur fix jobs ka maximum wait (seconds)
+    GRACEFUL_TIMEOUT = 30.0
+    # Warm-up: har component ke attempts aur unke beech ka base backoff (seconds)
+    WARMUP_ATTEMPTS = 3
+    WARMUP_BACKOFF = 0.5
+    # Profiling: request header (sirf seedhe localhost clients ke liye) aur kitne recent traces yaad rahein
+    PROFILE_HEADER = "X-Profile"
+    MAX_PROFILE_TRACES = 200
+    # Pre-fork: scanner process state file itni der mein likhta hai aur workers itni der mein dekhte hain
+    SHARED_STATE_INTERVAL = 0.25
+    # Pre-fork: har process apna metrics snapshot itni der mein likhta hai
+    METRICS_SNAPSHOT_INTERVAL = 1.0
+    
+    def __init__(self, host='0.0.0.0', port=5000, background_load=True, scan_interval=10.0,
+                 ai_fixer_factory=None, profile=False, trends_path=None):
         self.app = Flask(__name__, 
                         template_folder='../web_interface',
                         static_folder='../web_interface')
         self.host = host
         self.port = port
         self.ai_fixer = None
+        # Fixer ka constructor override (e.g. load tests ke liye SimulatedBluetoothFixer)
+        self.ai_fixer_factory = ai_fixer_factory
+        self.device_database = None
         self.language_manager = None
         
+        # Startup readiness - /readyz tabhi green jab saare components warm ho jayein
+        self.started_at = time.time()
+        self.ready = threading.Event()
+        self.components = {name: {"status": "pending", "seconds": None, "attempts": 0, "error": None}
+                           for name in ("ai_fixer", "device_database", "language_manager")}
+        
+        # Background scanner ka latest snapshot - requests kabhi radio scan ka wait nahi karti
+        self.registry = DeviceRegistry()
+        self.scan_interval = scan_interval
+        self.scanner_stop = threading.Event()
+        self.scan_requested = threading.Event()
+        self.scanner_thread = None
+        self.last_scan_duration = None
+        self.scans_completed = 0
+        self.scanning = False
+        # Pre-fork mode: ek hi scanner process yeh file likhta hai, workers ise follow karte hain
+        self.shared_state_path = None
+        # Drain (SIGTERM/SIGHUP) - streaming responses isse dekh kar band hote hain
+        self.shutting_down = threading.Event()
+        # Per-device RSSI/battery history (har scan ka ek sample) - numpy na ho to None
+        # Daemon wali file aur interval se snapshot restarts ke paar rehta hai (pre-fork mein sirf scanner likhta hai)
+        self.trends_path = trends_path or default_trends_path()
+        self.trends = DeviceTrends.load(self.trends_path) if trends_available() else None
+        self.trends_saved_at = time.monotonic()
+        
+        # Fix jobs background pool par chalte hain
+        self.jobs = JobManager()
+        
+        # Fingerprinted, precompressed assets (python src/asset_builder.py se build)
+        self.assets_dir = os.path.join(self.app.static_folder, DIST_DIR_NAME)
+        self.asset_manifest: Dict[str, str] = {}
+        self.asset_variants: Dict[str, Dict[str, str]] = {}
+        self.asset_manifest_mtime = None
+        self.refresh_assets()
+        
+        self.metrics = MetricsRegistry()
+        self.setup_metrics()
+        # profile=True (--profile): har request trace hoti hai, warna sirf X-Profile header wali
+        self.profile = profile
+        self.profile_traces = deque(maxlen=self.MAX_PROFILE_TRACES)
+        self.setup_profiling()
         self.setup_routes()
-        self.load_dependencies()
+        if background_load:
+            self.load_dependencies()
     
     def load_dependencies(self):
         """Dependencies load karein background mein"""
-        def load():
+        threading.Thread(target=self.load_components, daemon=True).start()
+    
+    def load_components(self) -> bool:
+        """Fixer, database aur translations parallel mein warm karein - sab ready ho to True"""
+        started = time.perf_counter()
+        warmups = {
+            "ai_fixer": self.warm_ai_fixer,
+            "device_database": self.warm_device_database,
+            "language_manager": self.warm_language_manager
+        }
+        with ThreadPoolExecutor(max_workers=len(warmups), thread_name_prefix="warmup") as executor:
+            results = list(executor.map(self.warm_component, warmups.keys(), warmups.values()))
+        
+        total = time.perf_counter() - started
+        timings = ", ".join(f"{name} {info['seconds']:.3f}s" for name, info in self.components.items()
+                            if info["seconds"] is not None)
+        if all(results):
+            self.ready.set()
+            print(f"✅ Web server dependencies warmed in {total:.3f}s ({timings})")
+        else:
+            failed = [name for name, info in self.components.items() if info["status"] == "failed"]
+            print(f"❌ Warm-up failed for: {', '.join(failed)} - /readyz will stay unavailable")
+        return self.ready.is_set()
+    
+    def warm_component(self, name: str, warmup) -> bool:
+        """Ek component warm karein - failure par backoff ke saath retry"""
+        component = self.components[name]
+        component["status"] = "loading"
+        for attempt in range(1, self.WARMUP_ATTEMPTS + 1):
+            component["attempts"] = attempt
+            started = time.perf_counter()
             try:
-                from ai_bluetooth_fix import AIBluetoothFixer
-                from language_manager import LanguageManager
-                
-                self.ai_fixer = AIBluetoothFixer()
-                self.language_manager = LanguageManager()
-                print("✅ Web server dependencies loaded successfully")
+                warmup()
+                component.update(status="ready", seconds=time.perf_counter() - started, error=None)
+                return True
             except Exception as e:
-                print(f"❌ Dependency load error: {e}")
+                component.update(seconds=time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+                print(f"❌ {name} warm-up error (attempt {attempt}/{self.WARMUP_ATTEMPTS}): {e}")
+                if attempt == self.WARMUP_ATTEMPTS:
+                    traceback.print_exc()
+                else:
+                    time.sleep(self.WARMUP_BACKOFF * 2 ** (attempt - 1))
+        component["status"] = "failed"
+        return False
+    
+    def warm_ai_fixer(self):
+        """Fixer import karein aur rules ek sample device par chala kar warm karein"""
+        from ai_bluetooth_fix import AIBluetoothFixer
+        
+        fixer = (self.ai_fixer_factory or AIBluetoothFixer)()
+        # errors se error code knowledge base bhi load ho jaata hai
+        fixer.analyze_device({"name": "Warm-up Device", "signal_strength": -70, "battery_level": 50},
+                             errors=["Failed to connect: org.bluez.Error.Failed"])
+        self.ai_fixer = fixer
+    
+    def warm_device_database(self):
+        """Database load karein aur lookup indexes banayein"""
+        from device_database import DeviceDatabase
+        
+        database = DeviceDatabase()
+        database.get_device_info("00:00:00:00:00:00", "warm-up")
+        self.device_database = database
+    
+    def warm_language_manager(self):
+        """Translation catalog aur pre-rendered bundles load karein"""
+        from language_manager import LanguageManager, FALLBACK_LANGUAGE
+        
+        manager = LanguageManager()
+        if manager.get_rendered_bundle(FALLBACK_LANGUAGE) is None:
+            raise RuntimeError(f"Fallback language '{FALLBACK_LANGUAGE}' missing from translation catalog")
+        manager.format_text("devices_found_count", FALLBACK_LANGUAGE, count=0)
+        self.language_manager = manager
+    
+    def start_background_tasks(self):
+        """Per-process background tasks start karein (fork ke baad)"""
+        if self.shared_state_path:
+            # Pre-fork worker: radio scan sirf scanner process karta hai
+            if self.trends is not None:
+                # Master ka copy startup ka hai - restart ke baad scanner ka latest snapshot lein
+                self.trends = DeviceTrends.load(self.trends_path)
+            threading.Thread(target=self.follow_shared_state, daemon=True).start()
+        else:
+            self.start_scanner()
+    
+    def start_scanner(self):
+        """Background scanning loop start karein"""
+        if self.scanner_thread and self.scanner_thread.is_alive():
+            return
+        self.scanner_stop.clear()
+        self.scanner_thread = threading.Thread(target=self.scan_loop, daemon=True)
+        self.scanner_thread.start()
+    
+    def stop_scanner(self):
+        """Background scanning loop band karein"""
+        self.scanner_stop.set()
+        self.scan_requested.set()
+    
+    def begin_shutdown(self):
+        """Open SSE streams band karwayein - graceful drain unka 30s wait na kare"""
+        self.shutting_down.set()
+        self.registry.publish({"type": "shutdown", "generation": self.registry.generation})
+        self.jobs.close_waiters()
+    
+    def request_scan(self):
+        """Agla scan turant shuru karwayein"""
+        if self.shared_state_path:
+            # Master SIGUSR1 scanner process tak pahunchata hai
+            os.kill(os.getppid(), signal.SIGUSR1)
+        else:
+            self.scan_requested.set()
+    
+    def write_shared_state(self):
+        """Registry state atomically likhein (temp file + rename)"""
+        state = {
+            "registry": self.registry.export_state(),
+            "scans_completed": self.scans_completed,
+            "scanning": self.scanning,
+            "last_scan_duration": self.last_scan_duration
+        }
+        temp_path = f"{self.shared_state_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.shared_state_path)
+    
+    def read_shared_state(self):
+        try:
+            with open(self.shared_state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def run_shared_scanner(self):
+        """Pre-fork scanner process: scan karein aur state file likhein (SIGUSR1 = abhi scan, SIGTERM = stop)"""
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.scan_requested.set())
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop_scanner())
+        
+        if self.trends is not None:
+            # Master ka copy startup ka hai - purane scanner ka exit par save kiya snapshot lein
+            self.trends = DeviceTrends.load(self.trends_path)
+        # Restart ke baad generations wahin se aage badhein jahan purana scanner ruka tha
+        state = self.read_shared_state()
+        if state is not None:
+            self.registry.apply_state(state["registry"])
+            self.scans_completed = state["scans_completed"]
+        
+        def writer():
+            written = None
+            snapshot_at = 0.0
+            while True:
+                if time.monotonic() - snapshot_at >= self.METRICS_SNAPSHOT_INTERVAL:
+                    self.metrics.write_snapshot()
+                    snapshot_at = time.monotonic()
+                current = (self.registry.generation, self.scans_completed, self.scanning)
+                if current != written:
+                    try:
+                        self.write_shared_state()
+                        written = current
+                    except OSError as e:
+                        print(f"❌ Could not write scanner state: {e}")
+                if self.scanner_stop.wait(self.SHARED_STATE_INTERVAL):
+                    return
+        
+        writer_thread = threading.Thread(target=writer, daemon=True)
+        writer_thread.start()
+        self.scan_loop()
+        writer_thread.join()
+        self.write_shared_state()
+        self.save_trends()
+        self.metrics.write_snapshot()
+    
+    def follow_shared_state(self):
+        """Pre-fork worker: scanner ki state file badalte hi local registry update karein"""
+        last = None
+        snapshot_at = 0.0
+        while not self.scanner_stop.is_set():
+            if time.monotonic() - snapshot_at >= self.METRICS_SNAPSHOT_INTERVAL:
+                # Baaki workers ke /metrics ke liye is worker ke counters
+                self.metrics.write_snapshot()
+                snapshot_at = time.monotonic()
+            try:
+                stat = os.stat(self.shared_state_path)
+                key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            except FileNotFoundError:
+                key = None
+            if key is not None and key != last:
+                state = self.read_shared_state()
+                if state is not None:
+                    last = key
+                    self.apply_shared_state(state)
+            self.scanner_stop.wait(self.SHARED_STATE_INTERVAL)
+    
+    def apply_shared_state(self, state: Dict[str, Any]):
+        """Scanner ki state local registry, trends aur stream events mein lagayein"""
+        if state["scanning"] and not self.scanning:
+            self.registry.publish({"type": "scan_started", "generation": self.registry.generation})
+        self.scanning = state["scanning"]
+        self.registry.apply_state(state["registry"])
+        if state["scans_completed"] > self.scans_completed:
+            self.scans_completed = state["scans_completed"]
+            self.last_scan_duration = state["last_scan_duration"]
+            if self.trends is not None:
+                self.trends.record_many(self.registry.snapshot()["devices"])
+            if self.last_scan_duration is not None:
+                # Scan duration scanner process record karta hai - yahan dobara nahi (aggregate mein N guna hota)
+                self.registry.publish({
+                    "type": "scan_complete",
+                    "generation": self.registry.generation,
+                    "count": len(self.registry),
+                    "duration": round(self.last_scan_duration, 3)
+                })
+    
+    def save_trends(self):
+        """Trends snapshot disk par likhein (single process ya pre-fork scanner)"""
+        if self.trends is None:
+            return
+        try:
+            self.trends.save(self.trends_path)
+            self.trends_saved_at = time.monotonic()
+        except OSError as e:
+            print(f"❌ Could not save device trends: {e}")
+    
+    def device_trend(self, device_info: Dict[str, Any]):
+        """Device ka trend summary (diagnosis ke liye) - history na ho to None"""
+        mac = device_info.get('mac_address') if isinstance(device_info, dict) else None
+        if self.trends is None or not mac:
+            return None
+        return self.trends.summary(mac)
+    
+    def scan_loop(self):
+        """Periodically scan karke registry update karein"""
+        while not self.scanner_stop.is_set():
+            if self.ai_fixer:
+                try:
+                    if self.profile:
+                        with profiling.tracing("background scan") as trace:
+                            self.run_scan()
+                        self.profile_traces.append(trace)
+                    else:
+                        self.run_scan()
+                except Exception as e:
+                    print(f"❌ Background scan error: {e}")
+                self.scan_requested.wait(self.scan_interval)
+                self.scan_requested.clear()
+            else:
+                # AI system abhi load ho raha hai
+                self.scanner_stop.wait(0.2)
+    
+    def run_scan(self):
+        """Ek scan chalayein - har device milte hi registry (aur stream) mein jaata hai"""
+        started = time.monotonic()
+        self.scanning = True
+        self.registry.publish({"type": "scan_started", "generation": self.registry.generation})
+        seen = []
+        try:
+            with profiling.span("scan"):
+                for device in self.ai_fixer.iter_devices():
+                    seen.append(device["mac_address"])
+                    self.registry.upsert(device)
+                self.registry.retain(seen)
+        finally:
+            self.scanning = False
+        if self.trends is not None:
+            with profiling.span("trends"):
+                self.trends.record_many(self.registry.snapshot()["devices"])
+            if time.monotonic() - self.trends_saved_at >= SAVE_INTERVAL:
+                self.save_trends()
+        self.last_scan_duration = time.monotonic() - started
+        self.scans_completed += 1
+        self.metrics.observe("bluetooth_scan_duration_seconds", self.last_scan_duration)
+        self.registry.publish({
+            "type": "scan_complete",
+            "generation": self.registry.generation,
+            "count": len(seen),
+            "duration": round(self.last_scan_duration, 3)
+        })
+    
+    def setup_metrics(self):
+        """Metrics define karein aur har request ko time karein"""
+        m = self.metrics
+        m.describe("http_requests_total", "counter", "HTTP requests by route, method and status")
+        m.describe("http_request_errors_total", "counter", "HTTP 5xx responses by route")
+        m.describe("http_request_duration_seconds", "histogram",
+                   "Time to produce a response (streaming bodies excluded)")
+        m.describe("http_requests_started_total", "counter", "HTTP requests started")
+        m.describe("http_requests_finished_total", "counter", "HTTP requests finished")
+        m.describe("http_conditional_requests_total", "counter",
+                   "Conditional requests by route and result (hit = 304 Not Modified)")
+        m.describe("bluetooth_scan_duration_seconds", "histogram", "Background scan duration",
+                   buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0))
+        m.describe("diagnosis_duration_seconds", "histogram", "Diagnosis duration by mode")
+        
+        def in_flight():
+            data = m.collect_all()["counters"]
+            started = data.get(("http_requests_started_total", ()), 0)
+            finished = data.get(("http_requests_finished_total", ()), 0)
+            return {(): started - finished}
+        
+        m.register_gauge("http_requests_in_flight", "HTTP requests currently being handled", in_flight)
+        def fix_jobs():
+            # Shared store ho to saare workers ke jobs
+            counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+            for job in self.jobs.list_jobs(active_only=False):
+                counts[job["status"]] += 1
+            return {(("state", state),): count for state, count in counts.items()}
         
-        threading.Thread(target=load, daemon=True).start()
+        m.register_gauge("fix_jobs", "Fix jobs by state", fix_jobs)
+        m.register_gauge("registry_devices", "Devices in the current scan snapshot",
+                         lambda: {(): len(self.registry)})
+        m.register_gauge("startup_component_seconds", "Warm-up time per startup component",
+                         lambda: {(("component", name),): info["seconds"]
+                                  for name, info in self.components.items() if info["seconds"] is not None})
+        m.register_gauge("server_ready", "1 when all startup components are warm",
+                         lambda: {(): 1 if self.ready.is_set() else 0})
+        
+        @self.app.before_request
+        def start_timer():
+            g.request_started = time.perf_counter()
+            m.inc("http_requests_started_total")
+        
+        @self.app.after_request
+        def record_request(response):
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            elapsed = time.perf_counter() - g.get("request_started", time.perf_counter())
+            m.observe("http_request_duration_seconds", elapsed, (("route", route),))
+            m.inc("http_requests_total", (("route", route), ("method", request.method),
+                                          ("status", str(response.status_code))))
+            if response.status_code >= 500:
+                m.inc("http_request_errors_total", (("route", route),))
+            if request.if_none_match or request.if_modified_since:
+                result = "hit" if response.status_code == 304 else "miss"
+                m.inc("http_conditional_requests_total", (("route", route), ("result", result)))
+            return response
+        
+        @self.app.teardown_request
+        def finish_request(exc):
+            m.inc("http_requests_finished_total")
+    
+    def profile_requested(self) -> bool:
+        """X-Profile header sirf localhost se maana jaaye - bahar ka client tracing/stage timings na khol sake"""
+        if not request.headers.get(self.PROFILE_HEADER):
+            return False
+        # Reverse proxy ke peeche har request loopback se aati hai - forwarded requests local nahi
+        if request.headers.get("X-Forwarded-For") or request.headers.get("Forwarded"):
+            return False
+        try:
+            return ipaddress.ip_address(request.remote_addr or "").is_loopback
+        except ValueError:
+            return False
+    
+    def setup_profiling(self):
+        """Traced requests (--profile ya localhost ka X-Profile) ko per-stage Server-Timing header milta hai"""
+        
+        @self.app.before_request
+        def start_trace():
+            if self.profile or self.profile_requested():
+                route = request.url_rule.rule if request.url_rule else request.path
+                profiling.start_trace(f"{request.method} {route}")
+        
+        @self.app.after_request
+        def add_server_timing(response):
+            trace = profiling.end_trace()
+            if trace is not None:
+                response.headers["Server-Timing"] = trace.server_timing()
+                if self.profile:
+                    self.profile_traces.append(trace)
+            return response
+        
+        @self.app.teardown_request
+        def clear_trace(exc):
+            # Exception par after_request nahi chalta - thread ka trace agli request mein na jaaye
+            profiling.end_trace()
+    
+    def refresh_assets(self):
+        """manifest.json badla ho (update.sh ne rebuild kiya) to manifest aur variants reload karein"""
+        try:
+            mtime = os.stat(os.path.join(self.assets_dir, MANIFEST_NAME)).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self.asset_manifest_mtime:
+            return
+        self.asset_manifest_mtime = mtime
+        # Variants pehle - naye manifest ka har naam serve ho sake
+        self.asset_variants = self.index_asset_variants()
+        self.asset_manifest = load_manifest(self.app.static_folder)
+    
+    def index_asset_variants(self) -> Dict[str, Dict[str, str]]:
+        """dist/ ke har hashed asset (pichhle builds ke bhi) ke available encodings dhundhein"""
+        try:
+            filenames = set(os.listdir(self.assets_dir))
+        except OSError:
+            return {}
+        variants = {}
+        for hashed in filenames:
+            if hashed.endswith((".gz", ".br", ".json", ".tmp")):
+                continue
+            available = {"identity": hashed}
+            for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+                if hashed + suffix in filenames:
+                    available[encoding] = hashed + suffix
+            variants[hashed] = available
+        return variants
+    
+    def asset_url(self, name: str) -> str:
+        """Template ke liye asset URL - build ho to hashed, warna plain static"""
+        self.refresh_assets()
+        hashed = self.asset_manifest.get(name)
+        if hashed:
+            return f"/assets/{hashed}"
+        return url_for('static', filename=name)
     
     def setup_routes(self):
         """Web routes setup karein"""
         
+        @self.app.context_processor
+        def inject_asset_url():
+            return {"asset_url": self.asset_url}
+        
         @self.app.route('/')
         def index():
-            return render_template('index.html')
+            response = self.app.make_response(render_template('index.html'))
+            # HTML chhota hai aur hashed asset URLs rakhta hai - hamesha revalidate
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        
+        @self.app.route('/assets/<filename>')
+        def get_asset(filename):
+            """Hashed asset ka best precompressed variant serve karein"""
+            variants = self.asset_variants.get(filename)
+            if variants is None:
+                # Naya build jo is process ne abhi tak nahi dekha
+                self.refresh_assets()
+                variants = self.asset_variants.get(filename)
+            if variants is None:
+                return jsonify({
+                    "success": False,
+                    "error": "Asset not found"
+                }), 404
+            
+            encoding = "identity"
+            for candidate in ("br", "gzip"):
+                if candidate in variants and request.accept_encodings[candidate]:
+                    encoding = candidate
+                    break
+            
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response = send_from_directory(self.assets_dir, variants[encoding],
+                                           mimetype=mimetype, max_age=31536000)
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+            response.headers["Vary"] = "Accept-Encoding"
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+            return response
         
         @self.app.route('/api/devices', methods=['GET'])
         def get_devices():
             try:
                 if self.ai_fixer:
-                    devices = self.ai_fixer.scan_devices()
-                    return jsonify({
-                        "success": True,
-                        "devices": devices,
-                        "count": len(devices)
-                    })
+                    since = request.args.get('since', type=int)
+                    with profiling.span("registry"):
+                        if since is not None:
+                            data = self.registry.changes_since(since)
+                        else:
+                            data = self.registry.snapshot()
+                    
+                    # Delta body ka ETag nahi - snapshot ETag reuse hone par plain GET galat 304 deta
+                    etag = data.pop("etag", None)
+                    if etag and request.if_none_match.contains(etag):
+                        return Response(status=304, headers={"ETag": f'"{etag}"'})
+                    
+                    with profiling.span("serialize"):
+                        response = jsonify({
+                            "success": True,
+                            "count": len(self.registry),
+                            "scan_pending": self.last_scan_duration is None,
+                            **data
+                        })
+                    if etag:
+                        response.set_etag(etag)
+                    response.headers["Cache-Control"] = "no-cache"
+                    return response
                 else:
                     return jsonify({
                         "success": False,
@@ -60,18 +590,89 @@ class WebServer:
                     "error": str(e)
                 }), 500
         
+        @self.app.route('/api/devices/stream', methods=['GET'])
+        def stream_devices():
+            """Server-Sent Events - har discovered/changed device turant push hota hai"""
+            if not self.ai_fixer:
+                return jsonify({
+                    "success": False,
+                    "error": "AI system not ready"
+                }), 503
+            
+            last_event_id = request.headers.get('Last-Event-ID', type=int)
+            
+            def sse(event_type, generation, data):
+                return f"event: {event_type}\nid: {generation}\ndata: {json.dumps(data)}\n\n"
+            
+            def generate():
+                # Pehle subscribe, phir snapshot - beech ke changes miss nahi honge
+                events = self.registry.subscribe()
+                try:
+                    if last_event_id is not None:
+                        data = self.registry.changes_since(last_event_id)
+                    else:
+                        data = self.registry.snapshot()
+                    data.pop("etag", None)
+                    data["scan_pending"] = self.last_scan_duration is None
+                    yield sse("snapshot", data["generation"], data)
+                    
+                    while not self.shutting_down.is_set():
+                        try:
+                            event = events.get(timeout=15)
+                        except queue.Empty:
+                            yield ": keepalive\n\n"
+                            continue
+                        if event["type"] == "shutdown":
+                            # Client (EventSource) Last-Event-ID ke saath doosre worker par reconnect karega
+                            return
+                        if event["type"] == "resync":
+                            data = self.registry.snapshot()
+                            data.pop("etag", None)
+                            yield sse("snapshot", data["generation"], data)
+                        else:
+                            yield sse(event["type"], event["generation"], event)
+                finally:
+                    self.registry.unsubscribe(events)
+            
+            return Response(generate(), mimetype='text/event-stream', headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"
+            })
+        
+        @self.app.route('/api/scan', methods=['POST'])
+        def trigger_scan():
+            """Background scanner ko turant scan karne ko kahein"""
+            if not self.ai_fixer:
+                return jsonify({
+                    "success": False,
+                    "error": "AI system not ready"
+                }), 503
+            self.request_scan()
+            return jsonify({
+                "success": True,
+                "generation": self.registry.generation
+            }), 202
+        
         @self.app.route('/api/diagnose', methods=['POST'])
         def diagnose_device():
             try:
-                data = request.json
+                with profiling.span("request.parse"):
+                    data = request.json
                 device_info = data.get('device', {})
                 
                 if self.ai_fixer:
-                    diagnosis = self.ai_fixer.diagnose_device(device_info)
-                    return jsonify({
-                        "success": True,
-                        "diagnosis": diagnosis
-                    })
+                    started = time.perf_counter()
+                    with profiling.span("trends"):
+                        trend = self.device_trend(device_info)
+                    # Client ke captured error lines (bluetoothctl output, btmon log) optional hain
+                    diagnosis = self.ai_fixer.diagnose_device(device_info, trend, data.get('errors'))
+                    self.metrics.observe("diagnosis_duration_seconds", time.perf_counter() - started,
+                                         (("mode", "single"),))
+                    with profiling.span("serialize"):
+                        return jsonify({
+                            "success": True,
+                            "diagnosis": diagnosis
+                        })
                 else:
                     return jsonify({
                         "success": False,
@@ -84,19 +685,134 @@ class WebServer:
                     "error": str(e)
                 }), 500
         
+        @self.app.route('/api/devices/<mac>/trends', methods=['GET'])
+        def device_trends(mac):
+            """Device ki RSSI/battery rolling statistics (?window=N sirf aakhri N samples)"""
+            if self.trends is None:
+                return jsonify({
+                    "success": False,
+                    "error": "Device trends unavailable (numpy not installed)"
+                }), 501
+            trend = self.trends.summary(mac, request.args.get('window', type=int))
+            if trend is None:
+                return jsonify({
+                    "success": False,
+                    "error": f"No samples recorded for {mac}"
+                }), 404
+            return jsonify({
+                "success": True,
+                "mac_address": mac,
+                "trend": trend
+            })
+        
+        @self.app.route('/api/diagnose/batch', methods=['POST'])
+        def diagnose_batch():
+            """Bahut saare devices ek call mein diagnose karein - results NDJSON stream"""
+            if not self.ai_fixer:
+                return jsonify({
+                    "success": False,
+                    "error": "AI system not ready"
+                }), 503
+            
+            if (request.content_length or 0) > self.MAX_BATCH_BYTES:
+                return jsonify({
+                    "success": False,
+                    "error": f"Request body exceeds {self.MAX_BATCH_BYTES} bytes"
+                }), 413
+            
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({
+                    "success": False,
+                    "error": "Expected a JSON object with 'devices' or 'macs'"
+                }), 400
+            
+            if "macs" in data:
+                # Current snapshot se devices lein
+                items = data.get("macs")
+                if not isinstance(items, list):
+                    items = None
+                else:
+                    items = [self.registry.get(mac) if isinstance(mac, str) else None
+                             for mac in items]
+            else:
+                items = data.get("devices")
+                if not isinstance(items, list):
+                    items = None
+            
+            if items is None:
+                return jsonify({
+                    "success": False,
+                    "error": "'devices' or 'macs' must be a list"
+                }), 400
+            if len(items) > self.MAX_BATCH_DEVICES:
+                return jsonify({
+                    "success": False,
+                    "error": f"Batch exceeds {self.MAX_BATCH_DEVICES} devices"
+                }), 413
+            
+            macs = data.get("macs") if "macs" in data else None
+            
+            def generate():
+                errors = 0
+                started = time.perf_counter()
+                for result in self.ai_fixer.diagnose_devices(items, self.device_trend):
+                    index = result["index"]
+                    if macs is not None:
+                        result["mac_address"] = macs[index]
+                        if items[index] is None:
+                            result = {
+                                "index": index,
+                                "mac_address": macs[index],
+                                "success": False,
+                                "error": "Device not found in current snapshot"
+                            }
+                    elif isinstance(items[index], dict):
+                        result["mac_address"] = items[index].get("mac_address")
+                    if not result["success"]:
+                        errors += 1
+                    yield json.dumps(result) + "\n"
+                self.metrics.observe("diagnosis_duration_seconds", time.perf_counter() - started,
+                                     (("mode", "batch"),))
+                yield json.dumps({"done": True, "count": len(items), "errors": errors}) + "\n"
+            
+            return Response(generate(), mimetype='application/x-ndjson')
+        
         @self.app.route('/api/fix', methods=['POST'])
         def apply_fix():
+            """Fix job queue karein - 202 ke saath job ID turant return"""
             try:
                 data = request.json
                 fix_action = data.get('fix_action')
                 device_info = data.get('device', {})
                 
-                if self.ai_fixer:
-                    result = self.ai_fixer.apply_fix(fix_action, device_info)
+                if not fix_action:
+                    return jsonify({
+                        "success": False,
+                        "error": "fix_action is required"
+                    }), 400
+                
+                if self.shutting_down.is_set():
                     return jsonify({
+                        "success": False,
+                        "error": "Server is shutting down"
+                    }), 503
+                
+                if self.ai_fixer:
+                    try:
+                        job = self.jobs.submit(fix_action, device_info, self.ai_fixer.apply_fix)
+                    except RuntimeError as e:
+                        # Drain submit ke beech shuru hua
+                        return jsonify({"success": False, "error": str(e)}), 503
+                    response = jsonify({
                         "success": True,
-                        "result": result
+                        "job_id": job["id"],
+                        "status": job["status"],
+                        "status_url": f"/api/jobs/{job['id']}"
                     })
+                    response.status_code = 202
+                    response.headers["Location"] = f"/api/jobs/{job['id']}"
+                    return response
                 else:
                     return jsonify({
                         "success": False, 
@@ -109,6 +825,62 @@ class WebServer:
                     "error": str(e)
                 }), 500
         
+        @self.app.route('/api/jobs', methods=['GET'])
+        def list_jobs():
+            """Active fix jobs ki list (?all=1 se finished bhi)"""
+            active_only = request.args.get('all') not in ('1', 'true')
+            jobs = self.jobs.list_jobs(active_only=active_only)
+            return jsonify({
+                "success": True,
+                "jobs": jobs,
+                "count": len(jobs)
+            })
+        
+        @self.app.route('/api/jobs/<job_id>', methods=['GET'])
+        def get_job(job_id):
+            """Job status aur logs - ?wait=<seconds> se long-poll"""
+            wait = min(request.args.get('wait', default=0, type=float), self.MAX_JOB_WAIT)
+            if wait > 0:
+                after = request.args.get('version', default=-1, type=int)
+                job = self.jobs.wait(job_id, wait, after_version=after)
+            else:
+                job = self.jobs.get(job_id)
+            
+            if job is None:
+                return jsonify({
+                    "success": False,
+                    "error": f"Job {job_id} not found"
+                }), 404
+            return jsonify({
+                "success": True,
+                "job": job
+            })
+        
+        @self.app.route('/api/jobs/<job_id>/events', methods=['GET'])
+        def stream_job(job_id):
+            """Job progress SSE se - finish hone par stream band"""
+            job = self.jobs.get(job_id)
+            if job is None:
+                return jsonify({
+                    "success": False,
+                    "error": f"Job {job_id} not found"
+                }), 404
+            
+            def generate():
+                current = job
+                while True:
+                    yield f"event: job\nid: {current['version']}\ndata: {json.dumps(current)}\n\n"
+                    if self.jobs.is_finished(current):
+                        return
+                    current = self.jobs.wait(job_id, 15, after_version=current["version"])
+                    if current is None or self.shutting_down.is_set():
+                        return
+            
+            return Response(generate(), mimetype='text/event-stream', headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"
+            })
+        
         @self.app.route('/api/languages', methods=['GET'])
         def get_languages():
             try:
@@ -117,7 +889,8 @@ class WebServer:
                     return jsonify({
                         "success": True,
                         "languages": languages,
-                        "current": self.language_manager.get_current_language()
+                        "current": self.language_manager.get_current_language(),
+                        "versions": self.language_manager.get_bundle_versions()
                     })
                 else:
                     return jsonify({
@@ -134,20 +907,38 @@ class WebServer:
         def get_translations(lang_code):
             try:
                 if self.language_manager:
-                    success = self.language_manager.set_language(lang_code)
-                    if success:
-                        translations = self.language_manager.translations
-                        return jsonify({
-                            "success": True,
-                            "language": lang_code,
-                            "translations": translations,
-                            "is_rtl": self.language_manager.is_rtl(lang_code)
-                        })
-                    else:
+                    # Pre-serialized bytes - per-request koi JSON encoding ya compression nahi
+                    rendered = self.language_manager.get_rendered_bundle(lang_code)
+                    if rendered is None:
                         return jsonify({
                             "success": False,
                             "error": f"Language {lang_code} not available"
                         }), 404
+                    
+                    etag = rendered["etag"]
+                    if request.args.get('v') == etag:
+                        # Content-hashed URL kabhi nahi badalta
+                        cache_control = "public, max-age=31536000, immutable"
+                    else:
+                        cache_control = "public, no-cache"
+                    headers = {
+                        "ETag": f'"{etag}"',
+                        "Cache-Control": cache_control,
+                        "Vary": "Accept-Encoding"
+                    }
+                    
+                    if request.if_none_match.contains(etag):
+                        return Response(status=304, headers=headers)
+                    
+                    body = rendered["body"]
+                    for encoding in ("br", "gzip"):
+                        if rendered[encoding] and request.accept_encodings[encoding]:
+                            body = rendered[encoding]
+                            headers["Content-Encoding"] = encoding
+                            break
+                    
+                    # Compiled catalog mmap slice deta hai - WSGI ko bytes chahiye (chhota transient copy)
+                    return Response(bytes(body), mimetype="application/json", headers=headers)
                 else:
                     return jsonify({
                         "success": False,
@@ -159,10 +950,45 @@ class WebServer:
                     "error": str(e)
                 }), 500
         
+        @self.app.route('/metrics', methods=['GET'])
+        def get_metrics():
+            """Prometheus text format metrics"""
+            return Response(self.metrics.render(), mimetype="text/plain; version=0.0.4")
+        
+        @self.app.route('/api/profile/trace', methods=['GET'])
+        def profile_trace():
+            """Recent request traces Chrome trace format mein (sirf --profile ke saath)"""
+            if not self.profile:
+                return jsonify({
+                    "success": False,
+                    "error": "Profiling is disabled (start the server with --profile)"
+                }), 404
+            return jsonify(profiling.chrome_trace(list(self.profile_traces)))
+        
+        @self.app.route('/healthz', methods=['GET'])
+        def healthz():
+            """Liveness - process chal raha hai aur requests serve kar raha hai"""
+            return jsonify({"status": "ok", "uptime": round(time.time() - self.started_at, 3)})
+        
+        @self.app.route('/readyz', methods=['GET'])
+        def readyz():
+            """Readiness - warm-up complete hone tak 503 (load balancer traffic na bheje)"""
+            ready = self.ready.is_set()
+            response = jsonify({
+                "status": "ready" if ready else "starting",
+                "components": self.components
+            })
+            response.status_code = 200 if ready else 503
+            response.headers["Cache-Control"] = "no-store"
+            if not ready:
+                response.headers["Retry-After"] = "1"
+            return response
+        
         @self.app.route('/api/status', methods=['GET'])
         def get_status():
             """System status return karein"""
             status = {
+                "ready": self.ready.is_set(),
                 "ai_system": self.ai_fixer is not None,
                 "language_system": self.language_manager is not None,
                 "available_languages": self.language_manager.get_available_languages() if self.language_manager else {},
@@ -170,14 +996,29 @@ class WebServer:
             }
             return jsonify(status)
     
-    def run(self):
+    @staticmethod
+    def raise_interrupt():
+        raise KeyboardInterrupt
+    
+    def run(self, workers=1, reuse_port=False):
         """Web server run karein"""
+        if workers > 1:
+            from prefork_server import PreforkServer
+            print(f"🌐 Starting Bluetooth AI Fix Master Web Server ({workers} workers)...")
+            print(f"📍 Server running on: http://{self.host}:{self.port}")
+            PreforkServer(self, workers=workers, reuse_port=reuse_port).run()
+            return
+        
         print(f"🌐 Starting Bluetooth AI Fix Master Web Server...")
         print(f"📍 Server running on: http://{self.host}:{self.port}")
         print(f"📱 Web Interface: http://{self.host}:{self.port}/")
         print(f"🔧 API Status: http://{self.host}:{self.port}/api/status")
         print("\nPress Ctrl+C to stop the server")
         
+        if threading.current_thread() is threading.main_thread():
+            # SIGTERM (systemd stop) bhi Ctrl+C jaisa - trends save aur fix jobs drain hon
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.raise_interrupt())
+        self.start_background_tasks()
         try:
             self.app.run(
                 host=self.host,
@@ -189,6 +1030,12 @@ class WebServer:
             print("\n🛑 Server stopped by user")
         except Exception as e:
             print(f"❌ Server error: {e}")
+        finally:
+            self.save_trends()
+            # Accepted (202) fix jobs ko khatam hone dein
+            self.begin_shutdown()
+            if not self.jobs.shutdown(self.GRACEFUL_TIMEOUT):
+                print("⚠️ Drain timeout, unfinished fix jobs dropped")
 
 if __name__ == "__main__":
     server = WebServer()
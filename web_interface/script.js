@@ -6,11 +6,15 @@ class BluetoothAIWebApp {
         this.currentMode = 'online';
         this.currentLanguage = 'en';
         this.isScanning = false;
+        this.deviceStream = null;
+        this.lastDiagnosis = null;
+        this.translationVersions = {};
         
         this.initializeApp();
     }
 
     async initializeApp() {
+        await this.loadTranslationVersions();
         await this.loadTranslations('en');
         this.updateUI();
         this.checkServerStatus();
@@ -53,9 +57,24 @@ class BluetoothAIWebApp {
         statusElement.className = `status-${status}`;
     }
 
+    async loadTranslationVersions() {
+        // Content-hashed URLs browser cache se bina revalidation ke serve hote hain
+        try {
+            const response = await fetch('/api/languages');
+            const data = await response.json();
+            if (data.success) {
+                this.translationVersions = data.versions || {};
+            }
+        } catch (error) {
+            console.error('Language list error:', error);
+        }
+    }
+
     async loadTranslations(langCode) {
         try {
-            const response = await fetch(`/api/translations/${langCode}`);
+            const version = this.translationVersions[langCode];
+            const url = version ? `/api/translations/${langCode}?v=${version}` : `/api/translations/${langCode}`;
+            const response = await fetch(url);
             const data = await response.json();
             
             if (data.success) {
@@ -125,6 +144,86 @@ class BluetoothAIWebApp {
         }
     }
 
+    formatMessage(key, params = {}) {
+        // Bundle ICU templates bhejta hai - src/message_format.py wala subset yahan render karein
+        const template = this.translations && this.translations[key];
+        if (!template) {
+            return null;
+        }
+        try {
+            const rules = new Intl.PluralRules(this.currentLanguage);
+            return this.renderMessage(template, 0, params, rules, null)[0];
+        } catch (error) {
+            console.error(`Invalid message template '${key}':`, error);
+            return template;
+        }
+    }
+
+    renderMessage(text, pos, params, rules, number) {
+        // "{name}", "{n, plural, =0 {...} one {# ...} other {...}}" - plural branch mein "#" = number
+        let out = '';
+        while (pos < text.length && text[pos] !== '}') {
+            if (text[pos] === '#' && number !== null) {
+                out += String(number);
+                pos += 1;
+            } else if (text[pos] === '{') {
+                const [value, next] = this.renderArgument(text, pos + 1, params, rules);
+                out += value;
+                pos = next;
+            } else {
+                out += text[pos];
+                pos += 1;
+            }
+        }
+        return [out, pos];
+    }
+
+    renderArgument(text, pos, params, rules) {
+        const match = /^\s*([\w.]+)\s*(,\s*plural\s*,)?/.exec(text.slice(pos));
+        if (!match) {
+            throw new Error(`Bad placeholder in ${text}`);
+        }
+        const name = match[1];
+        pos += match[0].length;
+        if (!match[2]) {
+            if (text[pos] !== '}') {
+                throw new Error(`Unsupported argument in ${text}`);
+            }
+            return [name in params ? String(params[name]) : `{${name}}`, pos + 1];
+        }
+
+        const value = Number(params[name] ?? 0);
+        const branches = {};
+        while (true) {
+            while (pos < text.length && /\s/.test(text[pos])) {
+                pos += 1;
+            }
+            if (pos >= text.length) {
+                throw new Error(`Unterminated plural in ${text}`);
+            }
+            if (text[pos] === '}') {
+                break;
+            }
+            const brace = text.indexOf('{', pos);
+            if (brace < 0) {
+                throw new Error(`Plural selector without branch in ${text}`);
+            }
+            const selector = text.slice(pos, brace).trim();
+            const [branch, end] = this.renderMessage(text, brace + 1, params, rules, value);
+            if (text[end] !== '}') {
+                throw new Error(`Unterminated plural branch in ${text}`);
+            }
+            branches[selector] = branch;
+            pos = end + 1;
+        }
+        const chosen = branches[`=${value}`] ?? branches[rules.select(value)] ?? branches.other;
+        return [chosen, pos + 1];
+    }
+
+    devicesFoundText(count) {
+        return this.formatMessage('devices_found_count', { count }) || `Found ${count} devices`;
+    }
+
     updateUI() {
         // Devices count update karein
         document.getElementById('devicesCount').textContent = this.devices.length;
@@ -139,6 +238,82 @@ class BluetoothAIWebApp {
     async scanDevices() {
         if (this.isScanning) return;
         
+        if (!window.EventSource) {
+            return this.fetchDevices();
+        }
+        
+        this.isScanning = true;
+        document.getElementById('scanBtn').disabled = true;
+        document.getElementById('scanLoading').style.display = 'flex';
+        document.getElementById('scanResultsContent').innerHTML = '';
+        
+        try {
+            this.openDeviceStream();
+            const response = await fetch('/api/scan', { method: 'POST' });
+            if (!response.ok) {
+                const data = await response.json();
+                throw new Error(data.error);
+            }
+        } catch (error) {
+            console.error('Scan error:', error);
+            this.showToast('❌ Device scan failed', 'error');
+            this.finishScan();
+        }
+    }
+
+    openDeviceStream() {
+        // Stream ek baar khulta hai, devices aate hi cards update hote hain
+        if (this.deviceStream) return;
+        
+        this.deviceStream = new EventSource('/api/devices/stream');
+        
+        this.deviceStream.addEventListener('snapshot', (e) => {
+            const data = JSON.parse(e.data);
+            if (data.full === false) {
+                data.devices.forEach(device => this.upsertDevice(device));
+                data.removed.forEach(mac => this.removeDevice(mac));
+            } else {
+                this.devices = data.devices;
+                this.displayDevices();
+            }
+            this.updateUI();
+        });
+        
+        this.deviceStream.addEventListener('device', (e) => {
+            this.upsertDevice(JSON.parse(e.data).device);
+            this.updateUI();
+        });
+        
+        this.deviceStream.addEventListener('removed', (e) => {
+            this.removeDevice(JSON.parse(e.data).mac_address);
+            this.updateUI();
+        });
+        
+        this.deviceStream.addEventListener('scan_complete', (e) => {
+            if (this.isScanning) {
+                const data = JSON.parse(e.data);
+                this.showToast(`✅ ${this.devicesFoundText(data.count)}`, 'success');
+                this.finishScan();
+            }
+        });
+        
+        this.deviceStream.onerror = () => {
+            // EventSource khud reconnect karta hai (Last-Event-ID ke saath)
+            if (this.deviceStream.readyState === EventSource.CLOSED) {
+                this.deviceStream = null;
+                this.finishScan();
+            }
+        };
+    }
+
+    finishScan() {
+        this.isScanning = false;
+        document.getElementById('scanBtn').disabled = false;
+        document.getElementById('scanLoading').style.display = 'none';
+        this.updateUI();
+    }
+
+    async fetchDevices() {
         this.isScanning = true;
         const scanBtn = document.getElementById('scanBtn');
         const scanLoading = document.getElementById('scanLoading');
@@ -156,7 +331,7 @@ class BluetoothAIWebApp {
             if (data.success) {
                 this.devices = data.devices;
                 this.displayDevices();
-                this.showToast(`✅ Found ${data.count} devices`, 'success');
+                this.showToast(`✅ ${this.devicesFoundText(data.count)}`, 'success');
             } else {
                 throw new Error(data.error);
             }
@@ -167,10 +342,7 @@ class BluetoothAIWebApp {
             this.devices = this.getDemoDevices();
             this.displayDevices();
         } finally {
-            this.isScanning = false;
-            scanBtn.disabled = false;
-            scanLoading.style.display = 'none';
-            this.updateUI();
+            this.finishScan();
         }
     }
 
@@ -200,28 +372,64 @@ class BluetoothAIWebApp {
         devicesList.innerHTML = '';
         
         this.devices.forEach(device => {
-            const deviceCard = document.createElement('div');
-            deviceCard.className = 'device-card';
-            deviceCard.dataset.mac = device.mac_address;
-            
-            deviceCard.innerHTML = `
-                <div class="device-info">
-                    <div class="device-name">${device.name}</div>
-                    <div class="device-mac">${device.mac_address}</div>
-                    <div class="device-type">${device.device_type}</div>
-                </div>
-                <div class="device-status">
-                    <span class="status-${device.connected ? 'connected' : 'available'}">
-                        ${device.connected ? 'Connected' : 'Available'}
-                    </span>
-                    <span class="signal-strength">${device.signal_strength} dBm</span>
-                </div>
-            `;
-            
-            devicesList.appendChild(deviceCard);
+            devicesList.appendChild(this.createDeviceCard(device));
         });
     }
 
+    createDeviceCard(device) {
+        const deviceCard = document.createElement('div');
+        deviceCard.className = 'device-card';
+        deviceCard.dataset.mac = device.mac_address;
+        
+        deviceCard.innerHTML = `
+            <div class="device-info">
+                <div class="device-name">${device.name}</div>
+                <div class="device-mac">${device.mac_address}</div>
+                <div class="device-type">${device.device_type}</div>
+            </div>
+            <div class="device-status">
+                <span class="status-${device.connected ? 'connected' : 'available'}">
+                    ${device.connected ? 'Connected' : 'Available'}
+                </span>
+                <span class="signal-strength">${device.signal_strength} dBm</span>
+            </div>
+        `;
+        
+        return deviceCard;
+    }
+
+    upsertDevice(device) {
+        // Sirf badla hua card replace karein, poori list nahi
+        const index = this.devices.findIndex(d => d.mac_address === device.mac_address);
+        if (index >= 0) {
+            this.devices[index] = device;
+        } else {
+            this.devices.push(device);
+        }
+        
+        const devicesList = document.getElementById('devicesList');
+        const card = this.createDeviceCard(device);
+        const existing = devicesList.querySelector(`.device-card[data-mac="${device.mac_address}"]`);
+        if (existing) {
+            if (existing.classList.contains('selected')) {
+                card.classList.add('selected');
+                this.selectedDevice = device;
+                this.displayDeviceInfo();
+            }
+            existing.replaceWith(card);
+        } else {
+            devicesList.appendChild(card);
+        }
+    }
+
+    removeDevice(mac) {
+        this.devices = this.devices.filter(d => d.mac_address !== mac);
+        const card = document.querySelector(`.device-card[data-mac="${mac}"]`);
+        if (card) {
+            card.remove();
+        }
+    }
+
     selectDevice(deviceCard) {
         // Previous selection clear karein
         document.querySelectorAll('.device-card').forEach(card => {
@@ -301,6 +509,7 @@ class BluetoothAIWebApp {
             const data = await response.json();
             
             if (data.success) {
+                this.lastDiagnosis = data.diagnosis;
                 this.displayDiagnosisResults(data.diagnosis);
                 this.showToast('✅ AI diagnosis completed', 'success');
             } else {
@@ -404,24 +613,56 @@ class BluetoothAIWebApp {
         fixBtn.disabled = true;
 
         try {
-            // Demo fix simulation
-            await new Promise(resolve => setTimeout(resolve, 2000));
+            // Diagnosis ka pehla suggested fix, warna stack reset
+            const fixes = this.lastDiagnosis && this.lastDiagnosis.device.mac_address === this.selectedDevice.mac_address
+                ? this.lastDiagnosis.suggested_fixes : [];
+            const fixAction = fixes.length > 0 ? fixes[0].action : 'reset_bluetooth_stack';
             
-            this.showToast('✅ Issues fixed automatically', 'success');
+            const response = await fetch('/api/fix', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    fix_action: fixAction,
+                    device: this.selectedDevice
+                })
+            });
+            const data = await response.json();
+            if (!data.success) {
+                throw new Error(data.error);
+            }
             
-            // Refresh device status
-            this.selectedDevice.connected = true;
-            this.selectedDevice.signal_strength = -40;
-            this.displayDeviceInfo();
-            this.displayDevices();
+            this.showToast(`🔧 Applying ${fixAction}...`, 'info');
+            const job = await this.waitForJob(data.job_id);
+            
+            if (job.status !== 'succeeded') {
+                throw new Error(job.error || 'Fix failed');
+            }
+            this.showToast(`✅ ${job.result.message}`, 'success');
             
         } catch (error) {
+            console.error('Auto fix error:', error);
             this.showToast('❌ Auto fix failed', 'error');
         } finally {
             fixBtn.disabled = false;
         }
     }
 
+    async waitForJob(jobId) {
+        // Long-poll jab tak job finish na ho
+        while (true) {
+            const response = await fetch(`/api/jobs/${jobId}?wait=30`);
+            const data = await response.json();
+            if (!data.success) {
+                throw new Error(data.error);
+            }
+            if (data.job.status === 'succeeded' || data.job.status === 'failed') {
+                return data.job;
+            }
+        }
+    }
+
     setMode(mode) {
         this.currentMode = mode;
         